@@ -260,4 +260,198 @@ exports.saveAnalysisResults = async (req, res) => {
       error: error.message
     });
   }
-}; 
\ No newline at end of file
+}; 
+/**
+ * Подтверждение актуальности последнего результата анализа (результат не изменился)
+ */
+exports.touchAnalysisResults = async (req, res) => {
+  try {
+    const { vehicleId } = req.params;
+    const { createdAt } = req.body || {};
+    
+    // Обновляем время последнего результата вместо записи его копии
+    const result = await pool.query(
+      `UPDATE vehicle_analysis SET created_at = $2
+       WHERE id = (
+         SELECT id FROM vehicle_analysis WHERE vehicle_id = $1 ORDER BY created_at DESC LIMIT 1
+       )
+       RETURNING id`,
+      [vehicleId, createdAt ? new Date(createdAt) : new Date()]
+    );
+    
+    if (result.rows.length === 0) {
+      return res.status(404).json({
+        status: 'error',
+        message: 'Результаты анализа не найдены'
+      });
+    }
+    
+    res.status(200).json({
+      status: 'success',
+      message: 'Результаты анализа подтверждены',
+      id: result.rows[0].id
+    });
+    
+  } catch (error) {
+    console.error('Error confirming analysis results:', error);
+    res.status(500).json({
+      status: 'error',
+      message: 'Ошибка при подтверждении результатов анализа',
+      error: error.message
+    });
+  }
+};
+
+/**
+ * Пакетное сохранение результатов анализа нескольких автомобилей одним запросом
+ * (без аутентификации, для внутреннего использования).
+ * В ответе saved[i] - сохранен ли i-й результат (false, если автомобиль не найден).
+ */
+exports.saveAnalysisResultsBatch = async (req, res) => {
+  try {
+    const items = Array.isArray(req.body && req.body.results) ? req.body.results : null;
+    
+    if (!items) {
+      return res.status(400).json({ 
+        status: 'error',
+        message: 'Результаты анализа не указаны' 
+      });
+    }
+    
+    const vehicleIds = [...new Set(items.map(item => parseInt(item.vehicleId)).filter(id => !isNaN(id)))];
+    const vehicleCheck = vehicleIds.length
+      ? await pool.query('SELECT id FROM user_vehicles WHERE id = ANY($1::int[])', [vehicleIds])
+      : { rows: [] };
+    const existing = new Set(vehicleCheck.rows.map(row => row.id));
+    
+    // Одна многострочная вставка для всех результатов существующих автомобилей
+    const now = new Date();
+    const values = [];
+    const placeholders = [];
+    const positions = [];
+    items.forEach((analysisData, index) => {
+      const vehicleId = parseInt(analysisData.vehicleId);
+      if (!existing.has(vehicleId)) {
+        return;
+      }
+      const recommendations = Array.isArray(analysisData.recommendations)
+        ? analysisData.recommendations.join(',')
+        : analysisData.recommendations;
+      const offset = values.length;
+      placeholders.push(`(${Array.from({ length: 10 }, (_, i) => `$${offset + i + 1}`).join(', ')})`);
+      values.push(
+        vehicleId,
+        analysisData.engineHealth || 0,
+        analysisData.oilHealth || 0,
+        analysisData.tiresHealth || 0,
+        analysisData.brakesHealth || 0,
+        analysisData.suspensionHealth || 0,
+        analysisData.batteryHealth || 0,
+        analysisData.overallHealth || 0,
+        recommendations,
+        analysisData.createdAt ? new Date(analysisData.createdAt) : now
+      );
+      positions.push(index);
+    });
+    
+    if (placeholders.length) {
+      await pool.query(
+        `INSERT INTO vehicle_analysis (
+          vehicle_id, 
+          engine_health, 
+          oil_health, 
+          tires_health, 
+          brakes_health, 
+          suspension_health, 
+          battery_health, 
+          overall_health, 
+          recommendations,
+          created_at
+        ) VALUES ${placeholders.join(', ')}`,
+        values
+      );
+    }
+    
+    // Вставка выполняется одной командой: либо сохранены все результаты существующих автомобилей, либо ни один
+    const saved = items.map(() => false);
+    positions.forEach(index => { saved[index] = true; });
+    
+    console.log(`Analysis results saved: ${placeholders.length} of ${items.length}`);
+    
+    res.status(201).json({
+      status: 'success',
+      message: 'Результаты анализа успешно сохранены',
+      saved
+    });
+    
+  } catch (error) {
+    console.error('Error saving analysis results batch:', error);
+    res.status(500).json({
+      status: 'error',
+      message: 'Ошибка при сохранении результатов анализа',
+      error: error.message
+    });
+  }
+};
+
+/**
+ * Пакетное подтверждение актуальности последних результатов анализа нескольких автомобилей
+ * (без аутентификации, для внутреннего использования).
+ * В ответе confirmed[i] - подтвержден ли i-й результат (false, если у автомобиля нет результатов).
+ */
+exports.touchAnalysisResultsBatch = async (req, res) => {
+  try {
+    const items = Array.isArray(req.body && req.body.items) ? req.body.items : null;
+    
+    if (!items) {
+      return res.status(400).json({ 
+        status: 'error',
+        message: 'Подтверждения не указаны' 
+      });
+    }
+    
+    // Для повторяющегося автомобиля используется последнее время подтверждения
+    const now = new Date();
+    const times = new Map();
+    items.forEach(item => {
+      const vehicleId = parseInt(item.vehicleId);
+      if (!isNaN(vehicleId)) {
+        times.set(vehicleId, item.createdAt ? new Date(item.createdAt) : now);
+      }
+    });
+    
+    // Одно обновление последних результатов всех автомобилей пачки
+    const result = times.size
+      ? await pool.query(
+        `UPDATE vehicle_analysis SET created_at = latest.created_at
+         FROM (
+           SELECT DISTINCT ON (va.vehicle_id) va.id, t.created_at
+           FROM unnest($1::int[], $2::timestamptz[]) AS t(vehicle_id, created_at)
+           JOIN vehicle_analysis va ON va.vehicle_id = t.vehicle_id
+           ORDER BY va.vehicle_id, va.created_at DESC
+         ) AS latest
+         WHERE vehicle_analysis.id = latest.id
+         RETURNING vehicle_analysis.vehicle_id`,
+        [[...times.keys()], [...times.values()]]
+      )
+      : { rows: [] };
+    const touched = new Set(result.rows.map(row => row.vehicle_id));
+    const confirmed = items.map(item => touched.has(parseInt(item.vehicleId)));
+    
+    console.log(`Analysis results confirmed: ${touched.size} of ${times.size}`);
+    
+    res.status(200).json({
+      status: 'success',
+      message: 'Результаты анализа подтверждены',
+      confirmed
+    });
+    
+  } catch (error) {
+    console.error('Error confirming analysis results batch:', error);
+    res.status(500).json({
+      status: 'error',
+      message: 'Ошибка при подтверждении результатов анализа',
+      error: error.message
+    });
+  }
+};
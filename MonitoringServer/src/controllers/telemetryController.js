@@ -112,19 +112,40 @@ exports.getTelemetry = async (req, res) => {
 };
 
 // Новый метод для получения телеметрии без аутентификации (для модуля предиктивного анализа)
+// Преобразование записи телеметрии в camelCase для совместимости с клиентским кодом
+const formatPredictionTelemetry = row => ({
+  id: row.id,
+  vehicleId: row.vehicle_id,
+  rpm: row.rpm,
+  speed: row.speed,
+  engineTemp: row.engine_temp,
+  dtcCodes: row.dtc_codes,
+  o2Voltage: row.o2_voltage,
+  fuelPressure: row.fuel_pressure,
+  intakeTemp: row.intake_temp,
+  mafSensor: row.maf_sensor,
+  throttlePos: row.throttle_pos,
+  engineHealth: row.engine_health,
+  oilHealth: row.oil_health,
+  tiresHealth: row.tires_health, 
+  brakesHealth: row.brakes_health,
+  createdAt: row.created_at
+});
+
 exports.getVehicleTelemetryData = async (req, res) => {
   try {
-    const { vehicle_id, limit = 10, start_date, end_date } = req.query;
+    const { vehicle_id, limit = 10, start_date, end_date, before, before_id } = req.query;
     
-    console.log('Getting telemetry data for predictive analysis:', { vehicle_id, limit, start_date, end_date });
+    console.log('Getting telemetry data for predictive analysis:', { vehicle_id, limit, start_date, end_date, before, before_id });
     
     if (!vehicle_id) {
       return res.status(400).json({ message: 'ID автомобиля не указан' });
     }
     
     // Строим базовый запрос
+    // cursor_created_at - точное время записи (с микросекундами) для курсора следующей страницы
     let query = `
-      SELECT * FROM telemetry_data 
+      SELECT *, created_at::text AS cursor_created_at FROM telemetry_data 
       WHERE vehicle_id = $1 
     `;
     
@@ -142,8 +163,14 @@ exports.getVehicleTelemetryData = async (req, res) => {
       queryParams.push(new Date(end_date));
     }
     
+    // Курсор постраничной выборки: записи строго старше последней записи предыдущей страницы
+    if (before && before_id) {
+      query += ` AND (created_at, id) < ($${paramCounter++}, $${paramCounter++})`;
+      queryParams.push(before, parseInt(before_id));
+    }
+    
     // Добавляем сортировку и лимит
-    query += ` ORDER BY created_at DESC LIMIT $${paramCounter}`;
+    query += ` ORDER BY created_at DESC, id DESC LIMIT $${paramCounter}`;
     queryParams.push(parseInt(limit));
     
     // Выполняем запрос
@@ -156,29 +183,16 @@ exports.getVehicleTelemetryData = async (req, res) => {
     console.log(`Retrieved ${result.rows.length} telemetry records for vehicle ${vehicle_id}`);
     
     // Форматируем данные для ответа
-    const formattedData = result.rows.map(row => {
-      // Преобразование camelCase для совместимости с клиентским кодом
-      return {
-        id: row.id,
-        vehicleId: row.vehicle_id,
-        rpm: row.rpm,
-        speed: row.speed,
-        engineTemp: row.engine_temp,
-        dtcCodes: row.dtc_codes,
-        o2Voltage: row.o2_voltage,
-        fuelPressure: row.fuel_pressure,
-        intakeTemp: row.intake_temp,
-        mafSensor: row.maf_sensor,
-        throttlePos: row.throttle_pos,
-        engineHealth: row.engine_health,
-        oilHealth: row.oil_health,
-        tiresHealth: row.tires_health, 
-        brakesHealth: row.brakes_health,
-        createdAt: row.created_at
-      };
-    });
+    const formattedData = result.rows.map(formatPredictionTelemetry);
     
-    res.json({ data: formattedData });
+    // Если страница заполнена, возвращаем курсор следующей страницы
+    const response = { data: formattedData };
+    if (result.rows.length === parseInt(limit)) {
+      const last = result.rows[result.rows.length - 1];
+      response.next_cursor = { before: last.cursor_created_at, before_id: last.id };
+    }
+    
+    res.json(response);
   } catch (error) {
     console.error('Error getting vehicle telemetry data:', error);
     res.status(500).json({ 
@@ -186,4 +200,63 @@ exports.getVehicleTelemetryData = async (req, res) => {
       error: error.message 
     });
   }
-}; 
\ No newline at end of file
+}; 
+
+/**
+ * Телеметрия нескольких автомобилей одним запросом (последние limit записей каждого)
+ */
+exports.getFleetTelemetryData = async (req, res) => {
+  try {
+    const { vehicle_ids: vehicleIds, limit = 10, start_date, end_date } = req.body || {};
+    
+    if (!Array.isArray(vehicleIds) || vehicleIds.length === 0) {
+      return res.status(400).json({ message: 'Список ID автомобилей не указан' });
+    }
+    
+    const queryParams = [vehicleIds];
+    const filters = ['vehicle_id = ANY($1)'];
+    
+    if (start_date) {
+      queryParams.push(new Date(start_date));
+      filters.push(`created_at >= $${queryParams.length}`);
+    }
+    
+    if (end_date) {
+      queryParams.push(new Date(end_date));
+      filters.push(`created_at <= $${queryParams.length}`);
+    }
+    
+    queryParams.push(parseInt(limit));
+    
+    // Последние limit записей каждого автомобиля (при одинаковом времени - по убыванию id,
+    // как в одиночном маршруте, чтобы выборка не зависела от плана запроса)
+    const query = `
+      SELECT * FROM (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY vehicle_id ORDER BY created_at DESC, id DESC) AS row_number
+        FROM telemetry_data
+        WHERE ${filters.join(' AND ')}
+      ) ranked
+      WHERE row_number <= $${queryParams.length}
+      ORDER BY vehicle_id, created_at DESC, id DESC
+    `;
+    
+    const result = await db.query(query, queryParams);
+    
+    // Автомобили без телеметрии получают пустой список
+    const data = {};
+    vehicleIds.forEach(vehicleId => { data[vehicleId] = []; });
+    result.rows.forEach(row => {
+      (data[row.vehicle_id] = data[row.vehicle_id] || []).push(formatPredictionTelemetry(row));
+    });
+    
+    console.log(`Retrieved ${result.rows.length} telemetry records for ${vehicleIds.length} vehicles`);
+    
+    res.json({ data });
+  } catch (error) {
+    console.error('Error getting fleet telemetry data:', error);
+    res.status(500).json({ 
+      message: 'Ошибка при получении телеметрических данных',
+      error: error.message
+    });
+  }
+};
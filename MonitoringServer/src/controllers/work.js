@@ -45,6 +45,26 @@ class WorkController {
     }
   }
 
+  static async getFleetWorks(req, res) {
+    try {
+      const { vehicle_ids: vehicleIds } = req.body || {};
+      if (!Array.isArray(vehicleIds) || vehicleIds.length === 0) {
+        return res.status(400).json({ error: 'vehicle_ids must be a non-empty array' });
+      }
+      // Работы группируются по автомобилям; автомобили без работ получают пустой список
+      const works = {};
+      vehicleIds.forEach(vehicleId => { works[vehicleId] = []; });
+      const rows = await Work.getByVehicleIds(vehicleIds);
+      rows.forEach(row => {
+        (works[row.vehicle_id] = works[row.vehicle_id] || []).push(row);
+      });
+      res.json({ works });
+    } catch (error) {
+      console.error('Error getting fleet works:', error);
+      res.status(500).json({ error: 'Failed to get fleet works' });
+    }
+  }
+
   static async getTechnicianWorks(req, res) {
     try {
       const technicianId = req.user.id;
@@ -99,6 +119,7 @@ class WorkController {
 module.exports = {
   createWork: WorkController.createWork,
   getVehicleWorks: WorkController.getVehicleWorks,
+  getFleetWorks: WorkController.getFleetWorks,
   getTechnicianWorks: WorkController.getTechnicianWorks,
   updateWorkStatus: WorkController.updateWorkStatus,
   getWorkDetails: WorkController.getWorkDetails
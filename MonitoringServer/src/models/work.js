@@ -60,6 +60,18 @@ class Work {
     return result.rows;
   }
 
+  static async getByVehicleIds(vehicleIds) {
+    const query = `
+      SELECT w.*, u.username as technician_name
+      FROM "works" w
+      JOIN "users" u ON w.technician_id = u.id
+      WHERE w.vehicle_id = ANY($1)
+      ORDER BY w.vehicle_id, w.created_at DESC;
+    `;
+    const result = await pool.query(query, [vehicleIds]);
+    return result.rows;
+  }
+
   static async getByTechnicianId(technicianId) {
     const query = `
       SELECT w.*, v.plate_number, v.make, v.model
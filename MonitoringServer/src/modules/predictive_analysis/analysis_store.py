@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from issues import issues_to_json
+
+# Set up logging
+logger = logging.getLogger("AnalysisStore")
+
+# Схема таблицы совпадает с legacy-базой (vehicle_monitoring.db), поэтому SQL-запросы
+# api_server.py и ensure_recommendations.py выполняются без изменений
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vehicle_analysis (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    vehicle_id INTEGER NOT NULL,
+    engine_health INTEGER,
+    oil_health INTEGER,
+    tires_health INTEGER,
+    brakes_health INTEGER,
+    suspension_health INTEGER,
+    battery_health INTEGER,
+    overall_health INTEGER,
+    recommendations TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Индекс для выборки последнего результата и истории автомобиля
+_INDEX = """
+CREATE INDEX IF NOT EXISTS vehicle_analysis_vehicle_created
+ON vehicle_analysis (vehicle_id, created_at DESC, id DESC);
+"""
+
+# Столбцы, которых нет в legacy-схеме: проблемы (JSON) и отпечаток результата (служебный)
+_EXTRA_COLUMNS = (('issues', 'TEXT'), ('fingerprint', 'TEXT'))
+_PRIVATE_COLUMNS = frozenset(['fingerprint'])
+
+_RESULT_COLUMNS = ('vehicle_id', 'engine_health', 'oil_health', 'tires_health', 'brakes_health',
+                   'suspension_health', 'battery_health', 'overall_health')
+
+
+def _encode_list(value):
+    # Списки хранятся в JSON: в тексте рекомендаций могут быть запятые
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value), ensure_ascii=False, default=str)
+    return value
+
+
+def _decode_list(value):
+    # Legacy-записи содержат рекомендации строкой через запятую, их разбирают вызывающие
+    if isinstance(value, str) and value.startswith('['):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+class AnalysisStore:
+    """
+    Локальная история результатов анализа в SQLite (режим WAL), индексированная
+    по (vehicle_id, created_at): последний результат и история автомобиля читаются
+    по индексу без обращения к Node.js API.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Путь к файлу базы SQLite
+        """
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            connection = self._connection()
+            connection.executescript(_SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(vehicle_analysis)")}
+            for name, column_type in _EXTRA_COLUMNS:
+                if name not in columns:
+                    connection.execute(f"ALTER TABLE vehicle_analysis ADD COLUMN {name} {column_type}")
+            connection.executescript(_INDEX)
+            connection.commit()
+        logger.info(f"Analysis store opened at {path}")
+
+    def _connection(self):
+        # Отдельное соединение на поток (и процесс: соединения SQLite нельзя использовать после fork)
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    @staticmethod
+    def _row_dict(row):
+        return {key: _decode_list(row[key]) for key in row.keys() if key not in _PRIVATE_COLUMNS}
+
+    def record(self, analysis_result, fingerprint=None, heartbeat=False):
+        """
+        Сохраняет результат анализа. Если heartbeat и последний результат автомобиля
+        имеет тот же отпечаток, у него только обновляется created_at.
+
+        Args:
+            analysis_result (dict): Результат анализа (с created_at)
+            fingerprint (str, optional): Отпечаток результата (watermarks.result_fingerprint)
+            heartbeat (bool): Обновлять время неизменившегося результата вместо новой записи
+
+        Returns:
+            int: ID записи
+        """
+        created_at = analysis_result.get('created_at') or datetime.now().isoformat()
+        vehicle_id = analysis_result.get('vehicle_id')
+        with self._write_lock:
+            connection = self._connection()
+            if heartbeat and fingerprint is not None:
+                latest = connection.execute(
+                    """SELECT id, fingerprint FROM vehicle_analysis WHERE vehicle_id = ?
+                       ORDER BY created_at DESC, id DESC LIMIT 1""",
+                    (vehicle_id,)
+                ).fetchone()
+                if latest is not None and latest['fingerprint'] == fingerprint:
+                    connection.execute("UPDATE vehicle_analysis SET created_at = ? WHERE id = ?",
+                                       (created_at, latest['id']))
+                    connection.commit()
+                    return latest['id']
+
+            issues = analysis_result.get('issues')
+            cursor = connection.execute(
+                f"""INSERT INTO vehicle_analysis ({', '.join(_RESULT_COLUMNS)}, recommendations, issues,
+                    fingerprint, created_at) VALUES ({', '.join('?' * (len(_RESULT_COLUMNS) + 4))})""",
+                tuple(analysis_result.get(column) for column in _RESULT_COLUMNS) + (
+                    _encode_list(analysis_result.get('recommendations')),
+                    _encode_list(issues_to_json(issues)) if issues is not None else None,
+                    fingerprint,
+                    created_at,
+                )
+            )
+            connection.commit()
+            return cursor.lastrowid
+
+    def latest(self, vehicle_id):
+        """
+        Последний результат анализа автомобиля
+
+        Returns:
+            dict: Результат или None
+        """
+        rows = self.history(vehicle_id, limit=1)
+        return rows[0] if rows else None
+
+    def history(self, vehicle_id, limit=None):
+        """
+        История результатов анализа автомобиля (от новых к старым)
+
+        Args:
+            vehicle_id: ID автомобиля
+            limit (int, optional): Максимальное количество записей
+
+        Returns:
+            list: Результаты
+        """
+        query = "SELECT * FROM vehicle_analysis WHERE vehicle_id = ? ORDER BY created_at DESC, id DESC"
+        params = (vehicle_id,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        return [self._row_dict(row) for row in self._connection().execute(query, params)]
+
+    def execute(self, query, params=None, fetch=True):
+        """
+        Выполняет SQL-запрос к хранилищу
+
+        Args:
+            query (str): SQL-запрос (параметры в стиле '?')
+            params (tuple, optional): Параметры запроса
+            fetch (bool): Если True, возвращает строки результата
+
+        Returns:
+            list или None: Строки в виде словарей (списки рекомендаций и проблем разобраны из JSON) или None
+        """
+        connection = self._connection()
+        if query.lstrip().upper().startswith('SELECT'):
+            # Чтение не блокирует другие потоки (WAL)
+            rows = connection.execute(query, params or ()).fetchall()
+        else:
+            with self._write_lock:
+                cursor = connection.execute(query, params or ())
+                rows = cursor.fetchall() if fetch else None
+                connection.commit()
+        return [self._row_dict(row) for row in rows] if fetch else None
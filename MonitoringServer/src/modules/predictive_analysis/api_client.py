@@ -3,10 +3,16 @@
 
 import os
 import json
+import time
 import logging
-import requests
+import threading
+from queue import Queue, Full
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from http_transport import PooledTransport
+from resilience import EndpointHealth, endpoint_key
 from dotenv import load_dotenv
 from datetime import datetime
+import api_endpoints
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +20,55 @@ load_dotenv()
 # Set up logging
 logger = logging.getLogger("ApiClient")
 
+
+def _prefetched(iterator, depth):
+    """
+    Выполняет итератор в фоновом потоке, заранее получая до depth элементов.
+    Если потребитель прекращает чтение, фоновый поток останавливается.
+    
+    Args:
+        iterator: Исходный итератор
+        depth (int): Размер очереди заранее полученных элементов
+        
+    Yields:
+        Элементы исходного итератора (исключения итератора передаются потребителю)
+    """
+    queue = Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((done, e))
+            return
+        put((done, None))
+    
+    thread = threading.Thread(target=produce, name="TelemetryPrefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+
 class ApiClient:
     """
     Клиент для взаимодействия с API сервера Node.js.
@@ -26,11 +81,43 @@ class ApiClient:
         """
         self.api_base_url = os.getenv('NODE_API_URL', 'http://localhost:5000/api')
         self.api_token = os.getenv('API_TOKEN', 'demo_token')
+        # Пул постоянных соединений с таймаутами и повторами (общий для всех потоков)
+        self.transport = PooledTransport()
+        # Пакетная загрузка данных нескольких автомобилей одним запросом
+        self.bulk_chunk_size = max(1, int(os.getenv('API_BULK_CHUNK_SIZE', 100)))
+        self.bulk_fallback_concurrency = max(1, int(os.getenv('API_BULK_FALLBACK_CONCURRENCY', 16)))
+        self.bulk_retry_interval = float(os.getenv('API_BULK_RETRY_INTERVAL', 600))
+        self._bulk_unavailable = {}
+        # Постраничная загрузка длинной истории телеметрии
+        self.telemetry_page_size = max(1, int(os.getenv('TELEMETRY_PAGE_SIZE', 500)))
+        self.telemetry_prefetch_pages = max(0, int(os.getenv('TELEMETRY_PREFETCH_PAGES', 1)))
+        # Устойчивость к деградации API: автоматы защиты по конечным точкам, бюджеты времени
+        # на запрос (lookup_budget - для поиска автомобилей, загрузка данных ограничена latency_budget)
+        # и дублирование медленных GET
+        self.endpoints = EndpointHealth(
+            failure_threshold=int(os.getenv('API_BREAKER_FAILURES', 5)),
+            recovery_timeout=float(os.getenv('API_BREAKER_RECOVERY', 30))
+        )
+        self.latency_budget = float(os.getenv('API_LATENCY_BUDGET', 30))
+        self.lookup_budget = float(os.getenv('API_LOOKUP_BUDGET', 3))
+        self.hedge_enabled = os.getenv('API_HEDGE', 'true').lower() == 'true'
+        self.hedge_percentile = float(os.getenv('API_HEDGE_PERCENTILE', 95))
+        self.hedge_min_delay = float(os.getenv('API_HEDGE_MIN_DELAY', 0.05))
+        self.hedge_max_in_flight = int(os.getenv('API_HEDGE_MAX_IN_FLIGHT', 8))
+        self.hedge_workers = int(os.getenv('API_POOL_SIZE', 32))
+        self.hedged_requests = 0
+        self._hedge_executor = None
+        self._hedge_pid = None
+        self._hedges_in_flight = 0
+        self._hedge_lock = threading.Lock()
+        self._local = threading.local()
         logger.info(f"API client initialized with base URL: {self.api_base_url}")
     
-    def _make_request(self, method, endpoint, data=None, params=None, vehicle_id=None):
+    def _make_request(self, method, endpoint, data=None, params=None, vehicle_id=None, budget=None):
         """
         Выполняет HTTP-запрос к API с учетом авторизации.
+        Запросы к конечной точке с разомкнутым автоматом защиты сразу завершаются ошибкой,
+        запрос с повторами ограничен бюджетом времени, медленные GET-запросы дублируются (hedging).
         
         Args:
             method (str): HTTP метод ('GET', 'POST', etc.)
@@ -38,39 +125,164 @@ class ApiClient:
             data (dict, optional): Данные для отправки в запросе
             params (dict, optional): URL-параметры запроса
             vehicle_id (str, optional): ID автомобиля для авторизации
+            budget (float, optional): Бюджет времени на запрос с повторами в секундах (по умолчанию latency_budget)
             
         Returns:
             dict: Результат запроса или None в случае ошибки
         """
+        self._local.status = None
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT'):
+            logger.error(f"Unsupported HTTP method: {method}")
+            return None
+        
+        key = endpoint_key(method, endpoint)
+        breaker = self.endpoints.breaker(key)
+        if not breaker.allow():
+            logger.warning(f"Circuit open for {key}, request rejected")
+            return None
+        
+        logger.info(f"Making {method} request to {self.api_base_url}/{endpoint}")
+        started = time.monotonic()
+        deadline = started + (budget or self.latency_budget)
         try:
-            url = f"{self.api_base_url}/{endpoint}"
-            
-            # Для новых маршрутов авторизация не требуется
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            
-            logger.info(f"Making {method} request to {url}")
-            
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method.upper() == 'POST':
-                response = requests.post(url, headers=headers, json=data)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, headers=headers, json=data)
+            if method == 'GET' and self.hedge_enabled:
+                status, payload = self._send_hedged(key, endpoint, params, deadline)
             else:
-                logger.error(f"Unsupported HTTP method: {method}")
-                return None
-            
-            if response.status_code in (200, 201):
-                return response.json()
-            else:
-                logger.error(f"API request failed: {response.status_code} - {response.text}")
-                return None
-                
+                status, payload = self._send(method, endpoint, params, data, deadline)
         except Exception as e:
-            logger.error(f"Error making API request: {str(e)}")
+            breaker.record_failure()
+            logger.error(f"Error making API request: {str(e) or type(e).__name__}")
             return None
+        
+        # Ответы 4xx означают, что сервер работает; автомат размыкают только ошибки сервера
+        if status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self.endpoints.latency(key).record(time.monotonic() - started)
+        
+        self._local.status = status
+        if status in (200, 201):
+            return payload
+        logger.error(f"API request failed: {status} - {payload}")
+        return None
+    
+    def _call(self, exchange):
+        """
+        Выполняет обращение к конечной точке, описанное генератором api_endpoints
+        
+        Args:
+            exchange (generator): Генератор обращения (например, api_endpoints.get_vehicle_works(15))
+            
+        Returns:
+            Разобранный результат обращения
+        """
+        result = None
+        try:
+            while True:
+                request = exchange.send(result)
+                result = self._make_request(request.method, request.endpoint, data=request.data,
+                                            params=request.params,
+                                            budget=self.lookup_budget if request.lookup else None)
+        except StopIteration as stop:
+            return stop.value
+    
+    def _send(self, method, endpoint, params, data, deadline):
+        """
+        Отправляет запрос через транспорт
+        
+        Returns:
+            tuple: (код ответа, JSON ответа для 200/201 или текст ответа)
+        """
+        # Для новых маршрутов авторизация не требуется
+        headers = {
+            'Content-Type': 'application/json'
+        }
+        response = self.transport.request(method, f"{self.api_base_url}/{endpoint}", headers=headers,
+                                          params=params, json=data, deadline=deadline)
+        if response.status_code in (200, 201):
+            return response.status_code, response.json()
+        return response.status_code, response.text
+    
+    def _get_hedge_executor(self):
+        # Потоки пула не переживают fork, в рабочем процессе создается свой пул
+        pid = os.getpid()
+        if self._hedge_executor is None or self._hedge_pid != pid:
+            with self._hedge_lock:
+                if self._hedge_executor is None or self._hedge_pid != pid:
+                    self._hedge_executor = ThreadPoolExecutor(max_workers=self.hedge_workers,
+                                                              thread_name_prefix="ApiHedge")
+                    self._hedge_pid = pid
+                    self._hedges_in_flight = 0
+        return self._hedge_executor
+    
+    def _send_hedged(self, key, endpoint, params, deadline):
+        """
+        Отправляет GET-запрос; если ответа нет дольше перцентиля hedge_percentile задержек
+        этой конечной точки, отправляет дублирующий запрос и возвращает первый успешный ответ
+        
+        Returns:
+            tuple: (код ответа, JSON ответа для 200/201 или текст ответа)
+        """
+        delay = self.endpoints.latency(key).percentile(self.hedge_percentile)
+        if delay is None or time.monotonic() + max(delay, self.hedge_min_delay) >= deadline:
+            # Пока нет статистики или на дубль не хватает бюджета - обычный запрос
+            return self._send('GET', endpoint, params, None, deadline)
+        
+        executor = self._get_hedge_executor()
+        primary = executor.submit(self._send, 'GET', endpoint, params, None, deadline)
+        try:
+            return primary.result(timeout=max(delay, self.hedge_min_delay))
+        except FutureTimeoutError:
+            pass
+        
+        pending = {primary}
+        with self._hedge_lock:
+            hedge_allowed = self._hedges_in_flight < self.hedge_max_in_flight
+            if hedge_allowed:
+                self._hedges_in_flight += 1
+                self.hedged_requests += 1
+        if hedge_allowed:
+            logger.debug(f"Hedging {key} after {delay:.3f}s")
+            hedge = executor.submit(self._send, 'GET', endpoint, params, None, deadline)
+            hedge.add_done_callback(self._hedge_done)
+            pending.add(hedge)
+        
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                raise FutureTimeoutError(f"Latency budget exceeded for GET {endpoint}")
+            for future in done:
+                try:
+                    status, payload = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if status < 500 or not pending:
+                    return status, payload
+        raise error
+    
+    def _hedge_done(self, future):
+        with self._hedge_lock:
+            self._hedges_in_flight -= 1
+    
+    def resilience_stats(self):
+        """
+        Состояние автоматов защиты и задержки конечных точек API
+        
+        Returns:
+            dict: {'endpoints': {...}, 'hedged_requests': количество дублирующих запросов}
+        """
+        return {'endpoints': self.endpoints.stats(), 'hedged_requests': self.hedged_requests}
+    
+    @property
+    def last_status(self):
+        """
+        Код ответа последнего запроса текущего потока (None, если ответа не было)
+        """
+        return getattr(self._local, 'status', None)
     
     def get_vehicle_by_vin(self, vin):
         """
@@ -83,16 +295,7 @@ class ApiClient:
             dict: Данные автомобиля или None
         """
         try:
-            # Для новых маршрутов
-            result = self._make_request('GET', 'vehicles/search/by-vin', params={'vin': vin})
-            
-            if result and 'vehicle' in result:
-                logger.info(f"Vehicle found by VIN {vin}")
-                return result['vehicle']
-            
-            logger.warning(f"Vehicle with VIN {vin} not found")
-            return None
-            
+            return self._call(api_endpoints.get_vehicle_by_vin(vin))
         except Exception as e:
             logger.error(f"Error getting vehicle by VIN {vin}: {str(e)}")
             return None
@@ -108,14 +311,7 @@ class ApiClient:
             dict: Данные автомобиля или None
         """
         try:
-            result = self._make_request('GET', f'vehicles/{vehicle_id}')
-            if result and 'vehicle' in result:
-                logger.info(f"Vehicle found by ID {vehicle_id}")
-                return result['vehicle']
-            
-            logger.warning(f"Vehicle with ID {vehicle_id} not found")
-            return None
-            
+            return self._call(api_endpoints.get_vehicle_by_id(vehicle_id))
         except Exception as e:
             logger.error(f"Error getting vehicle by ID {vehicle_id}: {str(e)}")
             return None
@@ -128,14 +324,7 @@ class ApiClient:
             list: Список автомобилей или пустой список
         """
         try:
-            result = self._make_request('GET', 'vehicles')
-            if result and 'vehicles' in result:
-                logger.info(f"Got {len(result['vehicles'])} vehicles")
-                return result['vehicles']
-            
-            logger.warning("No vehicles found")
-            return []
-            
+            return self._call(api_endpoints.get_all_vehicles())
         except Exception as e:
             logger.error(f"Error getting all vehicles: {str(e)}")
             return []
@@ -151,39 +340,148 @@ class ApiClient:
             limit (int, optional): Максимальное количество записей
             
         Returns:
-            list: Список телеметрических данных или пустой список
+            TelemetryFrame: Телеметрия (колоночный кадр) или пустой список
         """
         try:
-            # Обновленные параметры для нового маршрута
-            params = {'vehicle_id': vehicle_id, 'limit': limit}
-            if start_date:
-                params['start_date'] = start_date
-            if end_date:
-                params['end_date'] = end_date
-                
-            # Используем новый маршрут
-            result = self._make_request('GET', 'telemetry/vehicle-data', params=params)
-            
-            if result and 'data' in result:
-                logger.info(f"Got {len(result['data'])} telemetry records for vehicle {vehicle_id}")
-                # Преобразуем ключи из camelCase в snake_case для совместимости с legacy-кодом
-                transformed_data = []
-                for item in result['data']:
-                    transformed = {}
-                    for key, value in item.items():
-                        # Преобразуем camelCase в snake_case
-                        snake_key = ''.join(['_'+c.lower() if c.isupper() else c for c in key]).lstrip('_')
-                        transformed[snake_key] = value
-                    transformed_data.append(transformed)
-                return transformed_data
-            
-            logger.warning(f"No telemetry data found for vehicle {vehicle_id}")
-            return []
-            
+            return self._call(api_endpoints.get_telemetry_data(vehicle_id, start_date, end_date, limit))
         except Exception as e:
             logger.error(f"Error getting telemetry data for vehicle {vehicle_id}: {str(e)}")
             return []
     
+    def iter_telemetry_data(self, vehicle_id, start_date=None, end_date=None, page_size=None, prefetch=None):
+        """
+        Постранично загружает телеметрию автомобиля (от новых записей к старым) и отдает записи по одной.
+        Страницы запрашиваются по курсору (время и ID последней записи предыдущей страницы),
+        следующие страницы загружаются фоновым потоком, пока обрабатывается текущая.
+        В памяти одновременно находится не больше prefetch + 2 страниц.
+        
+        Args:
+            vehicle_id (str): ID автомобиля
+            start_date (str, optional): Начальная дата выборки в формате ISO 8601
+            end_date (str, optional): Конечная дата выборки в формате ISO 8601
+            page_size (int, optional): Количество записей на странице
+            prefetch (int, optional): Количество страниц, загружаемых заранее (0 - без фоновой загрузки)
+            
+        Yields:
+            TelemetryRow: Записи телеметрии
+        """
+        page_size = page_size or self.telemetry_page_size
+        prefetch = self.telemetry_prefetch_pages if prefetch is None else prefetch
+        pages = self._telemetry_pages(vehicle_id, start_date, end_date, page_size)
+        if prefetch > 0:
+            pages = _prefetched(pages, prefetch)
+        for page in pages:
+            yield from page
+    
+    def _telemetry_pages(self, vehicle_id, start_date, end_date, page_size):
+        """
+        Страницы телеметрии автомобиля (списки записей) по курсору next_cursor из ответа API
+        """
+        params = api_endpoints.telemetry_params(vehicle_id, start_date, end_date, page_size)
+        
+        pages = records = 0
+        while True:
+            result = self._make_request('GET', 'telemetry/vehicle-data', params=params)
+            if not result or 'data' not in result:
+                if pages:
+                    logger.error(f"Telemetry stream for vehicle {vehicle_id} interrupted after {records} records")
+                return
+            data = result['data']
+            if data:
+                pages += 1
+                records += len(data)
+                yield api_endpoints.telemetry_frame(data)
+            
+            cursor = result.get('next_cursor')
+            if not cursor or len(data) < page_size:
+                logger.info(f"Streamed {records} telemetry records in {pages} pages for vehicle {vehicle_id}")
+                return
+            params['before'] = cursor['before']
+            params['before_id'] = cursor['before_id']
+    
+    def _fetch_bulk(self, route, vehicle_ids, payload, key, fetch_one, transform=None):
+        """
+        Загружает данные нескольких автомобилей пачками по bulk_chunk_size через пакетный маршрут.
+        Если маршрут недоступен, данные пачки загружаются параллельными одиночными запросами,
+        а пакетный маршрут не используется в течение bulk_retry_interval секунд.
+        
+        Args:
+            route (str): Пакетный маршрут API
+            vehicle_ids (list): ID автомобилей
+            payload (dict): Дополнительные параметры запроса
+            key (str): Ключ ответа со словарем {ID автомобиля: список}
+            fetch_one (callable): Загрузка данных одного автомобиля
+            transform (callable, optional): Преобразование списка из ответа пакетного маршрута
+            
+        Returns:
+            dict: {ID автомобиля: список}
+        """
+        results = {}
+        vehicle_ids = list(dict.fromkeys(vehicle_ids))
+        for start in range(0, len(vehicle_ids), self.bulk_chunk_size):
+            chunk = vehicle_ids[start:start + self.bulk_chunk_size]
+            
+            result = None
+            if time.monotonic() >= self._bulk_unavailable.get(route, 0):
+                result = self._make_request('POST', route, data=dict(payload, vehicle_ids=chunk))
+                if not (result and isinstance(result.get(key), dict)):
+                    logger.warning(f"Bulk route {route} unavailable, falling back to single requests")
+                    self._bulk_unavailable[route] = time.monotonic() + self.bulk_retry_interval
+                    result = None
+            
+            if result is not None:
+                # Ключи ответа JSON - строки, приводим их к исходным ID
+                by_key = result[key]
+                for vehicle_id in chunk:
+                    data = by_key.get(str(vehicle_id)) or []
+                    results[vehicle_id] = transform(data) if transform else data
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.bulk_fallback_concurrency, len(chunk))) as executor:
+                    for vehicle_id, data in zip(chunk, executor.map(fetch_one, chunk)):
+                        results[vehicle_id] = data
+        return results
+    
+    def get_telemetry_data_bulk(self, vehicle_ids, start_date=None, end_date=None, limit=10):
+        """
+        Получает телеметрические данные нескольких автомобилей
+        
+        Args:
+            vehicle_ids (list): ID автомобилей
+            start_date (str, optional): Начальная дата выборки в формате ISO 8601
+            end_date (str, optional): Конечная дата выборки в формате ISO 8601
+            limit (int, optional): Максимальное количество записей на автомобиль
+            
+        Returns:
+            dict: {ID автомобиля: TelemetryFrame}
+        """
+        payload = {'limit': limit}
+        if start_date:
+            payload['start_date'] = start_date
+        if end_date:
+            payload['end_date'] = end_date
+        
+        results = self._fetch_bulk(
+            'telemetry/vehicles-data', vehicle_ids, payload, 'data',
+            lambda vehicle_id: self.get_telemetry_data(vehicle_id, start_date, end_date, limit),
+            api_endpoints.telemetry_frame
+        )
+        logger.info(f"Got telemetry for {len(results)} vehicles")
+        return results
+    
+    def get_vehicle_works_bulk(self, vehicle_ids):
+        """
+        Получает историю работ нескольких автомобилей
+        
+        Args:
+            vehicle_ids (list): ID автомобилей
+            
+        Returns:
+            dict: {ID автомобиля: список работ}
+        """
+        results = self._fetch_bulk('works/vehicles', vehicle_ids, {}, 'works', self.get_vehicle_works)
+        logger.info(f"Got works for {len(results)} vehicles")
+        return results
+    
     def get_vehicle_works(self, vehicle_id):
         """
         Получает историю работ для автомобиля
@@ -195,14 +493,7 @@ class ApiClient:
             list: Список работ или пустой список
         """
         try:
-            result = self._make_request('GET', f'works/vehicle/{vehicle_id}')
-            if result and 'works' in result:
-                logger.info(f"Got {len(result['works'])} works for vehicle {vehicle_id}")
-                return result['works']
-            
-            logger.warning(f"No works found for vehicle {vehicle_id}")
-            return []
-            
+            return self._call(api_endpoints.get_vehicle_works(vehicle_id))
         except Exception as e:
             logger.error(f"Error getting works for vehicle {vehicle_id}: {str(e)}")
             return []
@@ -218,26 +509,85 @@ class ApiClient:
             bool: True в случае успеха, False в случае ошибки
         """
         try:
-            # Преобразуем ключи из snake_case в camelCase для совместимости с API
-            camel_data = {}
-            for key, value in analysis_result.items():
-                # Преобразуем snake_case в camelCase
-                components = key.split('_')
-                camel_key = components[0] + ''.join(x.title() for x in components[1:])
-                camel_data[camel_key] = value
-            
-            vehicle_id = analysis_result.get('vehicle_id')
-            
-            # Используем новый маршрут
-            result = self._make_request('POST', f'analysis/vehicle/{vehicle_id}/results', data=camel_data)
+            return self._call(api_endpoints.save_analysis_result(analysis_result))
+        except Exception as e:
+            logger.error(f"Error saving analysis result: {str(e)}")
+            return False
+    
+    def save_analysis_results_bulk(self, analysis_results):
+        """
+        Сохраняет результаты анализа нескольких автомобилей одним запросом.
+        Если пакетный маршрут недоступен, результаты сохраняются по одному,
+        а пакетный маршрут не используется в течение bulk_retry_interval секунд.
+        
+        Args:
+            analysis_results (list): Результаты анализа
             
-            if result and result.get('status') == 'success':
-                logger.info(f"Analysis result saved for vehicle {vehicle_id}")
-                return True
+        Returns:
+            list: Для каждого результата True (сохранен), False (автомобиль не найден, повтор бесполезен)
+                или None (ошибка, результат можно повторить)
+        """
+        route = 'analysis/results/batch'
+        if time.monotonic() >= self._bulk_unavailable.get(route, 0):
+            items = [api_endpoints.analysis_payload(analysis_result) for analysis_result in analysis_results]
+            result = self._make_request('POST', route, data={'results': items})
+            if result and isinstance(result.get('saved'), list) and len(result['saved']) == len(items):
+                logger.info(f"Saved {sum(result['saved'])} of {len(items)} analysis results")
+                return [bool(saved) for saved in result['saved']]
+            if self.last_status != 404:
+                # Ошибка сервера или сети: всю пачку можно повторить
+                return [None] * len(analysis_results)
+            logger.warning(f"Bulk route {route} unavailable, falling back to single requests")
+            self._bulk_unavailable[route] = time.monotonic() + self.bulk_retry_interval
+        
+        outcomes = []
+        for analysis_result in analysis_results:
+            if self.save_analysis_result(analysis_result):
+                outcomes.append(True)
+            else:
+                outcomes.append(False if self.last_status == 404 else None)
+        return outcomes
+    
+    def touch_analysis_result(self, vehicle_id, created_at):
+        """
+        Подтверждает, что последний сохраненный результат анализа все еще актуален
+        (обновляет его время без записи нового результата)
+        
+        Args:
+            vehicle_id: ID автомобиля
+            created_at (str): Время подтверждения в формате ISO
             
-            logger.warning(f"Failed to save analysis result for vehicle {vehicle_id}")
+        Returns:
+            bool: True в случае успеха, False если результата нет или произошла ошибка
+        """
+        try:
+            return self._call(api_endpoints.touch_analysis_result(vehicle_id, created_at))
+        except Exception as e:
+            logger.error(f"Error confirming analysis result: {str(e)}")
             return False
+    
+    def touch_analysis_results_bulk(self, touches):
+        """
+        Подтверждает актуальность последних результатов анализа нескольких автомобилей одним запросом.
+        Если пакетный маршрут недоступен, результаты подтверждаются по одному,
+        а пакетный маршрут не используется в течение bulk_retry_interval секунд.
+        
+        Args:
+            touches (list): Пары (ID автомобиля, время подтверждения в формате ISO)
             
-        except Exception as e:
-            logger.error(f"Error saving analysis result: {str(e)}")
-            return False 
\ No newline at end of file
+        Returns:
+            list: Для каждой пары True, если результат подтвержден, иначе False
+        """
+        route = 'analysis/results/heartbeat/batch'
+        if time.monotonic() >= self._bulk_unavailable.get(route, 0):
+            items = [{'vehicleId': vehicle_id, 'createdAt': created_at} for vehicle_id, created_at in touches]
+            result = self._make_request('POST', route, data={'items': items})
+            if result and isinstance(result.get('confirmed'), list) and len(result['confirmed']) == len(items):
+                logger.info(f"Confirmed {sum(result['confirmed'])} of {len(items)} analysis results")
+                return [bool(confirmed) for confirmed in result['confirmed']]
+            if self.last_status != 404:
+                return [False] * len(touches)
+            logger.warning(f"Bulk route {route} unavailable, falling back to single requests")
+            self._bulk_unavailable[route] = time.monotonic() + self.bulk_retry_interval
+        
+        return [self.touch_analysis_result(vehicle_id, created_at) for vehicle_id, created_at in touches]
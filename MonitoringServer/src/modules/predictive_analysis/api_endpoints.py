@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+from collections import namedtuple
+from issues import issues_to_json
+from record_mapping import snake_case, camel_case_dict
+from telemetry_frame import TelemetryFrame
+
+# Set up logging
+logger = logging.getLogger("ApiEndpoints")
+
+# Запрос к Node.js API: метод, путь (без base_url), тело JSON, URL-параметры
+# и признак поиска автомобиля (для него действует отдельный бюджет времени)
+ApiRequest = namedtuple('ApiRequest', ('method', 'endpoint', 'data', 'params', 'lookup'),
+                        defaults=(None, None, False))
+
+# Обращения к конечным точкам описаны генераторами без ввода-вывода: генератор отдает
+# ApiRequest, получает ответ (dict или None при ошибке) и возвращает разобранный результат.
+# Синхронный ApiClient и асинхронный AsyncApiClient выполняют одни и те же генераторы,
+# отличается только транспорт.
+
+
+def telemetry_frame(items):
+    """
+    Строит колоночный кадр телеметрии из записей ответа API с ключами snake_case
+    для совместимости с legacy-кодом (каждый ключ преобразуется один раз)
+    """
+    return TelemetryFrame.from_records(items, convert=snake_case)
+
+
+def analysis_payload(analysis_result):
+    """
+    Тело запроса сохранения результата анализа: ключи camelCase, проблемы - списком словарей
+    """
+    camel_data = camel_case_dict(analysis_result)
+    if 'issues' in camel_data:
+        camel_data['issues'] = issues_to_json(camel_data['issues'])
+    return camel_data
+
+
+def telemetry_params(vehicle_id, start_date, end_date, limit):
+    """
+    URL-параметры выборки телеметрии автомобиля
+    """
+    params = {'vehicle_id': vehicle_id, 'limit': limit}
+    if start_date:
+        params['start_date'] = start_date
+    if end_date:
+        params['end_date'] = end_date
+    return params
+
+
+def get_vehicle_by_vin(vin):
+    result = yield ApiRequest('GET', 'vehicles/search/by-vin', params={'vin': vin}, lookup=True)
+    if result and 'vehicle' in result:
+        logger.info(f"Vehicle found by VIN {vin}")
+        return result['vehicle']
+    logger.warning(f"Vehicle with VIN {vin} not found")
+    return None
+
+
+def get_vehicle_by_id(vehicle_id):
+    result = yield ApiRequest('GET', f'vehicles/{vehicle_id}', lookup=True)
+    if result and 'vehicle' in result:
+        logger.info(f"Vehicle found by ID {vehicle_id}")
+        return result['vehicle']
+    logger.warning(f"Vehicle with ID {vehicle_id} not found")
+    return None
+
+
+def get_all_vehicles():
+    result = yield ApiRequest('GET', 'vehicles')
+    if result and 'vehicles' in result:
+        logger.info(f"Got {len(result['vehicles'])} vehicles")
+        return result['vehicles']
+    logger.warning("No vehicles found")
+    return []
+
+
+def get_telemetry_data(vehicle_id, start_date=None, end_date=None, limit=10):
+    result = yield ApiRequest('GET', 'telemetry/vehicle-data',
+                              params=telemetry_params(vehicle_id, start_date, end_date, limit))
+    if result and 'data' in result:
+        logger.info(f"Got {len(result['data'])} telemetry records for vehicle {vehicle_id}")
+        return telemetry_frame(result['data'])
+    logger.warning(f"No telemetry data found for vehicle {vehicle_id}")
+    return []
+
+
+def get_vehicle_works(vehicle_id):
+    result = yield ApiRequest('GET', f'works/vehicle/{vehicle_id}')
+    if result and 'works' in result:
+        logger.info(f"Got {len(result['works'])} works for vehicle {vehicle_id}")
+        return result['works']
+    logger.warning(f"No works found for vehicle {vehicle_id}")
+    return []
+
+
+def save_analysis_result(analysis_result):
+    vehicle_id = analysis_result.get('vehicle_id')
+    result = yield ApiRequest('POST', f'analysis/vehicle/{vehicle_id}/results',
+                              data=analysis_payload(analysis_result))
+    if result and result.get('status') == 'success':
+        logger.info(f"Analysis result saved for vehicle {vehicle_id}")
+        return True
+    logger.warning(f"Failed to save analysis result for vehicle {vehicle_id}")
+    return False
+
+
+def touch_analysis_result(vehicle_id, created_at):
+    result = yield ApiRequest('POST', f'analysis/vehicle/{vehicle_id}/results/heartbeat',
+                              data={'createdAt': created_at})
+    if result and result.get('status') == 'success':
+        logger.info(f"Analysis result confirmed for vehicle {vehicle_id}")
+        return True
+    logger.warning(f"Failed to confirm analysis result for vehicle {vehicle_id}")
+    return False
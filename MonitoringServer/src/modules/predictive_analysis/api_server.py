@@ -8,6 +8,9 @@ from flask import Flask, request, jsonify, Response
 from dotenv import load_dotenv
 from database import Database
 from predictive_analyzer import PredictiveAnalyzer
+from health_rules import get_rule_engine
+from issues import Issue
+from telemetry_frame import TelemetryFrame, TelemetryRow
 from datetime import datetime
 import random
 
@@ -29,10 +32,21 @@ logger = logging.getLogger("APIServer")
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False
 
+def _json_default(value):
+    # Структурированные проблемы анализа сериализуются по запросу
+    if isinstance(value, Issue):
+        return value.to_dict()
+    # Записи телеметрии - без служебных ключей анализаторов
+    if isinstance(value, TelemetryRow):
+        return value.to_dict(private=False)
+    if isinstance(value, TelemetryFrame):
+        return value.to_records()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 # Функция для создания корректно кодированного JSON-ответа
 def json_response(data, status=200):
     return Response(
-        json.dumps(data, ensure_ascii=False).encode('utf-8'),
+        json.dumps(data, ensure_ascii=False, default=_json_default).encode('utf-8'),
         status=status,
         mimetype='application/json; charset=utf-8'
     )
@@ -40,6 +54,7 @@ def json_response(data, status=200):
 # Initialize database and analyzer
 db = Database()
 analyzer = PredictiveAnalyzer()
+rules = get_rule_engine()
 
 # Ensure that analysis table exists
 db.create_analysis_table_if_not_exists()
@@ -97,7 +112,31 @@ def health_check():
     return json_response({
         'status': 'ok',
         'service': 'predictive_analysis',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'vehicle_cache': db.vehicle_cache_stats(),
+        'result_writer': db.result_writer_metrics(),
+        'upstream': db.upstream_stats()
+    })
+
+@app.route('/api/cache/vehicles', methods=['DELETE'])
+def invalidate_vehicle_cache():
+    """
+    Эндпоинт для сброса кеша автомобилей (после изменения данных автомобиля).
+    Параметры vehicle_id и vin необязательны; без них сбрасывается весь кеш.
+    """
+    if not authenticate():
+        return json_response({
+            'status': 'error',
+            'message': 'Unauthorized'
+        }, 401)
+    
+    vehicle_id = request.args.get('vehicle_id')
+    vin = request.args.get('vin')
+    db.invalidate_vehicle_cache(vehicle_id=vehicle_id, vin=vin)
+    return json_response({
+        'status': 'success',
+        'message': 'Vehicle cache invalidated',
+        'vehicle_cache': db.vehicle_cache_stats()
     })
 
 @app.route('/api/analyze', methods=['POST'])
@@ -401,42 +440,16 @@ def get_emulator_recommendations(vehicle_id):
         overall_health = int((engine_health + oil_health + tires_health + 
                              brakes_health + suspension_health + battery_health) / 6)
         
-        # Generate recommendations
-        recommendations = []
-        
-        # Engine recommendations
-        if engine_health < 75:
-            recommendations.append("Срочно требуется диагностика двигателя. Наблюдаются признаки серьезного износа.")
-        elif engine_health < 85:
-            recommendations.append("Рекомендуется диагностика двигателя. Обнаружены признаки износа.")
-        
-        # Oil recommendations
-        if oil_health < 70:
-            recommendations.append("Требуется срочная замена моторного масла и фильтра.")
-        elif oil_health < 80:
-            recommendations.append("Рекомендуется замена моторного масла при следующем ТО.")
-        else:
-            recommendations.append("Регулярно проверяйте уровень масла.")
-        
-        # Tires recommendations
-        if tires_health < 80:
-            recommendations.append("Требуется проверка давления в шинах и их состояния. Возможен неравномерный износ.")
-        else:
-            recommendations.append("Проверьте давление в шинах при следующем ТО.")
-        
-        # Brakes recommendations
-        if brakes_health < 80:
-            recommendations.append("Рекомендуется проверка тормозной системы. Возможен износ колодок.")
-        else:
-            recommendations.append("Регулярно проверяйте состояние тормозной системы.")
-        
-        # Suspension recommendations
-        if suspension_health < 80:
-            recommendations.append("Рекомендуется диагностика подвески. Возможны признаки износа амортизаторов.")
-        
-        # Battery recommendations
-        if battery_health < 80:
-            recommendations.append("Рекомендуется проверка аккумулятора. Возможно снижение емкости.")
+        # Generate recommendations from the emulator table of the health rules
+        rules.reload_if_changed()
+        recommendations = list(rules.recommend({
+            'engine': engine_health,
+            'oil': oil_health,
+            'tires': tires_health,
+            'brakes': brakes_health,
+            'suspension': suspension_health,
+            'battery': battery_health
+        }, table='emulator_recommendations'))
         
         # Additional recommendations
         additional_recs = [
@@ -522,4 +535,6 @@ def get_analysis_recommendations(vehicle_id):
     return get_emulator_recommendations(vehicle_id)
 
 if __name__ == "__main__":
+    # Синхронизация реплики телеметрии - только в процессе сервера, не в рабочих процессах анализа
+    db.start_replica_sync()
     app.run(host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
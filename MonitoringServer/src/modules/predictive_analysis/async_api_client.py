@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import contextvars
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dotenv import load_dotenv
+from api_client import ApiClient
+from http_transport import RETRY_STATUS_CODES, IDEMPOTENT_METHODS
+import api_endpoints
+
+# Асинхронный HTTP-клиент (необязательная зависимость)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger("AsyncApiClient")
+
+
+class AsyncApiClient:
+    """
+    Асинхронный клиент Node.js API: те же методы, что у ApiClient, в виде корутин
+    (запросы и разбор ответов общие - api_endpoints, асинхронный только транспорт).
+    Один пул соединений (aiohttp) на клиент с общим лимитом соединений и лимитом
+    на хост; таймауты и повторы такие же, как у синхронного транспорта.
+    Клиент привязан к циклу событий, в котором выполнен первый запрос.
+    """
+
+    def __init__(self):
+        """
+        Инициализирует клиент с настройками из .env
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncApiClient")
+        self.api_base_url = os.getenv('NODE_API_URL', 'http://localhost:5000/api')
+        self.pool_size = int(os.getenv('API_POOL_SIZE', 32))
+        self.per_host_limit = int(os.getenv('API_ASYNC_PER_HOST_LIMIT', 32))
+        self.connect_timeout = float(os.getenv('API_CONNECT_TIMEOUT', 3.05))
+        self.read_timeout = float(os.getenv('API_READ_TIMEOUT', 30))
+        self.max_retries = int(os.getenv('API_MAX_RETRIES', 3))
+        self.backoff_base = float(os.getenv('API_BACKOFF_BASE', 0.5))
+        self.backoff_max = float(os.getenv('API_BACKOFF_MAX', 10))
+        self._session = None
+        # Код ответа последнего запроса текущей задачи
+        self._status = contextvars.ContextVar('api_status', default=None)
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.per_host_limit)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                                  headers={'Content-Type': 'application/json'})
+        return self._session
+
+    async def send(self, method, endpoint, data=None, params=None):
+        """
+        Выполняет запрос с повторами: ошибки соединения повторяются для всех методов,
+        ответы 5xx и таймауты - только для идемпотентных методов.
+        Отмена задачи прерывает запрос и возвращает соединение в пул.
+
+        Args:
+            method (str): HTTP метод
+            endpoint (str): API endpoint (без base_url)
+            data (dict, optional): Тело запроса в JSON
+            params (dict, optional): URL-параметры
+
+        Returns:
+            tuple: (код ответа, JSON ответа для 200/201 или текст ответа)
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: Если все попытки завершились ошибкой
+        """
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS
+        url = f"{self.api_base_url}/{endpoint}"
+        if params:
+            params = {key: str(value) for key, value in params.items() if value is not None}
+        attempt = 0
+        while True:
+            try:
+                async with self._get_session().request(method, url, json=data, params=params) as response:
+                    if response.status not in RETRY_STATUS_CODES or not idempotent or attempt >= self.max_retries:
+                        if response.status in (200, 201):
+                            return response.status, await response.json(content_type=None)
+                        return response.status, await response.text()
+                    error = f"HTTP {response.status}"
+            except asyncio.TimeoutError:
+                # Таймаут чтения (aiohttp.ServerTimeoutError) - запрос мог быть выполнен сервером
+                if attempt >= self.max_retries or not idempotent:
+                    raise
+                error = "timeout"
+            except aiohttp.ClientConnectionError as e:
+                if attempt >= self.max_retries:
+                    raise
+                error = str(e) or type(e).__name__
+
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+            attempt += 1
+            logger.warning(f"{method} {url} failed ({error}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _make_request(self, method, endpoint, data=None, params=None):
+        """
+        Выполняет запрос к API
+
+        Returns:
+            dict: Результат запроса или None в случае ошибки
+        """
+        self._status.set(None)
+        try:
+            logger.info(f"Making async {method} request to {self.api_base_url}/{endpoint}")
+            status, payload = await self.send(method, endpoint, data=data, params=params)
+            self._status.set(status)
+            if status in (200, 201):
+                return payload
+            logger.error(f"API request failed: {status} - {payload}")
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error making API request: {str(e) or type(e).__name__}")
+            return None
+
+    @property
+    def last_status(self):
+        """
+        Код ответа последнего запроса текущей задачи (None, если ответа не было)
+        """
+        return self._status.get()
+
+    async def _call(self, exchange):
+        """
+        Выполняет обращение к конечной точке, описанное генератором api_endpoints
+        (те же генераторы, что у ApiClient; отличается только транспорт)
+
+        Returns:
+            Разобранный результат обращения
+        """
+        result = None
+        try:
+            while True:
+                request = exchange.send(result)
+                result = await self._make_request(request.method, request.endpoint, data=request.data,
+                                                  params=request.params)
+        except StopIteration as stop:
+            return stop.value
+
+    async def get_vehicle_by_vin(self, vin):
+        """
+        Получает данные автомобиля по VIN
+
+        Returns:
+            dict: Данные автомобиля или None
+        """
+        return await self._call(api_endpoints.get_vehicle_by_vin(vin))
+
+    async def get_vehicle_by_id(self, vehicle_id):
+        """
+        Получает данные автомобиля по ID
+
+        Returns:
+            dict: Данные автомобиля или None
+        """
+        return await self._call(api_endpoints.get_vehicle_by_id(vehicle_id))
+
+    async def get_all_vehicles(self):
+        """
+        Получает список всех автомобилей
+
+        Returns:
+            list: Список автомобилей или пустой список
+        """
+        return await self._call(api_endpoints.get_all_vehicles())
+
+    async def get_telemetry_data(self, vehicle_id, start_date=None, end_date=None, limit=10):
+        """
+        Получает телеметрические данные для автомобиля
+
+        Returns:
+            TelemetryFrame: Телеметрия (колоночный кадр) или пустой список
+        """
+        return await self._call(api_endpoints.get_telemetry_data(vehicle_id, start_date, end_date, limit))
+
+    async def get_vehicle_works(self, vehicle_id):
+        """
+        Получает историю работ для автомобиля
+
+        Returns:
+            list: Список работ или пустой список
+        """
+        return await self._call(api_endpoints.get_vehicle_works(vehicle_id))
+
+    async def save_analysis_result(self, analysis_result):
+        """
+        Сохраняет результат анализа через API
+
+        Returns:
+            bool: True в случае успеха, False в случае ошибки
+        """
+        return await self._call(api_endpoints.save_analysis_result(analysis_result))
+
+    async def touch_analysis_result(self, vehicle_id, created_at):
+        """
+        Подтверждает, что последний сохраненный результат анализа все еще актуален
+
+        Returns:
+            bool: True в случае успеха, False если результата нет или произошла ошибка
+        """
+        return await self._call(api_endpoints.touch_analysis_result(vehicle_id, created_at))
+
+    async def close(self):
+        """
+        Закрывает пул соединений
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class AsyncBackedApiClient(ApiClient):
+    """
+    Синхронный ApiClient поверх AsyncApiClient: запросы всех потоков выполняются
+    в одном цикле событий фонового потока через общий асинхронный пул соединений.
+    Database работает с ним так же, как с ApiClient; асинхронный код может вызывать
+    корутины async_client через run_async.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._loop = None
+        self._loop_pid = None
+        self._async_client = None
+        self._loop_lock = threading.Lock()
+
+    def _ensure_loop(self):
+        # После fork цикл событий и пул соединений родителя недоступны, создаются новые
+        pid = os.getpid()
+        if self._loop is None or self._loop_pid != pid:
+            with self._loop_lock:
+                if self._loop is None or self._loop_pid != pid:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="AsyncApiLoop", daemon=True).start()
+                    self._async_client = AsyncApiClient()
+                    self._loop = loop
+                    self._loop_pid = pid
+        return self._loop
+
+    @property
+    def async_client(self):
+        """
+        Асинхронный клиент, корутины которого выполняются через run_async
+        """
+        self._ensure_loop()
+        return self._async_client
+
+    def run_async(self, coroutine):
+        """
+        Запускает корутину в цикле событий клиента
+
+        Args:
+            coroutine: Корутина (например, async_client.get_telemetry_data(...))
+
+        Returns:
+            concurrent.futures.Future: Результат (для asyncio - через asyncio.wrap_future;
+                отмена future отменяет и запрос)
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    def _send(self, method, endpoint, params, data, deadline):
+        """
+        Отправляет запрос через общий асинхронный пул (сигнатура как у ApiClient._send);
+        по истечении бюджета времени запрос отменяется
+        """
+        future = self.run_async(self.async_client.send(method, endpoint, data=data, params=params))
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def close(self):
+        """
+        Закрывает пул соединений и останавливает цикл событий
+        """
+        if self._loop is not None and self._loop_pid == os.getpid():
+            self.run_async(self._async_client.close()).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger("AsyncPipeline")
+
+# Маркер завершения очереди
+_DONE = object()
+
+
+class AsyncAnalysisPipeline:
+    """
+    Асинхронный конвейер анализа автопарка.
+    Стадия загрузки одновременно запрашивает телеметрию и историю работ для многих
+    автомобилей (с ограничением числа одновременных запросов), стадия анализа
+    обрабатывает автомобили по мере поступления данных.
+    """
+
+    def __init__(self, analyzer):
+        """
+        Args:
+            analyzer (PredictiveAnalyzer): Анализатор, выполняющий расчет и сохранение
+        """
+        self.analyzer = analyzer
+        self.db = analyzer.db
+        self.concurrency = max(1, int(os.getenv('ANALYSIS_FETCH_CONCURRENCY', 16)))
+        logger.info(f"Async pipeline configured with fetch concurrency {self.concurrency}")
+
+    def run(self, vehicles, prefetched=None):
+        """
+        Запускает конвейер для списка автомобилей
+
+        Args:
+            vehicles (list): Список автомобилей
+            prefetched (dict, optional): Уже загруженные данные: ID -> (телеметрия, история работ)
+
+        Returns:
+            list: Список успешных результатов анализа (в порядке списка автомобилей)
+        """
+        if not vehicles:
+            return []
+        return asyncio.run(self._run(vehicles, prefetched or {}))
+
+    async def _run(self, vehicles, prefetched):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        queue = asyncio.Queue()
+
+        # Два запроса на автомобиль выполняются одновременно
+        with ThreadPoolExecutor(max_workers=self.concurrency * 2) as io_executor, \
+                ThreadPoolExecutor(max_workers=1) as cpu_executor:
+
+            # Запросы идут через Database (реплика, кеш, автоматы защиты и бюджеты времени),
+            # как и в остальных режимах; с асинхронным клиентом API (API_CLIENT_MODE=async)
+            # Database выполняет их в общем асинхронном пуле соединений
+            def request(method, vehicle_id):
+                return loop.run_in_executor(io_executor, getattr(self.db, method), vehicle_id)
+
+            async def fetch(row, vehicle):
+                vehicle_id = vehicle.get('id')
+                if vehicle_id in prefetched:
+                    await queue.put((row, vehicle) + tuple(prefetched[vehicle_id]))
+                    return
+                async with semaphore:
+                    try:
+                        telemetry_data, work_history = await asyncio.gather(
+                            request('get_telemetry_data', vehicle_id),
+                            request('get_vehicle_works', vehicle_id)
+                        )
+                    except Exception as e:
+                        logger.error(f"Error fetching data for vehicle {vehicle_id}: {str(e)}")
+                        telemetry_data, work_history = None, None
+                await queue.put((row, vehicle, telemetry_data, work_history))
+
+            async def fetch_all():
+                await asyncio.gather(*(fetch(row, vehicle) for row, vehicle in enumerate(vehicles)))
+                await queue.put(_DONE)
+
+            async def analyze_all():
+                # Анализ выполняется в отдельном потоке, чтобы не блокировать загрузку
+                results = {}
+                while True:
+                    item = await queue.get()
+                    if item is _DONE:
+                        return results
+                    row, vehicle, telemetry_data, work_history = item
+                    if telemetry_data is None:
+                        logger.warning(f"Analysis failed for vehicle {vehicle.get('id')}")
+                        continue
+                    result = await loop.run_in_executor(
+                        cpu_executor, self.analyzer._analyze_vehicle, vehicle, telemetry_data, work_history
+                    )
+                    if result:
+                        results[row] = result
+                        logger.info(f"Analysis completed for vehicle {vehicle.get('id')}")
+                    else:
+                        logger.warning(f"Analysis failed for vehicle {vehicle.get('id')}")
+
+            _, results = await asyncio.gather(fetch_all(), analyze_all())
+
+        return [results[row] for row in sorted(results)]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import datetime
+import numpy as np
+from feature_context import VehicleContext
+from telemetry_frame import TelemetryFrame
+from driving_behaviour import fleet_driving_profiles
+from health_rules import get_rule_engine
+
+# Set up logging
+logger = logging.getLogger("BatchAnalyzer")
+
+# Системы таблицы правил и соответствующие ключи оценок
+SYSTEM_KEYS = {
+    'engine': 'engine_health',
+    'oil': 'oil_health',
+    'tires': 'tires_health',
+    'brakes': 'brakes_health',
+    'suspension': 'suspension_health',
+    'battery': 'battery_health',
+}
+
+
+class IrregularRecordError(Exception):
+    """Данные автомобиля не укладываются в колоночное представление"""
+    pass
+
+
+def _is_number(value):
+    return isinstance(value, (int, float))
+
+
+class BatchHealthScorer:
+    """
+    Пакетный расчет оценок состояния для всего автопарка.
+    Последние записи телеметрии и признаки истории работ собираются в колонки NumPy,
+    после чего таблица правил всех шести систем применяется несколькими операциями над массивами.
+    Результаты совпадают с поэлементным путем PredictiveAnalyzer._analyze_vehicle.
+    """
+
+    def __init__(self, rules=None):
+        """
+        Args:
+            rules (HealthRuleEngine, optional): Движок правил (по умолчанию общий экземпляр процесса)
+        """
+        self.rules = rules or get_rule_engine()
+
+    def score(self, telemetry_by_vehicle, works_by_vehicle, now=None):
+        """
+        Вычисляет оценки состояния для списка автомобилей
+
+        Args:
+            telemetry_by_vehicle (list): Телеметрия каждого автомобиля (TelemetryFrame или списки записей)
+            works_by_vehicle (list): История работ каждого автомобиля (список списков работ)
+            now (datetime, optional): Момент анализа
+
+        Returns:
+            tuple: (dict ключ оценки -> np.ndarray, np.ndarray маска автомобилей для поэлементного анализа,
+                    dict номер автомобиля -> список проблем Issue)
+        """
+        now = now or datetime.now()
+        count = len(telemetry_by_vehicle)
+        columns, row_values = self._build_columns(telemetry_by_vehicle, works_by_vehicle, now)
+        matches = []
+        penalties = self.rules.evaluate_columns(columns, count, matches)
+        issues = self.rules.column_issues(matches, row_values, columns['has_telemetry'] & ~columns['irregular'])
+
+        scores = {}
+        has_telemetry = columns['has_telemetry']
+        for system, key in SYSTEM_KEYS.items():
+            system_scores = np.clip(100.0 - penalties[system], 0, 100)
+            scores[key] = np.where(has_telemetry, system_scores, self.rules.no_data_score(system)).astype(np.int64)
+
+        total = np.zeros(count, dtype=np.int64)
+        for key in SYSTEM_KEYS.values():
+            total += scores[key]
+        scores['overall_health'] = total // 6
+
+        return scores, columns['irregular'], issues
+
+    def _build_columns(self, telemetry_by_vehicle, works_by_vehicle, now):
+        """
+        Собирает колоночное представление: значения последней записи и признаки истории
+
+        Returns:
+            tuple: (dict колонок, список исходных значений каждой строки для текстов проблем)
+        """
+        count = len(telemetry_by_vehicle)
+        columns = {}
+        for name, spec in self.rules.fields.items():
+            if spec.type == 'category':
+                columns[name] = np.full(count, None, dtype=object)
+            elif spec.type == 'list':
+                columns[name] = np.zeros(count)
+            else:
+                columns[name] = np.full(count, np.nan)
+        columns['has_telemetry'] = np.zeros(count, dtype=bool)
+        columns['irregular'] = np.zeros(count, dtype=bool)
+        row_values = [None] * count
+
+        # Телеметрия переводится в колоночные кадры один раз: их записи, показатели вождения
+        # и контексты признаков используют одни и те же колонки
+        frames = []
+        for row, telemetry_data in enumerate(telemetry_by_vehicle):
+            try:
+                frames.append(TelemetryFrame.coerce(telemetry_data))
+            except Exception:
+                columns['irregular'][row] = True
+                frames.append(TelemetryFrame.coerce(None))
+        telemetry_by_vehicle = frames
+
+        # Показатели вождения всего автопарка считаются одним векторным проходом
+        profiles = fleet_driving_profiles(telemetry_by_vehicle)
+
+        for row, (telemetry_data, work_history) in enumerate(zip(telemetry_by_vehicle, works_by_vehicle)):
+            if not telemetry_data:
+                continue
+            columns['has_telemetry'][row] = True
+            try:
+                values = self._extract_row(VehicleContext(None, telemetry_data, work_history, now, self.rules, profiles[row]))
+            except Exception:
+                # Нестандартные данные (словари по позициям, неверные типы, ошибки дат)
+                # обрабатываются поэлементным анализатором с его собственной обработкой ошибок
+                columns['irregular'][row] = True
+                continue
+            row_values[row] = values
+            for name, value in values.items():
+                if isinstance(value, tuple):
+                    # Для списков (коды ошибок) в колонку попадает количество элементов
+                    value = len(value)
+                elif isinstance(value, str):
+                    value = value.lower()
+                if name not in columns:
+                    columns[name] = np.full(count, np.nan)
+                columns[name][row] = value
+
+        return columns, row_values
+
+    def _extract_fields(self, latest_data):
+        """
+        Значения полей таблицы правил из последней записи телеметрии (списки - кортежами)
+        """
+        values = {}
+        for name, spec in self.rules.fields.items():
+            value = latest_data.get(name, spec.default)
+            if spec.type == 'category':
+                if value is None:
+                    continue
+                if not isinstance(value, str):
+                    raise IrregularRecordError(name)
+                values[name] = value
+            elif spec.type == 'list':
+                values[name] = tuple(value) if value else ()
+            elif spec.per_position:
+                # Словарь по позициям обрабатывается поэлементно
+                if isinstance(value, dict):
+                    raise IrregularRecordError(name)
+                if _is_number(value):
+                    values[name] = value
+            else:
+                if value is None and not spec.required:
+                    continue
+                if not _is_number(value):
+                    raise IrregularRecordError(name)
+                values[name] = value
+        return values
+
+    def _extract_row(self, context):
+        """
+        Значения полей последней записи, агрегаты окон и производные признаки всех систем из контекста автомобиля
+        """
+        values = self._extract_fields(context.latest)
+        for source, (field, aggregate, window, above) in self.rules.aggregate_rules().items():
+            value = context.aggregates.value(field, aggregate, window, above)
+            if value is not None:
+                values[source] = value
+        for system in SYSTEM_KEYS:
+            for name, value in context.features(system).items():
+                if isinstance(value, (list, tuple)):
+                    values[name] = tuple(value)
+                elif _is_number(value):
+                    values[name] = value
+                else:
+                    raise IrregularRecordError(name)
+        return values
@@ -3,11 +3,23 @@
 
 import os
 import json
+import time
+import atexit
 import logging
 import threading
 from datetime import datetime
 from dotenv import load_dotenv
 from api_client import ApiClient
+try:
+    from async_api_client import AsyncBackedApiClient, aiohttp
+except ImportError:
+    AsyncBackedApiClient, aiohttp = None, None
+from watermarks import result_fingerprint
+from lookup_cache import TTLCache, MISSING
+from write_behind import WriteBehindQueue
+from telemetry_replica import TelemetryReplica
+from analysis_store import AnalysisStore
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables
 load_dotenv()
@@ -45,8 +57,67 @@ class Database:
                 return
                 
             try:
-                # Инициализируем клиент API
-                self.api_client = ApiClient()
+                # Инициализируем клиент API: sync - requests, async - общий асинхронный пул (aiohttp)
+                client_mode = os.getenv('API_CLIENT_MODE', 'sync').lower()
+                if client_mode == 'async' and aiohttp is None:
+                    logger.warning("aiohttp is not available, falling back to the sync API client")
+                    client_mode = 'sync'
+                self.api_client = AsyncBackedApiClient() if client_mode == 'async' else ApiClient()
+                
+                # Неизменившиеся результаты анализа: skip - не сохранять, heartbeat - только
+                # подтверждать актуальность последнего результата, save - сохранять всегда.
+                # Полный результат все равно сохраняется не реже раза в ANALYSIS_SAVE_MAX_AGE секунд
+                self.unchanged_save_mode = os.getenv('ANALYSIS_UNCHANGED_SAVE', 'heartbeat').lower()
+                self.save_max_age = int(os.getenv('ANALYSIS_SAVE_MAX_AGE', 86400))
+                self._saved_results = {}
+                self._saved_lock = threading.Lock()
+                
+                # Кеш автомобилей (данные почти не меняются): по ID, по VIN и полный список
+                self._vehicle_cache = TTLCache(
+                    int(os.getenv('VEHICLE_CACHE_SIZE', 10000)),
+                    float(os.getenv('VEHICLE_CACHE_TTL', 300)),
+                    float(os.getenv('VEHICLE_CACHE_NEGATIVE_TTL', 60))
+                )
+                
+                # Отложенная пакетная запись результатов анализа (write-behind): анализ не ждет
+                # записи каждого результата, результаты отправляются пачками фоновым потоком
+                self.write_behind = os.getenv('ANALYSIS_WRITE_BEHIND', 'true').lower() == 'true'
+                self._result_writer = WriteBehindQueue(
+                    self._write_results,
+                    batch_size=int(os.getenv('ANALYSIS_WRITE_BATCH_SIZE', 50)),
+                    flush_interval=float(os.getenv('ANALYSIS_WRITE_FLUSH_INTERVAL', 1.0)),
+                    max_queue=int(os.getenv('ANALYSIS_WRITE_QUEUE_SIZE', 10000)),
+                    max_retries=int(os.getenv('ANALYSIS_WRITE_MAX_RETRIES', 5)),
+                    retry_delay=float(os.getenv('ANALYSIS_WRITE_RETRY_DELAY', 1.0)),
+                    name="AnalysisResultWriter"
+                )
+                self.write_drain_timeout = float(os.getenv('ANALYSIS_WRITE_DRAIN_TIMEOUT', 30))
+                
+                # Локальная реплика телеметрии и истории работ (SQLite): чтение без обращения к API,
+                # данные старше TELEMETRY_REPLICA_MAX_STALENESS секунд сначала догружаются из API
+                self.replica = None
+                if os.getenv('TELEMETRY_REPLICA', 'false').lower() == 'true':
+                    self.replica = TelemetryReplica(
+                        os.getenv('TELEMETRY_REPLICA_PATH') or os.path.join(
+                            os.path.dirname(os.path.abspath(__file__)), 'telemetry_replica.db'),
+                        int(os.getenv('TELEMETRY_REPLICA_HISTORY_DAYS', 90))
+                    )
+                    self.replica_max_staleness = float(os.getenv('TELEMETRY_REPLICA_MAX_STALENESS', 120))
+                    self.replica_sync_interval = float(os.getenv('TELEMETRY_REPLICA_SYNC_INTERVAL', 60))
+                # Фоновую синхронизацию реплики запускает только процесс сервиса (start_replica_sync)
+                self._replica_sync_pid = None
+                self._replica_sync_lock = threading.Lock()
+                # Локальная история результатов анализа (SQLite, индекс по автомобилю и времени):
+                # последний результат и история читаются через execute_query без обращения к API
+                self.analysis_store = None
+                if os.getenv('ANALYSIS_STORE', 'true').lower() == 'true':
+                    self.analysis_store = AnalysisStore(
+                        os.getenv('ANALYSIS_STORE_PATH') or os.path.join(
+                            os.path.dirname(os.path.abspath(__file__)), 'analysis_history.db')
+                    )
+                # При завершении процесса буфер дописывается
+                atexit.register(self.close)
+                
                 self._initialized = True
                 
                 logger.info("Database proxy initialized successfully")
@@ -56,13 +127,24 @@ class Database:
     
     def get_all_vehicles(self):
         """
-        Получает список всех автомобилей через API.
+        Получает список всех автомобилей через API (с кешированием).
         
         Returns:
             list: Список автомобилей
         """
+        cached = self._vehicle_cache.get(('all',))
+        if cached is not MISSING:
+            return [dict(vehicle) for vehicle in cached]
         try:
             vehicles = self.api_client.get_all_vehicles()
+            if vehicles:
+                self._vehicle_cache.put(('all',), [dict(vehicle) for vehicle in vehicles])
+                for vehicle in vehicles:
+                    self._cache_vehicle(vehicle)
+            elif not self._is_not_found():
+                stale = self._stale_vehicle(('all',))
+                if stale:
+                    return [dict(vehicle) for vehicle in stale]
             return vehicles
         except Exception as e:
             logger.error(f"Error getting all vehicles: {str(e)}")
@@ -70,7 +152,7 @@ class Database:
     
     def get_vehicle_by_id(self, vehicle_id):
         """
-        Получает данные автомобиля по ID через API.
+        Получает данные автомобиля по ID через API (с кешированием).
         
         Args:
             vehicle_id: ID автомобиля
@@ -78,8 +160,19 @@ class Database:
         Returns:
             dict: Данные автомобиля или None
         """
+        key = ('id', str(vehicle_id))
+        cached = self._vehicle_cache.get(key)
+        if cached is not MISSING:
+            return dict(cached) if cached is not None else None
         try:
             vehicle = self.api_client.get_vehicle_by_id(vehicle_id)
+            if vehicle:
+                self._cache_vehicle(vehicle, key)
+            elif self._is_not_found():
+                self._vehicle_cache.put(key, None)
+            else:
+                stale = self._stale_vehicle(key)
+                return dict(stale) if stale else None
             return vehicle
         except Exception as e:
             logger.error(f"Error getting vehicle by ID {vehicle_id}: {str(e)}")
@@ -87,7 +180,7 @@ class Database:
     
     def get_vehicle_by_vin(self, vin):
         """
-        Получает данные автомобиля по VIN через API.
+        Получает данные автомобиля по VIN через API (с кешированием, включая неизвестные VIN).
         
         Args:
             vin: VIN автомобиля
@@ -95,16 +188,90 @@ class Database:
         Returns:
             dict: Данные автомобиля или None
         """
+        key = ('vin', str(vin).upper())
+        cached = self._vehicle_cache.get(key)
+        if cached is not MISSING:
+            return dict(cached) if cached is not None else None
         try:
             vehicle = self.api_client.get_vehicle_by_vin(vin)
+            if vehicle:
+                self._cache_vehicle(vehicle, key)
+            elif self._is_not_found():
+                self._vehicle_cache.put(key, None)
+            else:
+                stale = self._stale_vehicle(key)
+                return dict(stale) if stale else None
             return vehicle
         except Exception as e:
             logger.error(f"Error getting vehicle by VIN {vin}: {str(e)}")
             return None
     
+    def _cache_vehicle(self, vehicle, *keys):
+        """
+        Кеширует автомобиль под ключами ID и VIN (и дополнительными ключами запроса)
+        """
+        cached = dict(vehicle)
+        keys = list(keys)
+        if vehicle.get('id') is not None:
+            keys.append(('id', str(vehicle['id'])))
+        if vehicle.get('vin'):
+            keys.append(('vin', str(vehicle['vin']).upper()))
+        for key in keys:
+            self._vehicle_cache.put(key, cached)
+    
+    def _stale_vehicle(self, key):
+        """
+        Устаревшая запись кеша для ответа, пока API недоступен
+        
+        Returns:
+            Значение из кеша или None
+        """
+        stale = self._vehicle_cache.get_stale(key)
+        if stale is MISSING or stale is None:
+            return None
+        logger.warning(f"API unavailable, serving stale cached data for {key}")
+        return stale
+    
+    def _is_not_found(self):
+        """
+        Был ли последний запрос потока успешным ответом об отсутствии объекта
+        (ошибки сети и сервера не кешируются)
+        """
+        return getattr(self.api_client, 'last_status', None) in (200, 404)
+    
+    def invalidate_vehicle_cache(self, vehicle_id=None, vin=None):
+        """
+        Сбрасывает кеш автомобилей: записи конкретного автомобиля или весь кеш
+        
+        Args:
+            vehicle_id (optional): ID автомобиля
+            vin (optional): VIN автомобиля
+        """
+        if vehicle_id is None and vin is None:
+            self._vehicle_cache.invalidate()
+            return
+        cached = MISSING
+        if vehicle_id is not None:
+            cached = self._vehicle_cache.get_stale(('id', str(vehicle_id)))
+            self._vehicle_cache.invalidate(('id', str(vehicle_id)))
+        if vin is not None:
+            self._vehicle_cache.invalidate(('vin', str(vin).upper()))
+        if cached not in (MISSING, None) and cached.get('vin'):
+            self._vehicle_cache.invalidate(('vin', str(cached['vin']).upper()))
+        self._vehicle_cache.invalidate(('all',))
+    
+    def vehicle_cache_stats(self):
+        """
+        Счетчики кеша автомобилей
+        
+        Returns:
+            dict: Размер, попадания, промахи, доля попаданий и вытеснения
+        """
+        return self._vehicle_cache.stats()
+    
     def get_telemetry_data(self, vehicle_id, start_date=None, end_date=None):
         """
-        Получает телеметрические данные для автомобиля через API.
+        Получает телеметрические данные для автомобиля через API (или из локальной реплики).
         
         Args:
             vehicle_id: ID автомобиля
@@ -112,15 +279,57 @@ class Database:
             end_date (optional): Конечная дата выборки
             
         Returns:
-            list: Список телеметрических данных
+            TelemetryFrame: Телеметрия (колоночный кадр; пустой список при ошибке)
         """
         try:
+            if self.replica is not None:
+                self._refresh_replica(vehicle_id, works=False)
+                return self.replica.get_telemetry_data(vehicle_id, start_date, end_date)
             telemetry_data = self.api_client.get_telemetry_data(vehicle_id, start_date, end_date)
             return telemetry_data
         except Exception as e:
             logger.error(f"Error getting telemetry data for vehicle {vehicle_id}: {str(e)}")
             return []
     
+    def iter_telemetry_data(self, vehicle_id, start_date=None, end_date=None):
+        """
+        Постранично загружает длинную историю телеметрии автомобиля через API
+        (от новых записей к старым, без загрузки всей истории в память).
+        
+        Args:
+            vehicle_id: ID автомобиля
+            start_date (optional): Начальная дата выборки
+            end_date (optional): Конечная дата выборки
+            
+        Yields:
+            Записи телеметрии
+        """
+        try:
+            yield from self.api_client.iter_telemetry_data(vehicle_id, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error streaming telemetry data for vehicle {vehicle_id}: {str(e)}")
+    
+    def get_telemetry_data_bulk(self, vehicle_ids, start_date=None, end_date=None):
+        """
+        Получает телеметрические данные нескольких автомобилей пачками запросов через API.
+        
+        Args:
+            vehicle_ids (list): ID автомобилей
+            start_date (optional): Начальная дата выборки
+            end_date (optional): Конечная дата выборки
+            
+        Returns:
+            dict: {ID автомобиля: список телеметрических данных}
+        """
+        try:
+            if self.replica is not None:
+                return {vehicle_id: self.get_telemetry_data(vehicle_id, start_date, end_date)
+                        for vehicle_id in dict.fromkeys(vehicle_ids)}
+            return self.api_client.get_telemetry_data_bulk(vehicle_ids, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error getting telemetry data for {len(vehicle_ids)} vehicles: {str(e)}")
+            return {}
+    
     def get_vehicle_works(self, vehicle_id):
         """
         Получает историю работ для автомобиля через API.
@@ -132,31 +341,152 @@ class Database:
             list: Список работ
         """
         try:
+            if self.replica is not None:
+                self._refresh_replica(vehicle_id, telemetry=False)
+                return self.replica.get_vehicle_works(vehicle_id)
             works = self.api_client.get_vehicle_works(vehicle_id)
             return works
         except Exception as e:
             logger.error(f"Error getting works for vehicle {vehicle_id}: {str(e)}")
             return []
     
+    def get_vehicle_works_bulk(self, vehicle_ids):
+        """
+        Получает историю работ нескольких автомобилей пачками запросов через API.
+        
+        Args:
+            vehicle_ids (list): ID автомобилей
+            
+        Returns:
+            dict: {ID автомобиля: список работ}
+        """
+        try:
+            if self.replica is not None:
+                return {vehicle_id: self.get_vehicle_works(vehicle_id) for vehicle_id in dict.fromkeys(vehicle_ids)}
+            return self.api_client.get_vehicle_works_bulk(vehicle_ids)
+        except Exception as e:
+            logger.error(f"Error getting works for {len(vehicle_ids)} vehicles: {str(e)}")
+            return {}
+    
+    def _refresh_replica(self, vehicle_id, telemetry=True, works=True):
+        """
+        Догружает в реплику данные автомобиля, если они устарели. Если API недоступен,
+        данные отдаются из реплики как есть.
+        
+        Returns:
+            bool: True, если данные реплики актуальны
+        """
+        fresh = True
+        if telemetry:
+            age = self.replica.telemetry_age(vehicle_id)
+            if age is None or age > self.replica_max_staleness:
+                fresh = self.replica.pull_telemetry(self.api_client, vehicle_id)
+        if works:
+            age = self.replica.works_age(vehicle_id)
+            if age is None or age > self.replica_max_staleness:
+                vehicle_works = self.api_client.get_vehicle_works(vehicle_id)
+                if self.api_client.last_status in (200, 404):
+                    self.replica.store_works({vehicle_id: vehicle_works})
+                else:
+                    logger.warning(f"Works sync for vehicle {vehicle_id} failed, serving replica data")
+                    fresh = False
+        return fresh
+    
+    def sync_replica(self, vehicle_ids=None):
+        """
+        Синхронизирует локальную реплику с API: догружает новую телеметрию
+        и историю работ автомобилей, удаляет телеметрию старше срока хранения
+        
+        Args:
+            vehicle_ids (list, optional): ID автомобилей (по умолчанию - все автомобили)
+            
+        Returns:
+            int: Количество полностью синхронизированных автомобилей
+        """
+        if self.replica is None:
+            return 0
+        if vehicle_ids is None:
+            vehicle_ids = [vehicle.get('id') for vehicle in self.get_all_vehicles()]
+        if not vehicle_ids:
+            return 0
+        
+        def sync(vehicle_id):
+            try:
+                return self._refresh_replica(vehicle_id)
+            except Exception as e:
+                logger.error(f"Replica sync error for vehicle {vehicle_id}: {str(e)}")
+                return False
+        
+        started = time.monotonic()
+        concurrency = getattr(self.api_client, 'bulk_fallback_concurrency', 1)
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(vehicle_ids))) as executor:
+            synced = sum(executor.map(sync, vehicle_ids))
+        pruned = self.replica.prune()
+        logger.info(f"Telemetry replica synced: {synced} of {len(vehicle_ids)} vehicles, "
+                    f"{pruned} old records pruned in {time.monotonic() - started:.2f}s")
+        return synced
+    
+    def start_replica_sync(self):
+        """
+        Запускает фоновую синхронизацию реплики раз в TELEMETRY_REPLICA_SYNC_INTERVAL секунд.
+        Вызывается процессом сервиса (start_service.py, api_server.py); рабочие процессы
+        анализа читают реплику без собственного потока синхронизации.
+        
+        Returns:
+            bool: True, если поток синхронизации запущен этим вызовом
+        """
+        if self.replica is None or self.replica_sync_interval <= 0:
+            return False
+        with self._replica_sync_lock:
+            if self._replica_sync_pid == os.getpid():
+                return False
+            self._replica_sync_pid = os.getpid()
+        threading.Thread(target=self._replica_sync_loop, name="TelemetryReplicaSync", daemon=True).start()
+        logger.info(f"Telemetry replica sync started (every {self.replica_sync_interval:.0f}s)")
+        return True
+    
+    def _replica_sync_loop(self):
+        while True:
+            try:
+                self.sync_replica()
+            except Exception as e:
+                logger.error(f"Replica sync error: {str(e)}")
+            time.sleep(self.replica_sync_interval)
+    
     def save_analysis_result(self, analysis_result):
         """
         Сохраняет результат анализа через API.
+        Если результат совпадает с последним сохраненным для автомобиля, запись
+        пропускается или заменяется подтверждением актуальности (ANALYSIS_UNCHANGED_SAVE).
+        При включенной отложенной записи (ANALYSIS_WRITE_BEHIND) результат ставится
+        в очередь и сохраняется фоновым потоком; дождаться записи можно через flush_results.
         
         Args:
             analysis_result (dict): Результат анализа
             
         Returns:
-            bool: True в случае успеха, False в случае ошибки
+            bool: True в случае успеха (или постановки в очередь), False в случае ошибки
         """
         try:
             # Если нет created_at, добавляем его
             if 'created_at' not in analysis_result:
                 analysis_result['created_at'] = datetime.now().isoformat()
+            
+            vehicle_id = analysis_result.get('vehicle_id')
+            fingerprint = result_fingerprint(analysis_result)
+            if self.analysis_store is not None:
+                self._store_result(analysis_result, fingerprint)
+            if self.write_behind:
+                return self._result_writer.submit((analysis_result, fingerprint))
+            
+            if self._save_unchanged(vehicle_id, fingerprint, analysis_result['created_at']):
+                return True
                 
             # Сохраняем анализ через API-клиент
             result = self.api_client.save_analysis_result(analysis_result)
             
             if result:
+                self._remember_saved(vehicle_id, fingerprint)
                 logger.info(f"Analysis saved for vehicle {analysis_result.get('vehicle_id')}")
                 return True
             else:
@@ -167,6 +497,128 @@ class Database:
             logger.error(f"Error saving analysis result: {str(e)}")
             return False
     
+    def _store_result(self, analysis_result, fingerprint):
+        """
+        Записывает результат в локальную историю анализов (ошибка записи не мешает сохранению через API)
+        """
+        try:
+            self.analysis_store.record(analysis_result, fingerprint,
+                                       heartbeat=self.unchanged_save_mode in ('skip', 'heartbeat'))
+        except Exception as e:
+            logger.error(f"Error storing analysis result locally: {str(e)}")
+    
+    def _write_results(self, entries):
+        """
+        Записывает пачку результатов из очереди отложенной записи
+        
+        Args:
+            entries (list): Пары (результат анализа, отпечаток результата)
+            
+        Returns:
+            list: Пары из entries, запись которых нужно повторить
+        """
+        pending, unchanged = [], []
+        for entry in entries:
+            (unchanged if self._is_unchanged(entry[0].get('vehicle_id'), entry[1]) else pending).append(entry)
+        if unchanged and self.unchanged_save_mode == 'heartbeat':
+            # Подтверждения неизменившихся результатов пачки отправляются одним запросом;
+            # неподтвержденные (например, удаленные) результаты сохраняются полностью
+            confirmed = self.api_client.touch_analysis_results_bulk(
+                [(analysis_result.get('vehicle_id'), analysis_result['created_at']) for analysis_result, _ in unchanged])
+            pending.extend(entry for entry, touched in zip(unchanged, confirmed) if not touched)
+        if not pending:
+            return []
+        
+        outcomes = self.api_client.save_analysis_results_bulk([analysis_result for analysis_result, _ in pending])
+        failed = []
+        for entry, saved in zip(pending, outcomes):
+            vehicle_id = entry[0].get('vehicle_id')
+            if saved:
+                self._remember_saved(vehicle_id, entry[1])
+            elif saved is None:
+                failed.append(entry)
+            else:
+                logger.error(f"Failed to save analysis for vehicle {vehicle_id}: vehicle not found")
+        return failed
+    
+    def flush_results(self, timeout=None):
+        """
+        Ждет записи результатов анализа, поставленных в очередь отложенной записи
+        
+        Args:
+            timeout (float, optional): Максимальное время ожидания в секундах (по умолчанию ANALYSIS_WRITE_DRAIN_TIMEOUT)
+            
+        Returns:
+            bool: True, если все результаты записаны
+        """
+        if not self.write_behind:
+            return True
+        flushed = self._result_writer.flush(self.write_drain_timeout if timeout is None else timeout)
+        if not flushed:
+            logger.warning(f"Analysis results not flushed: {self._result_writer.metrics()['queue_depth']} pending")
+        return flushed
+    
+    def result_writer_metrics(self):
+        """
+        Метрики очереди отложенной записи результатов
+        
+        Returns:
+            dict: Глубина очереди, счетчики записей, повторов и потерь, задержка записи пачек
+        """
+        return dict(self._result_writer.metrics(), enabled=self.write_behind)
+    
+    def upstream_stats(self):
+        """
+        Состояние автоматов защиты и задержки конечных точек Node.js API
+        
+        Returns:
+            dict: Статистика клиента API (пустой словарь, если клиент ее не ведет)
+        """
+        resilience_stats = getattr(self.api_client, 'resilience_stats', None)
+        return resilience_stats() if resilience_stats else {}
+    
+    def close(self):
+        """
+        Дописывает очередь результатов анализа (вызывается при завершении процесса)
+        """
+        self._result_writer.close(self.write_drain_timeout)
+    
+    def _is_unchanged(self, vehicle_id, fingerprint):
+        """
+        Совпадает ли результат с последним сохраненным (при включенном ANALYSIS_UNCHANGED_SAVE),
+        и последнее полное сохранение не старше ANALYSIS_SAVE_MAX_AGE
+        """
+        if self.unchanged_save_mode not in ('skip', 'heartbeat'):
+            return False
+        
+        with self._saved_lock:
+            saved = self._saved_results.get(str(vehicle_id))
+        return not (saved is None or saved[0] != fingerprint or time.time() - saved[1] > self.save_max_age)
+    
+    def _save_unchanged(self, vehicle_id, fingerprint, created_at):
+        """
+        Обрабатывает результат, совпадающий с последним сохраненным (сохранение без очереди)
+        
+        Returns:
+            bool: True, если полное сохранение не требуется
+        """
+        if not self._is_unchanged(vehicle_id, fingerprint):
+            return False
+        
+        if self.unchanged_save_mode == 'skip':
+            logger.debug(f"Analysis for vehicle {vehicle_id} unchanged, save skipped")
+            return True
+        
+        # Если подтвердить не удалось (например, результат удален), сохраняем полностью
+        if self.api_client.touch_analysis_result(vehicle_id, created_at):
+            logger.debug(f"Analysis for vehicle {vehicle_id} unchanged, heartbeat sent")
+            return True
+        return False
+    
+    def _remember_saved(self, vehicle_id, fingerprint):
+        with self._saved_lock:
+            self._saved_results[str(vehicle_id)] = (fingerprint, time.time())
+    
     def create_analysis_table_if_not_exists(self):
         """
         Метод-заглушка для совместимости с legacy-кодом.
@@ -180,18 +632,22 @@ class Database:
     
     def execute_query(self, query, params=None, fetch=True):
         """
-        Метод-заглушка для совместимости с legacy-кодом.
-        В новой версии запросы выполняются через API.
-        
-        ВНИМАНИЕ: Этот метод не рекомендуется использовать в новом коде!
+        Выполняет SQL-запрос к локальной истории результатов анализа (таблица vehicle_analysis).
+        Остальные данные доступны только через методы API.
         
         Args:
-            query (str): SQL-запрос (не используется)
-            params (tuple, optional): Параметры запроса (не используется)
-            fetch (bool): Если True, возвращает результаты запроса (не используется)
+            query (str): SQL-запрос (параметры в стиле '?')
+            params (tuple, optional): Параметры запроса
+            fetch (bool): Если True, возвращает результаты запроса
             
         Returns:
-            list или None: Пустой список или None
+            list или None: Строки в виде словарей (пустой список при ошибке или выключенном хранилище) или None
         """
-        logger.warning("execute_query method is deprecated, use specific API methods instead")
-        return [] if fetch else None 
\ No newline at end of file
+        if self.analysis_store is None:
+            logger.warning("Analysis store is disabled (ANALYSIS_STORE), execute_query returns no data")
+            return [] if fetch else None
+        try:
+            return self.analysis_store.execute(query, params, fetch)
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            return [] if fetch else None
@@ -7,6 +7,7 @@ import logging
 import time
 from datetime import datetime
 from dotenv import load_dotenv
+from issues import issues_to_json
 
 # Load environment variables
 load_dotenv()
@@ -102,6 +103,22 @@ class Database:
         # Filtering by date would be added here if needed
         return result
     
+    def iter_telemetry_data(self, vehicle_id, start_date=None, end_date=None):
+        """Iterate over telemetry data for a vehicle"""
+        return iter(self.get_telemetry_data(vehicle_id, start_date, end_date))
+    
+    def flush_results(self, timeout=None):
+        """Results are saved synchronously"""
+        return True
+    
+    def get_telemetry_data_bulk(self, vehicle_ids, start_date=None, end_date=None):
+        """Get telemetry data for several vehicles"""
+        return {vehicle_id: self.get_telemetry_data(vehicle_id, start_date, end_date) for vehicle_id in vehicle_ids}
+    
+    def get_vehicle_works_bulk(self, vehicle_ids):
+        """Get works for several vehicles"""
+        return {vehicle_id: self.get_vehicle_works(vehicle_id) for vehicle_id in vehicle_ids}
+    
     def get_vehicle_works(self, vehicle_id):
         """Get works for a vehicle"""
         vehicle_id = int(vehicle_id) if isinstance(vehicle_id, str) and vehicle_id.isdigit() else vehicle_id
@@ -112,8 +129,10 @@ class Database:
         try:
             # Generate an ID and add timestamp
             analysis_result['id'] = len(self.data['vehicle_analysis']) + 1
-            if isinstance(analysis_result.get('recommendations'), list):
+            if isinstance(analysis_result.get('recommendations'), (list, tuple)):
                 analysis_result['recommendations'] = ','.join(analysis_result['recommendations'])
+            if 'issues' in analysis_result:
+                analysis_result['issues'] = issues_to_json(analysis_result['issues'])
             
             analysis_result['created_at'] = datetime.now().isoformat()
             
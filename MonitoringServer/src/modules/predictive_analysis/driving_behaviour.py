@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import numpy as np
+from telemetry_frame import TelemetryFrame
+
+# Set up logging
+logger = logging.getLogger("DrivingBehaviour")
+
+# Снижение скорости между соседними записями, считающееся резким торможением (км/ч)
+HARD_BRAKING_DELTA = 20
+# Рост скорости между соседними записями, считающийся резким ускорением (км/ч)
+AGGRESSIVE_ACCELERATION_DELTA = 20
+# Границы интервалов гистограммы скоростей (км/ч), последний интервал открыт сверху
+SPEED_BINS = (0, 30, 60, 90, 120, 140)
+
+
+def speed_series(telemetry_data):
+    """
+    Скорости автомобиля в хронологическом порядке
+
+    Args:
+        telemetry_data (TelemetryFrame или list): Телеметрия (API возвращает записи от новых к старым)
+
+    Returns:
+        np.ndarray: Скорости (NaN для записей без числовой скорости)
+    """
+    frame = TelemetryFrame.coerce(telemetry_data)
+    return frame.numeric('speed')[frame.chronological_order()]
+
+
+class DrivingProfile:
+    """
+    Показатели стиля вождения одного автомобиля по всей истории телеметрии
+    """
+    __slots__ = ('records', 'hard_braking_count', 'aggressive_acceleration_count', 'max_speed', 'speed_histogram')
+
+    def __init__(self, records, hard_braking_count, aggressive_acceleration_count, max_speed, speed_histogram):
+        self.records = records
+        self.hard_braking_count = hard_braking_count
+        self.aggressive_acceleration_count = aggressive_acceleration_count
+        self.max_speed = max_speed
+        self.speed_histogram = speed_histogram
+
+    def __repr__(self):
+        return (f"DrivingProfile(records={self.records}, hard_braking={self.hard_braking_count}, "
+                f"aggressive_acceleration={self.aggressive_acceleration_count}, max_speed={self.max_speed})")
+
+
+def driving_profile(telemetry_data):
+    """
+    Показатели стиля вождения одного автомобиля
+
+    Args:
+        telemetry_data (TelemetryFrame или list): Телеметрия
+
+    Returns:
+        DrivingProfile: Показатели вождения
+    """
+    return fleet_driving_profiles([telemetry_data])[0]
+
+
+def fleet_driving_profiles(telemetry_by_vehicle):
+    """
+    Показатели стиля вождения всего автопарка за один векторный проход:
+    скорости всех автомобилей склеиваются в один массив, разности соседних записей
+    считаются один раз, а события и гистограммы суммируются по номеру автомобиля.
+
+    Args:
+        telemetry_by_vehicle (list): Телеметрия каждого автомобиля (TelemetryFrame или списки записей)
+
+    Returns:
+        list: DrivingProfile для каждого автомобиля
+    """
+    count = len(telemetry_by_vehicle)
+    if not count:
+        return []
+
+    series = [speed_series(telemetry_data or []) for telemetry_data in telemetry_by_vehicle]
+    lengths = np.fromiter((len(speeds) for speeds in series), dtype=np.int64, count=count)
+    speeds = np.concatenate(series) if lengths.sum() else np.empty(0)
+    owners = np.repeat(np.arange(count), lengths)
+
+    # Разности считаются только между соседними записями одного автомобиля;
+    # пары с отсутствующей скоростью дают NaN и не считаются событиями
+    deltas = np.diff(speeds)
+    same_vehicle = owners[1:] == owners[:-1]
+    with np.errstate(invalid='ignore'):
+        braking = same_vehicle & (-deltas > HARD_BRAKING_DELTA)
+        acceleration = same_vehicle & (deltas > AGGRESSIVE_ACCELERATION_DELTA)
+    braking_counts = np.bincount(owners[1:][braking], minlength=count)
+    acceleration_counts = np.bincount(owners[1:][acceleration], minlength=count)
+
+    known = ~np.isnan(speeds)
+    known_owners = owners[known]
+    known_speeds = speeds[known]
+    max_speeds = np.full(count, -np.inf)
+    np.maximum.at(max_speeds, known_owners, known_speeds)
+
+    bins = len(SPEED_BINS)
+    # Скорости ниже первой границы относятся к первому интервалу
+    bin_index = np.clip(np.searchsorted(SPEED_BINS, known_speeds, side='right') - 1, 0, bins - 1)
+    histograms = np.bincount(known_owners * bins + bin_index, minlength=count * bins).reshape(count, bins)
+
+    return [
+        DrivingProfile(
+            int(lengths[row]),
+            int(braking_counts[row]),
+            int(acceleration_counts[row]),
+            float(max_speeds[row]) if np.isfinite(max_speeds[row]) else None,
+            histograms[row],
+        )
+        for row in range(count)
+    ]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import sys
+import ast
+import json
+import logging
+from functools import lru_cache
+
+# Set up logging
+logger = logging.getLogger("DtcCodes")
+
+# Семейства кодов ошибок по первой букве
+DTC_FAMILIES = {
+    'P': 'powertrain',
+    'C': 'chassis',
+    'B': 'body',
+    'U': 'network',
+}
+
+_SEPARATORS = re.compile(r'[\s,;]+')
+
+
+class DtcCodes:
+    """
+    Разобранные коды ошибок одной записи телеметрии: коды в исходном порядке
+    и их группировка по семействам (P/C/B/U). Объект не изменяется после создания.
+    """
+    __slots__ = ('codes', '_families')
+
+    def __init__(self, codes):
+        self.codes = tuple(codes)
+        families = {}
+        for code in self.codes:
+            families.setdefault(code[0], []).append(code)
+        self._families = {letter: tuple(group) for letter, group in families.items()}
+
+    def family(self, letter):
+        """
+        Коды одного семейства
+
+        Args:
+            letter (str): Буква семейства ('P', 'C', 'B' или 'U')
+
+        Returns:
+            tuple: Коды семейства
+        """
+        return self._families.get(letter, ())
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def __repr__(self):
+        return f"DtcCodes({list(self.codes)})"
+
+
+NO_CODES = DtcCodes(())
+
+
+def _normalize(items):
+    codes = []
+    for item in items:
+        # Нестроковые коды (например, числа) учитываются как строки
+        code = (item if isinstance(item, str) else str(item)).strip().strip('\'"').upper()
+        if code:
+            codes.append(sys.intern(code))
+    return DtcCodes(codes) if codes else NO_CODES
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text):
+    text = text.strip()
+    if not text or text in ('[]', 'None', 'null'):
+        return NO_CODES
+
+    if text[0] in '[(':
+        # Список в формате JSON или литерала Python (без выполнения кода)
+        try:
+            items = json.loads(text)
+        except ValueError:
+            items = ast.literal_eval(text)
+        if not isinstance(items, (list, tuple)):
+            raise ValueError(f"Unsupported DTC list: {text}")
+        return _normalize(items)
+
+    # Коды через запятую или пробел: "P0100,P0101"
+    return _normalize(_SEPARATORS.split(text))
+
+
+def parse_dtc_codes(value):
+    """
+    Разбирает коды ошибок из строки (список JSON/Python или коды через запятую) или списка
+
+    Args:
+        value: Значение поля dtcCodes
+
+    Returns:
+        DtcCodes: Разобранные коды
+
+    Raises:
+        ValueError: Если строку не удалось разобрать
+    """
+    if value is None:
+        return NO_CODES
+    if isinstance(value, str):
+        try:
+            return _parse_text(value)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError) as e:
+            raise ValueError(f"Invalid DTC codes {value!r}: {str(e)}")
+    if isinstance(value, DtcCodes):
+        return value
+    if isinstance(value, (list, tuple)):
+        return _normalize(value)
+    raise ValueError(f"Unsupported DTC codes type: {type(value).__name__}")
+
+
+def record_dtc_codes(record, field='dtcCodes'):
+    """
+    Коды ошибок записи телеметрии. Запись не изменяется: разобранный результат
+    хранит вызывающий код (VehicleContext), одинаковые строки разбираются один раз.
+
+    Args:
+        record (Mapping): Запись телеметрии
+        field (str): Поле с кодами ошибок
+
+    Returns:
+        DtcCodes: Разобранные коды
+
+    Raises:
+        ValueError: Если коды не удалось разобрать
+    """
+    return parse_dtc_codes(record.get(field))
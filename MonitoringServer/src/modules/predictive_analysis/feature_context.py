@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import datetime
+from types import MappingProxyType
+from telemetry_frame import TelemetryFrame
+from telemetry_index import TelemetryTimeIndex
+from work_history import ServiceHistory
+from dtc_codes import record_dtc_codes
+from rolling_window import TelemetryAggregates
+from driving_behaviour import driving_profile
+
+# Set up logging
+logger = logging.getLogger("FeatureContext")
+
+# Возраст последнего обслуживания по системам: (признак, перевод из дней, значение без истории работ)
+SERVICE_AGE_FEATURES = {
+    'engine': ('days_since_engine_work', lambda days: days, None),
+    'oil': ('days_since_oil_change', lambda days: days, 365),
+    'tires': ('months_since_tire_change', lambda days: days // 30, 48),
+    'brakes': ('months_since_brake_service', lambda days: days // 30, 36),
+    'suspension': ('years_since_suspension_service', lambda days: days / 365, 5),
+    'battery': ('years_since_battery_replacement', lambda days: days / 365, 4),
+}
+
+# Пробег с последнего обслуживания по системам: (признак, название работы для журнала)
+SERVICE_MILEAGE_FEATURES = {
+    'oil': ('miles_since_oil_change', 'oil change'),
+    'tires': ('miles_since_tire_change', 'tire change'),
+    'brakes': ('miles_since_brake_service', 'brake service'),
+    'suspension': ('miles_since_suspension_service', 'suspension service'),
+}
+
+
+class VehicleContext:
+    """
+    Неизменяемый контекст признаков одного автомобиля, который строится один раз за анализ:
+    последняя запись телеметрии, временной индекс, агрегаты скользящих окон, коды ошибок,
+    классифицированная история работ и момент анализа. Все анализаторы систем работают
+    с этим контекстом.
+    """
+    __slots__ = ('vehicle_id', 'telemetry', 'latest', 'now', 'telemetry_index', 'service_history',
+                 'aggregates', '_dtc', '_dtc_error', '_driving', '_features')
+
+    def __init__(self, vehicle_id, telemetry_data, work_history, now=None, rules=None, driving=None):
+        """
+        Args:
+            vehicle_id: ID автомобиля
+            telemetry_data (TelemetryFrame или list): Телеметрия (API возвращает записи от новых к старым)
+            work_history (list): История работ
+            now (datetime, optional): Момент анализа
+            rules (HealthRuleEngine, optional): Таблица правил, по которой определяются нужные агрегаты окон
+            driving (DrivingProfile, optional): Заранее рассчитанные показатели вождения (пакетный расчет)
+        """
+        telemetry_data = TelemetryFrame.coerce(telemetry_data)
+        latest = telemetry_data[-1] if telemetry_data else None
+
+        dtc, dtc_error = None, None
+        if latest is not None:
+            try:
+                dtc = record_dtc_codes(latest)
+            except Exception as e:
+                dtc_error = e
+
+        set_slot = object.__setattr__
+        set_slot(self, 'vehicle_id', vehicle_id)
+        set_slot(self, 'telemetry', telemetry_data)
+        set_slot(self, 'latest', latest)
+        set_slot(self, 'now', now or datetime.now())
+        set_slot(self, 'telemetry_index', TelemetryTimeIndex(telemetry_data))
+        set_slot(self, 'service_history', ServiceHistory(work_history))
+        set_slot(self, 'aggregates', TelemetryAggregates.from_records(
+            telemetry_data,
+            rules.windows if rules is not None else {},
+            rules.aggregate_specs if rules is not None else {},
+        ))
+        set_slot(self, '_dtc', dtc)
+        set_slot(self, '_dtc_error', dtc_error)
+        set_slot(self, '_driving', [driving])
+        set_slot(self, '_features', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def has_telemetry(self):
+        return self.latest is not None
+
+    def dtc_codes(self):
+        """
+        Коды ошибок последней записи (разбираются один раз при построении контекста)
+
+        Returns:
+            DtcCodes: Разобранные коды (ошибка разбора пробрасывается при обращении)
+        """
+        if self._dtc_error is not None:
+            raise self._dtc_error
+        return self._dtc
+
+    def days_since_service(self, system):
+        """
+        Число дней с последней работы по системе
+
+        Returns:
+            int: Количество дней или None, если работ не было
+        """
+        return self.service_history.days_since(system, self.now)
+
+    def mileage_since_service(self, system):
+        """
+        Пробег с последней работы по системе по ближайшей к ней записи телеметрии с одометром
+
+        Returns:
+            Пробег или None, если работ не было или одометр недоступен
+        """
+        record = self.service_history.last_service(system)
+        if record is None:
+            return None
+        mileage_at_service = self.telemetry_index.nearest_odometer(record.parsed_date())
+        if mileage_at_service is None:
+            return None
+        current_mileage = self.latest.get('odometer', mileage_at_service)
+        return current_mileage - mileage_at_service
+
+    def driving_profile(self):
+        """
+        Показатели стиля вождения по всей истории телеметрии (вычисляются один раз)
+
+        Returns:
+            DrivingProfile: Резкие торможения, резкие ускорения, гистограмма скоростей
+        """
+        profile = self._driving[0]
+        if profile is None:
+            profile = driving_profile(self.telemetry)
+            self._driving[0] = profile
+        return profile
+
+    def features(self, system):
+        """
+        Производные признаки системы для таблицы правил (вычисляются один раз)
+
+        Args:
+            system (str): Система автомобиля
+
+        Returns:
+            Mapping: {признак: значение}
+        """
+        cached = self._features.get(system)
+        if cached is None:
+            cached = MappingProxyType(self._build_features(system))
+            self._features[system] = cached
+        return cached
+
+    def rule_features(self, systems):
+        """
+        Производные признаки нескольких систем для оценки за один проход по таблице правил
+
+        Args:
+            systems (iterable): Системы автомобиля
+
+        Returns:
+            Mapping: {признак: значение}
+        """
+        merged = {}
+        for system in systems:
+            merged.update(self.features(system))
+        return MappingProxyType(merged)
+
+    def _build_features(self, system):
+        features = {}
+
+        age = SERVICE_AGE_FEATURES.get(system)
+        if age is not None:
+            name, from_days, default = age
+            days = self.days_since_service(system)
+            value = from_days(days) if days is not None else default
+            if value is not None:
+                features[name] = value
+
+        mileage = SERVICE_MILEAGE_FEATURES.get(system)
+        if mileage is not None:
+            name, label = mileage
+            try:
+                miles = self.mileage_since_service(system)
+                if miles is not None:
+                    features[name] = miles
+            except Exception as e:
+                logger.error(f"Error calculating mileage since last {label}: {str(e)}")
+
+        if system == 'engine':
+            try:
+                features['dtc_codes'] = list(self.dtc_codes())
+            except Exception as e:
+                logger.error(f"Error processing DTC codes: {str(e)}")
+
+        elif system == 'tires':
+            if len(self.telemetry) > 1:
+                try:
+                    features['aggressive_acceleration_count'] = self.driving_profile().aggressive_acceleration_count
+                except Exception as e:
+                    logger.error(f"Error analyzing acceleration patterns: {str(e)}")
+
+        elif system in ('brakes', 'suspension'):
+            # Коды C обычно относятся к шасси, включая тормоза и подвеску
+            try:
+                features['chassis_dtc_codes'] = list(self.dtc_codes().family('C'))
+            except Exception as e:
+                logger.error(f"Error processing DTC codes for {system}: {str(e)}")
+
+            if system == 'brakes' and len(self.telemetry) > 1:
+                try:
+                    features['sudden_braking_count'] = self.driving_profile().hard_braking_count
+                except Exception as e:
+                    logger.error(f"Error analyzing braking patterns: {str(e)}")
+
+        elif system == 'battery':
+            # CCA (ток холодной прокрутки) относительно номинала
+            battery_cca = self.latest.get('batteryCCA')
+            if battery_cca is not None:
+                original_cca = self.latest.get('originalBatteryCCA', 600)
+                features['cca_percentage'] = (battery_cca / original_cca) * 100
+
+        return features
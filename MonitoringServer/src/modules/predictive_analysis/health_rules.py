@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import bisect
+import itertools
+import time
+import logging
+import operator
+import threading
+from array import array
+from dotenv import load_dotenv
+from rolling_window import AGGREGATES
+from issues import Issue
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger("HealthRules")
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'health_rules.json')
+
+_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+
+class FieldSpec:
+    """
+    Описание поля телеметрии: тип, значение по умолчанию и обязательность
+    """
+    __slots__ = ('name', 'type', 'default', 'required', 'per_position')
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.type = spec.get('type', 'number')
+        self.default = spec.get('default')
+        self.required = spec.get('required', False)
+        self.per_position = spec.get('per_position', False)
+        if self.type not in ('number', 'category', 'list'):
+            raise ValueError(f"Unknown type '{self.type}' for field {name}")
+
+
+class CompiledRule:
+    """
+    Правило одной системы, скомпилированное из таблицы.
+    kind: 'ladder' - пороговые полосы, 'category' - категории, 'count' - штраф за каждый элемент списка.
+    Числовое правило может оценивать не последнее значение, а агрегат скользящего окна:
+    "aggregate" (min, max, mean, p95, time_above), "window" (имя окна из раздела windows)
+    и "above" (порог для time_above). source - ключ значения правила (поле или поле с агрегатом).
+    Каждая полоса (и правило подсчета) имеет код проблемы: задается ключом "code"
+    или строится из системы, поля и порога (например, 'engine.engineTemp>110').
+    """
+    __slots__ = ('system', 'field', 'kind', 'bands', 'when', 'per_item', 'max_penalty', 'issue',
+                 'aggregate', 'source', 'code')
+
+    def __init__(self, system, rule):
+        self.system = system
+        self.field = rule['field']
+        self.source = self.field
+        self.aggregate = None
+        self.when = None
+        self.bands = ()
+        self.per_item = self.max_penalty = 0
+        self.issue = None
+        self.code = None
+
+        if 'per_item' in rule:
+            self.kind = 'count'
+            self.per_item = rule['per_item']
+            self.max_penalty = rule['max_penalty']
+            self.issue = rule['issue']
+            self.code = rule.get('code', f"{system}.{self.field}")
+            return
+
+        bands = rule['bands']
+        if bands and all(band.get('op') == 'in' for band in bands):
+            self.kind = 'category'
+            self.bands = tuple(
+                (frozenset(str(value).lower() for value in band['values']), band['penalty'], band['issue'],
+                 band.get('code', f"{system}.{self.field}={str(band['values'][0]).lower()}"))
+                for band in bands
+            )
+        else:
+            self.kind = 'ladder'
+            aggregate = rule.get('aggregate', 'latest')
+            if aggregate != 'latest':
+                if aggregate not in AGGREGATES:
+                    raise ValueError(f"Unknown aggregate '{aggregate}' for field {self.field}")
+                above = rule.get('above') if aggregate == 'time_above' else None
+                if aggregate == 'time_above' and above is None:
+                    raise ValueError(f"Aggregate time_above for field {self.field} requires 'above'")
+                self.aggregate = (aggregate, rule.get('window', 'recent'), above)
+                self.source = ':'.join(str(part) for part in (self.field, aggregate, self.aggregate[1], above)
+                                       if part is not None)
+            self.bands = tuple(
+                (band['op'], _OPERATORS[band['op']], band['threshold'], band['penalty'], band['issue'],
+                 band.get('position_issue', band['issue']),
+                 band.get('code', f"{system}.{self.source}{band['op']}{band['threshold']}"))
+                for band in bands
+            )
+
+        when = rule.get('when')
+        if when:
+            self.when = (when['field'], _OPERATORS[when['op']], when['threshold'])
+
+
+class RecommendationTable:
+    """
+    Предварительно рассчитанная таблица рекомендаций.
+    Рекомендации зависят только от того, в какую полосу попала оценка каждой системы,
+    поэтому для всех сочетаний полос заранее строятся неизменяемые списки (кортежи
+    интернированных строк). Одинаковые списки хранятся один раз и имеют общий номер.
+    """
+    __slots__ = ('name', 'systems', 'lists', '_thresholds', '_texts', '_strides', '_always', '_ids', '_interned', '_lock')
+
+    def __init__(self, name, entries, always):
+        """
+        Args:
+            name (str): Имя таблицы
+            entries (list): Записи таблицы [(система, [(граница или None, текст), ...]), ...]
+            always (list): Рекомендации, добавляемые всегда
+        """
+        self.name = name
+        self.systems = tuple(system for system, _ in entries)
+        self._always = tuple(sys.intern(text) for text in always)
+        self._thresholds = []
+        self._texts = []
+        for system, bands in entries:
+            thresholds = []
+            texts = []
+            for index, (below, text) in enumerate(bands):
+                if below is None:
+                    if index != len(bands) - 1:
+                        raise ValueError(f"Band without 'below' must be the last one for {system} in {name}")
+                elif thresholds and below <= thresholds[-1]:
+                    raise ValueError(f"Bands for {system} in {name} must have ascending 'below' values")
+                else:
+                    thresholds.append(below)
+                texts.append(sys.intern(text))
+            if len(texts) == len(thresholds):
+                # Оценка выше всех границ без полосы по умолчанию не дает рекомендации
+                texts.append(None)
+            self._thresholds.append(tuple(thresholds))
+            self._texts.append(tuple(texts))
+
+        # Номер сочетания полос - число в смешанной системе счисления по системам таблицы
+        radices = [len(texts) for texts in self._texts]
+        strides = []
+        stride = 1
+        for radix in reversed(radices):
+            strides.append(stride)
+            stride *= radix
+        self._strides = tuple(reversed(strides))
+
+        self.lists = []
+        self._interned = {}
+        self._lock = threading.Lock()
+        ids = array('i')
+        for buckets in itertools.product(*(range(radix) for radix in radices)):
+            ids.append(self._intern(tuple(
+                texts[bucket] for texts, bucket in zip(self._texts, buckets) if texts[bucket] is not None
+            ) + self._always))
+        self._ids = np.frombuffer(ids, dtype=np.int32) if np is not None else ids
+
+    def _intern(self, recommendations):
+        list_id = self._interned.get(recommendations)
+        if list_id is None:
+            with self._lock:
+                list_id = self._interned.get(recommendations)
+                if list_id is None:
+                    list_id = len(self.lists)
+                    self.lists.append(recommendations)
+                    self._interned[recommendations] = list_id
+        return list_id
+
+    def list_id(self, ratings):
+        """
+        Номер списка рекомендаций по оценкам систем
+
+        Args:
+            ratings (dict): Оценки систем
+
+        Returns:
+            int: Номер списка в lists
+        """
+        index = 0
+        missing = False
+        for system, thresholds, stride in zip(self.systems, self._thresholds, self._strides):
+            value = ratings.get(system)
+            if value is None:
+                missing = True
+                continue
+            index += bisect.bisect_right(thresholds, value) * stride
+        if not missing:
+            return int(self._ids[index])
+
+        # Системы без оценки пропускаются (редкий случай, список собирается напрямую)
+        recommendations = []
+        for system, thresholds, texts in zip(self.systems, self._thresholds, self._texts):
+            value = ratings.get(system)
+            if value is not None:
+                text = texts[bisect.bisect_right(thresholds, value)]
+                if text is not None:
+                    recommendations.append(text)
+        return self._intern(tuple(recommendations) + self._always)
+
+    def lookup(self, ratings):
+        """
+        Рекомендации по оценкам систем
+
+        Args:
+            ratings (dict): Оценки систем
+
+        Returns:
+            tuple: Общий неизменяемый список рекомендаций
+        """
+        return self.lists[self.list_id(ratings)]
+
+    def list_ids(self, columns):
+        """
+        Номера списков рекомендаций для пачки оценок
+
+        Args:
+            columns (dict): Колонки оценок {система: массив} (для всех систем таблицы)
+
+        Returns:
+            np.ndarray: Номер списка в lists для каждой строки
+        """
+        index = None
+        for system, thresholds, stride in zip(self.systems, self._thresholds, self._strides):
+            buckets = np.searchsorted(thresholds, np.asarray(columns[system], dtype=float), side='right') * stride
+            index = buckets if index is None else index + buckets
+        if index is None:
+            return np.zeros(0, dtype=np.int32)
+        return np.asarray(self._ids)[index]
+
+
+class HealthRuleEngine:
+    """
+    Движок правил оценки состояния систем автомобиля.
+    Таблица правил (поле, полосы порогов, штраф, шаблон проблемы) загружается из JSON,
+    компилируется один раз и перечитывается при изменении файла без перезапуска сервиса.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): Путь к таблице правил (по умолчанию HEALTH_RULES_PATH или health_rules.json)
+        """
+        self.path = path or os.getenv('HEALTH_RULES_PATH') or DEFAULT_RULES_PATH
+        self.reload_interval = float(os.getenv('HEALTH_RULES_RELOAD_INTERVAL', 30))
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0.0
+        self._compiled = self._compile(self._read())
+        self._mtime = self._file_mtime()
+        self._next_check = time.monotonic() + self.reload_interval
+
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _read(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _compile(table):
+        """
+        Компилирует таблицу правил
+
+        Returns:
+            dict: Поля, окна агрегатов, правила по системам, оценки без данных и таблицы рекомендаций
+        """
+        fields = {name: FieldSpec(name, spec) for name, spec in table.get('fields', {}).items()}
+        windows = table.get('windows', {})
+        systems = {}
+        no_data_scores = {}
+        aggregate_specs = {}
+        for system, section in table['systems'].items():
+            compiled = [CompiledRule(system, rule) for rule in section.get('rules', [])]
+            systems[system] = compiled
+            no_data_scores[system] = section.get('no_data_score', 85)
+            for rule in compiled:
+                if rule.aggregate is None:
+                    continue
+                aggregate, window, above = rule.aggregate
+                if window not in windows:
+                    raise ValueError(f"Unknown window '{window}' for field {rule.field}")
+                aggregate_specs.setdefault((rule.field, window), set()).add((aggregate, above))
+
+        recommendations = {}
+        for name in ('recommendations', 'emulator_recommendations'):
+            section = table.get(name, {})
+            recommendations[name] = RecommendationTable(
+                name,
+                [(entry['system'], [(band.get('below'), band['text']) for band in entry['bands']])
+                 for entry in section.get('systems', [])],
+                section.get('always', [])
+            )
+
+        return {
+            'fields': fields,
+            'windows': windows,
+            'aggregate_specs': aggregate_specs,
+            'systems': systems,
+            'no_data_scores': no_data_scores,
+            'recommendations': recommendations,
+        }
+
+    def reload_if_changed(self):
+        """
+        Перечитывает таблицу правил, если файл изменился (проверка не чаще HEALTH_RULES_RELOAD_INTERVAL).
+        При ошибке в новой таблице продолжают действовать прежние правила.
+
+        Returns:
+            bool: True, если правила были перезагружены
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        with self._lock:
+            if now < self._next_check:
+                return False
+            self._next_check = now + self.reload_interval
+            mtime = self._file_mtime()
+            if mtime is None or mtime == self._mtime:
+                return False
+            try:
+                compiled = self._compile(self._read())
+            except Exception as e:
+                logger.error(f"Error reloading health rules from {self.path}: {str(e)}")
+                return False
+            self._compiled = compiled
+            self._mtime = mtime
+        logger.info(f"Health rules reloaded from {self.path}")
+        return True
+
+    @property
+    def fields(self):
+        return self._compiled['fields']
+
+    @property
+    def windows(self):
+        return self._compiled['windows']
+
+    @property
+    def aggregate_specs(self):
+        """
+        Окна, которые нужны правилам: {(поле, окно): множество пар (агрегат, порог time_above или None)}
+        """
+        return self._compiled['aggregate_specs']
+
+    def aggregate_rules(self):
+        """
+        Правила, оценивающие агрегаты окон (ключ значения и описание агрегата)
+
+        Returns:
+            dict: {source: (поле, агрегат, окно, порог)}
+        """
+        sources = {}
+        for rules in self._compiled['systems'].values():
+            for rule in rules:
+                if rule.aggregate is not None:
+                    sources[rule.source] = (rule.field,) + rule.aggregate
+        return sources
+
+    @property
+    def systems(self):
+        return tuple(self._compiled['systems'])
+
+    def no_data_score(self, system):
+        """
+        Оценка системы при отсутствии телеметрии
+        """
+        return self._compiled['no_data_scores'].get(system, 85)
+
+    def rule_fields(self):
+        """
+        Имена всех полей, на которые ссылаются правила (включая условия when)
+        """
+        names = set()
+        for rules in self._compiled['systems'].values():
+            for rule in rules:
+                names.add(rule.field)
+                if rule.when:
+                    names.add(rule.when[0])
+        return names
+
+    @staticmethod
+    def _value(fields, name, record, features):
+        if features and name in features:
+            return features[name]
+        spec = fields.get(name)
+        if spec is None:
+            return record.get(name)
+        value = record.get(name, spec.default)
+        if value is None and spec.required:
+            raise TypeError(f"Field {name} is required")
+        return value
+
+    @staticmethod
+    def _ladder(rule, value, position=None):
+        for _, compare, threshold, penalty, issue, position_issue, code in rule.bands:
+            if compare(value, threshold):
+                template = issue if position is None else position_issue
+                return penalty, Issue(code, rule.system, rule.source, value, threshold, position, template)
+        return 0, None
+
+    def _apply(self, fields, rule, value, record, features):
+        """
+        Применяет правило к значению поля
+
+        Returns:
+            tuple: (штраф, список проблем Issue)
+        """
+        if value is None:
+            return 0, []
+
+        if rule.kind == 'count':
+            if not value:
+                return 0, []
+            penalty = min(rule.max_penalty, len(value) * rule.per_item)
+            return penalty, [Issue(rule.code, rule.system, rule.source, tuple(value), template=rule.issue)]
+
+        if rule.kind == 'category':
+            if not isinstance(value, str):
+                raise TypeError(f"Field {rule.field} must be a string")
+            lowered = value.lower()
+            for values, penalty, issue, code in rule.bands:
+                if lowered in values:
+                    return penalty, [Issue(code, rule.system, rule.source, value, template=issue)]
+            return 0, []
+
+        if rule.when is not None:
+            when_field, compare, threshold = rule.when
+            when_value = self._value(fields, when_field, record, features)
+            if when_value is None or not compare(when_value, threshold):
+                return 0, []
+
+        spec = fields.get(rule.field)
+        if spec is not None and spec.per_position:
+            # Значение по позициям (например, по колесам) или одно общее значение
+            if isinstance(value, dict):
+                total, issues = 0, []
+                for position, position_value in value.items():
+                    penalty, issue = self._ladder(rule, position_value, position)
+                    if issue:
+                        total += penalty
+                        issues.append(issue)
+                return total, issues
+            if not isinstance(value, (int, float)):
+                return 0, []
+
+        penalty, issue = self._ladder(rule, value)
+        return penalty, [issue] if issue else []
+
+    def evaluate(self, record, features=None, systems=None, aggregates=None):
+        """
+        Оценивает запись телеметрии за один проход по полям таблицы
+
+        Args:
+            record (dict): Запись телеметрии
+            features (dict, optional): Производные признаки (сроки и пробег с обслуживания, коды ошибок и т.д.)
+            systems (iterable, optional): Оцениваемые системы (по умолчанию все)
+            aggregates (TelemetryAggregates, optional): Агрегаты скользящих окон телеметрии
+
+        Returns:
+            dict: {система: (сумма штрафов, список проблем Issue)}
+        """
+        compiled = self._compiled
+        selected = tuple(systems) if systems is not None else tuple(compiled['systems'])
+        values = {}
+        results = {}
+
+        for system in selected:
+            penalty, issues = 0, []
+            for rule in compiled['systems'][system]:
+                # Значение каждого поля (или агрегата) читается и проверяется один раз для всех систем
+                if rule.source not in values:
+                    if rule.aggregate is not None:
+                        aggregate, window, above = rule.aggregate
+                        values[rule.source] = aggregates.value(rule.field, aggregate, window, above) if aggregates else None
+                    else:
+                        values[rule.source] = self._value(compiled['fields'], rule.field, record, features)
+                rule_penalty, found = self._apply(compiled['fields'], rule, values[rule.source], record, features)
+                penalty += rule_penalty
+                issues.extend(found)
+            results[system] = (penalty, issues)
+        return results
+
+    def scores(self, record, features=None, aggregates=None):
+        """
+        Оценки всех систем по записи телеметрии за один проход по полям таблицы
+
+        Returns:
+            dict: {система: (оценка 0-100, список проблем Issue)}
+        """
+        return {
+            system: (max(0, min(100, 100 - penalty)), issues)
+            for system, (penalty, issues) in self.evaluate(record, features, aggregates=aggregates).items()
+        }
+
+    def evaluate_columns(self, columns, size, matches=None):
+        """
+        Векторная оценка пачки записей: по одному массиву NumPy на поле.
+        Числовые поля - float с NaN для отсутствующих значений, категории - строки
+        в нижнем регистре (object), списки - количество элементов. Агрегаты окон
+        передаются под ключом source правила (см. aggregate_rules).
+
+        Args:
+            columns (dict): {поле: массив}
+            size (int): Число записей
+            matches (list, optional): Если передан, в него добавляются пары
+                (правило, массив номеров сработавших полос, -1 - не сработало) для column_issues
+
+        Returns:
+            dict: {система: массив сумм штрафов}
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for batch rule evaluation")
+
+        compiled = self._compiled
+        missing = np.full(size, np.nan)
+        penalties = {system: np.zeros(size) for system in compiled['systems']}
+
+        for system, rules in compiled['systems'].items():
+            for rule in rules:
+                column = columns.get(rule.source, missing)
+                if rule.kind == 'count':
+                    counts = np.nan_to_num(column)
+                    matched = np.where(counts > 0, 0, -1)
+                    penalty = np.where(counts > 0, np.minimum(rule.max_penalty, counts * rule.per_item), 0)
+                elif rule.kind == 'category':
+                    if column is missing:
+                        continue
+                    # Первая подходящая полоса имеет приоритет
+                    lookup = {}
+                    for index in range(len(rule.bands) - 1, -1, -1):
+                        lookup.update(dict.fromkeys(rule.bands[index][0], index))
+                    matched = np.fromiter((lookup.get(value, -1) for value in column), dtype=np.int64, count=size)
+                    band_penalties = np.array([band[1] for band in rule.bands] + [0], dtype=float)
+                    penalty = band_penalties[matched]
+                else:
+                    matched = np.select(
+                        [compare(column, threshold) for _, compare, threshold, _, _, _, _ in rule.bands],
+                        list(range(len(rule.bands))),
+                        default=-1
+                    )
+                    if rule.when is not None:
+                        when_field, compare, threshold = rule.when
+                        matched = np.where(compare(columns.get(when_field, missing), threshold), matched, -1)
+                    band_penalties = np.array([band[3] for band in rule.bands] + [0], dtype=float)
+                    penalty = band_penalties[matched]
+                penalties[system] += penalty
+                if matches is not None:
+                    matches.append((rule, matched))
+
+        return penalties
+
+    def column_issues(self, matches, row_values, rows):
+        """
+        Проблемы для строк пачки по результатам evaluate_columns.
+        Объекты Issue создаются только для сработавших правил.
+
+        Args:
+            matches (list): Пары (правило, номера сработавших полос) из evaluate_columns
+            row_values (list): Исходные значения полей и признаков каждой строки (dict или None)
+            rows (np.ndarray): Маска строк, для которых нужны проблемы
+
+        Returns:
+            dict: {номер строки: список проблем Issue в порядке систем и правил}
+        """
+        issues = {}
+        for rule, matched in matches:
+            for row in np.flatnonzero((matched >= 0) & rows):
+                value = row_values[row].get(rule.source)
+                if rule.kind == 'count':
+                    issue = Issue(rule.code, rule.system, rule.source, tuple(value), template=rule.issue)
+                elif rule.kind == 'category':
+                    band = rule.bands[matched[row]]
+                    issue = Issue(band[3], rule.system, rule.source, value, template=band[2])
+                else:
+                    band = rule.bands[matched[row]]
+                    issue = Issue(band[6], rule.system, rule.source, value, band[2], template=band[4])
+                issues.setdefault(int(row), []).append(issue)
+        return issues
+
+    def recommend(self, ratings, table='recommendations'):
+        """
+        Формирует рекомендации по оценкам систем
+
+        Args:
+            ratings (dict): Оценки систем (может содержать 'overall')
+            table (str): Таблица рекомендаций ('recommendations' или 'emulator_recommendations')
+
+        Returns:
+            tuple: Общий неизменяемый список рекомендаций из предварительно рассчитанной таблицы
+        """
+        return self._compiled['recommendations'][table].lookup(ratings)
+
+    def recommendation_table(self, table='recommendations'):
+        """
+        Предварительно рассчитанная таблица рекомендаций (для пакетного расчета номеров списков)
+
+        Returns:
+            RecommendationTable: Таблица рекомендаций
+        """
+        return self._compiled['recommendations'][table]
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_rule_engine():
+    """
+    Общий экземпляр движка правил процесса
+
+    Returns:
+        HealthRuleEngine: Движок правил
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = HealthRuleEngine()
+    return _engine
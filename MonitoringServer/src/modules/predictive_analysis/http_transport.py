@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import random
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger("HttpTransport")
+
+# Коды ответа, после которых запрос повторяется
+RETRY_STATUS_CODES = frozenset((500, 502, 503, 504))
+# Методы, которые безопасно повторять после отправки запроса
+IDEMPOTENT_METHODS = frozenset(('GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'))
+
+
+class PooledTransport:
+    """
+    HTTP-транспорт с пулом постоянных соединений (keep-alive), таймаутами
+    и повторами с экспоненциальной задержкой со случайным разбросом (full jitter).
+    Один экземпляр безопасно используется из нескольких потоков; после fork
+    в рабочем процессе создается собственная сессия.
+    """
+
+    def __init__(self, pool_size=None, connect_timeout=None, read_timeout=None,
+                 max_retries=None, backoff_base=None, backoff_max=None):
+        """
+        Args:
+            pool_size (int, optional): Максимум постоянных соединений с сервером
+            connect_timeout (float, optional): Таймаут установки соединения в секундах
+            read_timeout (float, optional): Таймаут ожидания ответа в секундах
+            max_retries (int, optional): Количество повторов после первой попытки
+            backoff_base (float, optional): Базовая задержка перед повтором в секундах
+            backoff_max (float, optional): Максимальная задержка перед повтором в секундах
+        """
+        self.pool_size = pool_size or int(os.getenv('API_POOL_SIZE', 32))
+        self.timeout = (
+            connect_timeout or float(os.getenv('API_CONNECT_TIMEOUT', 3.05)),
+            read_timeout or float(os.getenv('API_READ_TIMEOUT', 30)),
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('API_MAX_RETRIES', 3))
+        self.backoff_base = backoff_base or float(os.getenv('API_BACKOFF_BASE', 0.5))
+        self.backoff_max = backoff_max or float(os.getenv('API_BACKOFF_MAX', 10))
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_session(self):
+        # Соединения пула нельзя разделять между процессами, поэтому после fork сессия создается заново
+        pid = os.getpid()
+        if self._session is None or self._pid != pid:
+            with self._lock:
+                if self._session is None or self._pid != pid:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+                    self._pid = pid
+        return self._session
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _can_retry(self, attempt, delay, deadline):
+        # Повтор, который не успевает до крайнего срока, не выполняется
+        return attempt < self.max_retries and (deadline is None or time.monotonic() + delay < deadline)
+
+    def request(self, method, url, headers=None, params=None, json=None, deadline=None):
+        """
+        Выполняет запрос с повторами: ошибки соединения повторяются для всех методов,
+        ответы 5xx и таймауты чтения - только для идемпотентных методов.
+        Если задан deadline, таймауты попыток сокращаются до оставшегося времени,
+        а повтор, который не успевает до deadline, не выполняется.
+
+        Args:
+            method (str): HTTP метод
+            url (str): Полный URL
+            headers (dict, optional): Заголовки
+            params (dict, optional): URL-параметры
+            json (optional): Тело запроса в JSON
+            deadline (float, optional): Крайний срок запроса с повторами (по часам time.monotonic())
+
+        Returns:
+            requests.Response: Ответ сервера (последний, если повторы исчерпаны)
+
+        Raises:
+            requests.RequestException: Если все попытки завершились ошибкой или истек срок
+        """
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            timeout = self.timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise requests.exceptions.Timeout(f"Latency budget exceeded for {method} {url}")
+                timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+            delay = self._backoff(attempt)
+            try:
+                response = self._get_session().request(method, url, headers=headers, params=params,
+                                                       json=json, timeout=timeout)
+            except requests.exceptions.ConnectionError as e:
+                # Отказ или таймаут соединения, разорванное соединение пула
+                if not self._can_retry(attempt, delay, deadline):
+                    raise
+                error = str(e)
+            except requests.exceptions.Timeout as e:
+                if not idempotent or not self._can_retry(attempt, delay, deadline):
+                    raise
+                error = str(e)
+            else:
+                if (response.status_code not in RETRY_STATUS_CODES or not idempotent
+                        or not self._can_retry(attempt, delay, deadline)):
+                    return response
+                error = f"HTTP {response.status_code}"
+                response.close()
+
+            attempt += 1
+            logger.warning(f"{method} {url} failed ({error}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+    def close(self):
+        """
+        Закрывает соединения пула
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class Issue:
+    """
+    Структурированная проблема, найденная правилом таблицы: код, система, поле,
+    измеренное значение и порог. Текст для человека формируется только по запросу (message).
+    """
+    __slots__ = ('code', 'system', 'field', 'value', 'threshold', 'position', '_template')
+
+    def __init__(self, code, system, field, value, threshold=None, position=None, template=None):
+        """
+        Args:
+            code (str): Код проблемы (например, 'engine.engineTemp>110')
+            system (str): Система автомобиля
+            field (str): Поле или признак, по которому сработало правило
+            value: Измеренное значение (для списков - кортеж элементов)
+            threshold (optional): Порог сработавшей полосы
+            position (str, optional): Позиция (например, колесо) для значений по позициям
+            template (str, optional): Шаблон текста проблемы
+        """
+        self.code = code
+        self.system = system
+        self.field = field
+        self.value = tuple(value) if isinstance(value, list) else value
+        self.threshold = threshold
+        self.position = position
+        self._template = template
+
+    @property
+    def message(self):
+        """
+        Локализованный текст проблемы
+        """
+        if self._template is None:
+            return self.code
+        value = self.value
+        if isinstance(value, tuple):
+            return self._template.format(value=list(value), position=self.position, count=len(value),
+                                         joined=', '.join(str(item) for item in value))
+        return self._template.format(value=value, position=self.position)
+
+    def to_dict(self):
+        """
+        Представление проблемы для JSON
+
+        Returns:
+            dict: Код, система, поле, значение, порог, позиция и текст
+        """
+        data = {
+            'code': self.code,
+            'system': self.system,
+            'field': self.field,
+            'value': list(self.value) if isinstance(self.value, tuple) else self.value,
+            'threshold': self.threshold,
+            'message': self.message,
+        }
+        if self.position is not None:
+            data['position'] = self.position
+        return data
+
+    def _key(self):
+        return (self.code, self.system, self.field, self.value, self.threshold, self.position)
+
+    def __eq__(self, other):
+        if not isinstance(other, Issue):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"Issue({self.code!r}, value={self.value!r})"
+
+
+def format_issues(issues):
+    """
+    Тексты проблем через запятую (для журнала)
+
+    Args:
+        issues (iterable): Проблемы
+
+    Returns:
+        str: Строка с текстами проблем
+    """
+    return ', '.join(issue.message for issue in issues)
+
+
+def issues_to_json(issues):
+    """
+    Проблемы в виде списка словарей для JSON
+
+    Args:
+        issues (iterable): Проблемы
+
+    Returns:
+        list: Список словарей
+    """
+    return [issue.to_dict() for issue in issues]
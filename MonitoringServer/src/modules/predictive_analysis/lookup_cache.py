@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+# Set up logging
+logger = logging.getLogger("LookupCache")
+
+# Маркер отсутствующего значения (None - допустимое значение для отрицательного кеширования)
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Потокобезопасный кеш с ограниченным временем жизни записей (TTL) и вытеснением
+    давно не использованных записей при превышении размера (LRU).
+    Отсутствие объекта (None) кешируется с отдельным, обычно более коротким TTL.
+    """
+
+    def __init__(self, max_size, ttl, negative_ttl=None):
+        """
+        Args:
+            max_size (int): Максимальное количество записей
+            ttl (float): Время жизни записи в секундах
+            negative_ttl (float, optional): Время жизни записи об отсутствии объекта (по умолчанию ttl)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Значение из кеша
+
+        Returns:
+            Значение (в том числе None для отрицательной записи) или MISSING
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # Устаревшая запись остается до вытеснения: get_stale отдает ее, пока источник недоступен
+            self.misses += 1
+            return MISSING
+
+    def get_stale(self, key):
+        """
+        Значение из кеша без учета TTL (для ответа при недоступном источнике данных)
+
+        Returns:
+            Значение (в том числе None для отрицательной записи) или MISSING
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return MISSING if entry is None else entry[0]
+
+    def put(self, key, value):
+        """
+        Сохраняет значение (None - отрицательная запись с negative_ttl)
+        """
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """
+        Удаляет запись по ключу или весь кеш, если ключ не указан
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """
+        Счетчики кеша
+
+        Returns:
+            dict: Размер, попадания, промахи, доля попаданий и вытеснения
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+            }
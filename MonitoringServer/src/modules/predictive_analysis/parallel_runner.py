@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger("ParallelRunner")
+
+# Анализатор рабочего процесса (создается один раз при запуске процесса)
+_worker_analyzer = None
+
+
+def _init_worker():
+    """
+    Инициализирует анализатор в рабочем процессе
+    """
+    global _worker_analyzer
+    from predictive_analyzer import PredictiveAnalyzer
+    _worker_analyzer = PredictiveAnalyzer()
+    # Результаты сохраняет основной процесс: там хранятся отпечатки сохраненных результатов
+    _worker_analyzer.save_results = False
+
+
+def _analyze_chunk(vehicles, prefetched):
+    """
+    Анализирует пачку автомобилей в рабочем процессе
+
+    Args:
+        vehicles (list): Список автомобилей
+        prefetched (dict): Уже загруженные данные: ID -> (телеметрия, история работ)
+
+    Returns:
+        list: Список кортежей (результат анализа или None, текст ошибки или None, отметка данных или None)
+    """
+    # Изменения таблицы правил подхватываются и в рабочих процессах
+    _worker_analyzer.rules.reload_if_changed()
+    outcomes = []
+    for vehicle in vehicles:
+        try:
+            result = _worker_analyzer._analyze_vehicle(vehicle, *prefetched.get(vehicle.get('id'), (None, None)))
+            watermark = _worker_analyzer.watermarks.get(vehicle.get('id')) if result else None
+            outcomes.append((result, None if result else 'analysis failed', watermark))
+        except Exception as e:
+            outcomes.append((None, str(e), None))
+    return outcomes
+
+
+class ParallelAnalysisRunner:
+    """
+    Параллельный анализ автопарка на пуле процессов.
+    Пул создается при первом запуске и используется повторно; рабочие процессы
+    запускаются методом spawn (или forkserver), а не fork: основной процесс многопоточный.
+    Количество процессов, размер пачки, таймаут на автомобиль и метод запуска задаются в .env.
+    """
+
+    def __init__(self):
+        """
+        Читает настройки пула из переменных окружения
+        """
+        self.workers = int(os.getenv('ANALYSIS_WORKERS', 0)) or os.cpu_count() or 1
+        self.chunk_size = max(1, int(os.getenv('ANALYSIS_CHUNK_SIZE', 10)))
+        self.vehicle_timeout = float(os.getenv('ANALYSIS_VEHICLE_TIMEOUT', 60))
+        self.start_method = os.getenv('ANALYSIS_START_METHOD', 'spawn').lower()
+        self.failures = []
+        self._executor = None
+        logger.info(f"Parallel runner configured: {self.workers} workers, chunk size {self.chunk_size}, "
+                    f"timeout {self.vehicle_timeout}s per vehicle, start method {self.start_method}")
+
+    def _get_executor(self):
+        """
+        Пул процессов (создается при первом обращении или после принудительной остановки)
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def _terminate(self):
+        """
+        Принудительно останавливает пул вместе с зависшими рабочими процессами;
+        при следующем запуске создается новый пул
+        """
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(5)
+        logger.warning(f"Process pool terminated ({len(processes)} workers)")
+
+    def _chunk_deadlines(self, chunks, submitted):
+        """
+        Сроки готовности пачек, отсчитываемые от отправки в пул. Пачки выполняются волнами
+        по workers штук, поэтому срок пачки включает бюджет пачек, выполняемых перед ней
+        тем же процессом (vehicle_timeout на каждый автомобиль).
+
+        Args:
+            chunks (list): Пачки автомобилей в порядке отправки
+            submitted (float): Время отправки (time.monotonic())
+
+        Returns:
+            list: Сроки готовности пачек (time.monotonic())
+        """
+        deadlines = []
+        for index, chunk in enumerate(chunks):
+            previous = deadlines[index - self.workers] if index >= self.workers else submitted
+            deadlines.append(previous + self.vehicle_timeout * len(chunk))
+        return deadlines
+
+    def run(self, vehicles, watermarks=None, prefetched=None):
+        """
+        Анализирует автомобили в пуле процессов, собирая результаты в исходном порядке.
+        Результаты не сохраняются в рабочих процессах - их сохраняет вызывающий код.
+
+        Args:
+            vehicles (list): Список автомобилей
+            watermarks (WatermarkStore, optional): Хранилище отметок, куда переносятся отметки рабочих процессов
+            prefetched (dict, optional): Уже загруженные данные: ID -> (телеметрия, история работ)
+
+        Returns:
+            list: Список успешных результатов анализа (в порядке списка автомобилей)
+        """
+        self.failures = []
+        if not vehicles:
+            return []
+
+        chunks = [vehicles[i:i + self.chunk_size] for i in range(0, len(vehicles), self.chunk_size)]
+        results = []
+        # Пул с зависшими или аварийно завершившимися процессами останавливается после сбора результатов
+        broken = False
+
+        # Рабочим процессам передаются только данные автомобилей их пачки
+        prefetched = prefetched or {}
+        chunk_data = [{vehicle.get('id'): prefetched[vehicle.get('id')] for vehicle in chunk
+                       if vehicle.get('id') in prefetched} for chunk in chunks]
+
+        def submit_all():
+            executor = self._get_executor()
+            return [executor.submit(_analyze_chunk, chunk, data) for chunk, data in zip(chunks, chunk_data)]
+
+        try:
+            futures = submit_all()
+        except BrokenProcessPool:
+            # Рабочий процесс мог аварийно завершиться между запусками: пул создается заново
+            self._terminate()
+            futures = submit_all()
+        deadlines = self._chunk_deadlines(chunks, time.monotonic())
+
+        for chunk, future, deadline in zip(chunks, futures, deadlines):
+            try:
+                outcomes = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                broken = True
+                outcomes = [(None, 'timeout', None)] * len(chunk)
+            except BrokenProcessPool as e:
+                broken = True
+                outcomes = [(None, str(e), None)] * len(chunk)
+            except Exception as e:
+                outcomes = [(None, str(e), None)] * len(chunk)
+
+            for vehicle, (result, error, watermark) in zip(chunk, outcomes):
+                if result:
+                    results.append(result)
+                    if watermarks is not None and watermark is not None:
+                        watermarks.put(vehicle.get('id'), watermark)
+                    logger.info(f"Analysis completed for vehicle {vehicle.get('id')}")
+                else:
+                    self.failures.append((vehicle.get('id'), error))
+                    logger.warning(f"Analysis failed for vehicle {vehicle.get('id')}: {error}")
+
+        if broken:
+            self._terminate()
+
+        logger.info(f"Parallel analysis finished: {len(results)} succeeded, {len(self.failures)} failed")
+        return results
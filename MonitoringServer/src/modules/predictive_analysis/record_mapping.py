@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+from functools import lru_cache
+
+# Set up logging
+logger = logging.getLogger("RecordMapping")
+
+
+@lru_cache(maxsize=4096)
+def snake_case(key):
+    """
+    Ключ camelCase в snake_case (результат запоминается для каждого ключа)
+
+    Args:
+        key (str): Ключ в camelCase
+
+    Returns:
+        str: Ключ в snake_case
+    """
+    return ''.join(['_' + c.lower() if c.isupper() else c for c in key]).lstrip('_')
+
+
+@lru_cache(maxsize=4096)
+def camel_case(key):
+    """
+    Ключ snake_case в camelCase (результат запоминается для каждого ключа)
+
+    Args:
+        key (str): Ключ в snake_case
+
+    Returns:
+        str: Ключ в camelCase
+    """
+    components = key.split('_')
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+
+def camel_case_dict(data):
+    """
+    Словарь с ключами snake_case в словарь с ключами camelCase для API
+
+    Args:
+        data (dict): Исходный словарь
+
+    Returns:
+        dict: Словарь с ключами camelCase
+    """
+    return {camel_case(key): value for key, value in data.items()}
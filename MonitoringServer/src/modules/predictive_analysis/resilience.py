@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import time
+import logging
+import threading
+from collections import deque
+
+# Set up logging
+logger = logging.getLogger("Resilience")
+
+# Сегменты пути с ID (числа, UUID и шестнадцатеричные ключи от 8 символов) не различают
+# конечные точки: 'vehicles/15' и 'vehicles/3f2a9c1e-...' -> 'vehicles/{id}'
+_ID_SEGMENT = re.compile(
+    r'(?:(?<=/)|^)'
+    r'(?:\d+'
+    r'|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    r'|[0-9a-fA-F]{8,})'
+    r'(?=/|$)'
+)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def endpoint_key(method, endpoint):
+    """
+    Ключ конечной точки API для автомата защиты и статистики задержек
+
+    Args:
+        method (str): HTTP метод
+        endpoint (str): Путь запроса (без base_url)
+
+    Returns:
+        str: Например, 'GET vehicles/{id}'
+    """
+    return f"{method.upper()} {_ID_SEGMENT.sub('{id}', endpoint)}"
+
+
+class CircuitBreaker:
+    """
+    Автомат защиты конечной точки: после failure_threshold ошибок подряд запросы
+    не выполняются (open) в течение recovery_timeout секунд, затем пропускается
+    пробный запрос (half_open); его успех замыкает автомат, ошибка - снова размыкает.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0):
+        """
+        Args:
+            failure_threshold (int): Количество ошибок подряд до размыкания
+            recovery_timeout (float): Время в разомкнутом состоянии в секундах
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Можно ли выполнить запрос
+
+        Returns:
+            bool: False, если автомат разомкнут (запрос нужно сразу завершить ошибкой)
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(f"Circuit opened after {self.failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class LatencyTracker:
+    """
+    Задержки последних успешных запросов конечной точки (скользящее окно)
+    """
+
+    def __init__(self, window=200, min_samples=20):
+        """
+        Args:
+            window (int): Размер окна
+            min_samples (int): Минимум замеров для оценки перцентиля
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._sorted = None
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        with self._lock:
+            self._samples.append(latency)
+            self._sorted = None
+
+    def percentile(self, q):
+        """
+        Перцентиль задержки
+
+        Args:
+            q (float): Перцентиль (0-100)
+
+        Returns:
+            float: Задержка в секундах или None, если замеров недостаточно
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            if self._sorted is None:
+                self._sorted = sorted(self._samples)
+            samples = self._sorted
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+
+class EndpointHealth:
+    """
+    Автоматы защиты и статистика задержек по конечным точкам API
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, window=200, min_samples=20):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.window = window
+        self.min_samples = min_samples
+        self._breakers = {}
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, key):
+        """
+        Автомат защиты конечной точки (создается при первом обращении)
+        """
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    key, CircuitBreaker(self.failure_threshold, self.recovery_timeout))
+        return breaker
+
+    def latency(self, key):
+        """
+        Статистика задержек конечной точки (создается при первом обращении)
+        """
+        tracker = self._latencies.get(key)
+        if tracker is None:
+            with self._lock:
+                tracker = self._latencies.setdefault(key, LatencyTracker(self.window, self.min_samples))
+        return tracker
+
+    def stats(self):
+        """
+        Состояние конечных точек
+
+        Returns:
+            dict: {ключ: состояние автомата, ошибки подряд, отклоненные запросы, p50/p95 в секундах}
+        """
+        stats = {}
+        for key in sorted(set(self._breakers) | set(self._latencies)):
+            breaker = self.breaker(key)
+            tracker = self.latency(key)
+            p50, p95 = tracker.percentile(50), tracker.percentile(95)
+            stats[key] = {
+                'state': breaker.state,
+                'failures': breaker.failures,
+                'rejected': breaker.rejected,
+                'p50': round(p50, 4) if p50 is not None else None,
+                'p95': round(p95, 4) if p95 is not None else None,
+            }
+        return stats
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import bisect
+import logging
+from collections import deque
+from telemetry_frame import TelemetryFrame
+
+# Set up logging
+logger = logging.getLogger("RollingWindow")
+
+# Поддерживаемые агрегаты окна
+AGGREGATES = ('min', 'max', 'mean', 'p95', 'time_above')
+
+
+class RollingWindow:
+    """
+    Скользящее окно значений одного датчика: сумма для среднего, монотонные очереди
+    для минимума и максимума и счетчики превышения порогов обновляются за O(1)
+    (амортизированно). Для перцентилей (percentiles=True) поддерживается отсортированный
+    список: позиция ищется bisect за O(log n), но вставка и удаление сдвигают элементы
+    за O(n) - для окон телеметрии (десятки записей) это быстрее сбалансированных деревьев.
+    Без отслеживания перцентиль вычисляется сортировкой окна при обращении.
+    Окно ограничивается числом записей (size) и/или возрастом записей в секундах (max_age).
+    """
+    __slots__ = ('size', 'max_age', '_samples', '_sorted', '_sum', '_min', '_max', '_above', '_seq')
+
+    def __init__(self, size=None, max_age=None, thresholds=(), percentiles=True):
+        """
+        Args:
+            size (int, optional): Максимальное число записей в окне
+            max_age (float, optional): Максимальный возраст записей в секундах (нужны метки времени)
+            thresholds (iterable): Пороги, для которых считается время превышения
+            percentiles (bool): Поддерживать отсортированный список для перцентилей
+        """
+        self.size = size
+        self.max_age = max_age
+        self._samples = deque()
+        self._sorted = [] if percentiles else None
+        self._sum = 0.0
+        self._min = deque()
+        self._max = deque()
+        self._above = {}
+        self._seq = 0
+        for threshold in thresholds:
+            self.track(threshold)
+
+    def track(self, threshold):
+        """
+        Начинает учет превышения порога (для уже накопленных значений пересчитывается один раз)
+        """
+        if threshold in self._above:
+            return
+        seconds, count = 0.0, 0
+        samples = list(self._samples)
+        for index, (_, time, value) in enumerate(samples):
+            if value > threshold:
+                count += 1
+                if index + 1 < len(samples) and time is not None and samples[index + 1][1] is not None:
+                    seconds += samples[index + 1][1] - time
+        self._above[threshold] = [seconds, count]
+
+    def push(self, value, time=None):
+        """
+        Добавляет значение в окно
+
+        Args:
+            value (float): Значение датчика (нечисловые значения пропускаются)
+            time (float, optional): Метка времени в секундах
+        """
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value != value:
+            return
+
+        previous = self._samples[-1] if self._samples else None
+        for threshold, totals in self._above.items():
+            # Время между записями относится к предыдущему значению
+            if previous is not None and previous[2] > threshold and time is not None and previous[1] is not None:
+                totals[0] += time - previous[1]
+            if value > threshold:
+                totals[1] += 1
+
+        seq = self._seq
+        self._seq += 1
+        self._samples.append((seq, time, value))
+        self._sum += value
+        if self._sorted is not None:
+            bisect.insort(self._sorted, value)
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+
+        self._evict(time)
+
+    def _evict(self, now):
+        while self._samples:
+            oldest = self._samples[0]
+            too_many = self.size is not None and len(self._samples) > self.size
+            too_old = (self.max_age is not None and now is not None and oldest[1] is not None
+                       and now - oldest[1] > self.max_age)
+            if not (too_many or too_old):
+                break
+
+            seq, time, value = self._samples.popleft()
+            self._sum -= value
+            if self._sorted is not None:
+                del self._sorted[bisect.bisect_left(self._sorted, value)]
+            if self._min and self._min[0][0] == seq:
+                self._min.popleft()
+            if self._max and self._max[0][0] == seq:
+                self._max.popleft()
+
+            following = self._samples[0] if self._samples else None
+            for threshold, totals in self._above.items():
+                if value > threshold:
+                    totals[1] -= 1
+                    if following is not None and time is not None and following[1] is not None:
+                        totals[0] -= following[1] - time
+
+    def __len__(self):
+        return len(self._samples)
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def mean(self):
+        return self._sum / len(self._samples) if self._samples else None
+
+    def percentile(self, q):
+        """
+        Перцентиль значений окна (линейная интерполяция, как numpy.percentile)
+
+        Args:
+            q (float): Перцентиль от 0 до 100
+        """
+        values = self._sorted
+        if values is None:
+            values = sorted(sample[2] for sample in self._samples)
+        if not values:
+            return None
+        position = (len(values) - 1) * q / 100.0
+        lower = int(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    @property
+    def p95(self):
+        return self.percentile(95)
+
+    def time_above(self, threshold):
+        """
+        Время выше порога: секунды, если у записей есть метки времени, иначе число записей
+        """
+        self.track(threshold)
+        seconds, count = self._above[threshold]
+        if self._samples and self._samples[0][1] is not None:
+            return seconds
+        return count
+
+    def value(self, aggregate, threshold=None):
+        """
+        Значение агрегата окна по имени ('min', 'max', 'mean', 'p95', 'time_above')
+        """
+        if aggregate == 'time_above':
+            return self.time_above(threshold) if self._samples else None
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {aggregate}")
+        return getattr(self, aggregate)
+
+
+class TelemetryAggregates:
+    """
+    Агрегаты телеметрии одного автомобиля по скользящим окнам.
+    Записи подаются в хронологическом порядке; при поступлении новых записей
+    окна обновляются инкрементально (push).
+    """
+
+    def __init__(self, windows, specs):
+        """
+        Args:
+            windows (dict): Настройки окон {имя: {'size': N, 'max_age': секунды}}
+            specs (dict): Отслеживаемые окна {(поле, окно): множество пар (агрегат, порог time_above или None)}
+        """
+        self._windows = {}
+        for (field, window), aggregates in specs.items():
+            config = windows.get(window)
+            if config is None:
+                raise ValueError(f"Unknown aggregation window: {window}")
+            # Отсортированный список ведется только для окон, из которых правила берут перцентиль
+            self._windows[(field, window)] = RollingWindow(
+                config.get('size'), config.get('max_age'),
+                thresholds=[above for aggregate, above in aggregates if aggregate == 'time_above'],
+                percentiles=any(aggregate == 'p95' for aggregate, _ in aggregates)
+            )
+
+    @classmethod
+    def from_records(cls, telemetry_data, windows, specs):
+        """
+        Строит агрегаты по телеметрии: значения каждого поля подаются в окна
+        из колонки кадра в хронологическом порядке
+
+        Args:
+            telemetry_data (TelemetryFrame или list): Телеметрия (API возвращает записи от новых к старым)
+            windows (dict): Настройки окон
+            specs (dict): Отслеживаемые окна
+        """
+        aggregates = cls(windows, specs)
+        if aggregates._windows:
+            frame = TelemetryFrame.coerce(telemetry_data)
+            order = frame.chronological_order().tolist()
+            times = frame.seconds()[order].tolist() if frame.timed else [None] * len(order)
+            columns = {}
+            for (field, _), window in aggregates._windows.items():
+                values = columns.get(field)
+                if values is None:
+                    values = columns[field] = frame.values(field)
+                for index, time in zip(order, times):
+                    window.push(values[index], time)
+        return aggregates
+
+    def push(self, record, time=None):
+        """
+        Добавляет запись телеметрии во все окна
+
+        Args:
+            record (dict): Запись телеметрии
+            time (float, optional): Метка времени записи в секундах
+        """
+        for (field, _), window in self._windows.items():
+            window.push(record.get(field), time)
+
+    def value(self, field, aggregate, window, threshold=None):
+        """
+        Значение агрегата поля по окну
+
+        Returns:
+            Значение агрегата или None, если окно не отслеживается или пусто
+        """
+        rolling = self._windows.get((field, window))
+        if rolling is None:
+            return None
+        return rolling.value(aggregate, threshold)
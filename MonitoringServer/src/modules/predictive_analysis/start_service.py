@@ -117,6 +117,9 @@ def start_service():
     Запускает сервис анализа и API сервер
     """
     try:
+        # Синхронизация реплики телеметрии - только в процессе сервиса, не в рабочих процессах анализа
+        Database().start_replica_sync()
+        
         # Запускаем периодический анализ в отдельном потоке
         analysis_thread = threading.Thread(target=run_periodic_analysis)
         analysis_thread.daemon = True
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import logging
+from collections.abc import Mapping
+from datetime import datetime
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger("TelemetryFrame")
+
+TELEMETRY_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Поле с меткой времени записи
+TIME_FIELD = 'timestamp'
+
+# Метки в точном формате TELEMETRY_TIMESTAMP_FORMAT разбираются NumPy одной операцией,
+# остальные (например, без ведущих нулей) - datetime.strptime, как в остальном коде
+_TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} ([01]\d|2[0-3]):[0-5]\d:[0-5]\d')
+
+# Целые числа, точно представимые в float64
+_MAX_EXACT_INT = 2 ** 53
+
+_NAT = np.datetime64('NaT', 's')
+
+# Маркер отсутствующего в записи поля
+_ABSENT = object()
+
+
+class TelemetryColumn:
+    """
+    Колонка одного поля телеметрии.
+    Числовая колонка: значения float64, маска валидности (есть число), маска целых
+    (значение было int и при чтении снова становится int) и редкие нечисловые
+    значения (None, строки, словари) по номерам строк.
+    Колонка, в которой нечисловых значений больше, чем чисел, хранит исходные объекты.
+    """
+    __slots__ = ('values', 'present', 'valid', 'integral', 'other')
+
+    def __init__(self, values, present, valid, integral=None, other=None):
+        """
+        Args:
+            values (np.ndarray): Значения (float64 или object)
+            present (np.ndarray): Маска строк, в которых поле есть
+            valid (np.ndarray): Маска строк с числовым значением (int или float, не bool)
+            integral (np.ndarray, optional): Маска целых значений (только для числовой колонки)
+            other (dict, optional): Нечисловые значения числовой колонки {номер строки: значение}
+        """
+        self.values = values
+        self.present = present
+        self.valid = valid
+        self.integral = integral
+        self.other = other or {}
+
+    @classmethod
+    def from_values(cls, raw):
+        """
+        Строит колонку по значениям записей
+
+        Args:
+            raw (list): Значения по строкам (_ABSENT - поля в записи нет)
+        """
+        size = len(raw)
+        kinds = set(map(type, raw))
+        if kinds and kinds <= {int, float}:
+            # Только числа: колонка строится без разбора по значениям
+            values = np.array(raw, dtype=float)
+            if int not in kinds or np.abs(values).max() <= _MAX_EXACT_INT:
+                valid = np.ones(size, dtype=bool)
+                if kinds == {float}:
+                    integral = np.zeros(size, dtype=bool)
+                elif kinds == {int}:
+                    integral = valid.copy()
+                else:
+                    integral = np.fromiter((type(value) is int for value in raw), dtype=bool, count=size)
+                return cls(values, valid, valid, integral)
+
+        numbers, number_rows, integer_rows = [], [], []
+        other = {}
+        for index, value in enumerate(raw):
+            kind = type(value)
+            if kind is float:
+                numbers.append(value)
+                number_rows.append(index)
+            elif kind is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+                numbers.append(value)
+                number_rows.append(index)
+                integer_rows.append(index)
+            elif value is not _ABSENT:
+                other[index] = value
+
+        if len(other) <= len(numbers):
+            values = np.full(size, np.nan)
+            values[number_rows] = numbers
+            valid = np.zeros(size, dtype=bool)
+            valid[number_rows] = True
+            integral = np.zeros(size, dtype=bool)
+            integral[integer_rows] = True
+            present = valid
+            if other:
+                present = valid.copy()
+                present[list(other)] = True
+            return cls(values, present, valid, integral, other)
+
+        # Текстовые и смешанные поля (коды ошибок) хранятся исходными объектами;
+        # одинаковые строки разных записей хранятся одним объектом
+        strings = {}
+        objects = np.empty(size, dtype=object)
+        objects[:] = [None if value is _ABSENT else strings.setdefault(value, value) if type(value) is str else value
+                      for value in raw]
+        present = np.fromiter((value is not _ABSENT for value in raw), dtype=bool, count=size)
+        valid = np.zeros(size, dtype=bool)
+        valid[number_rows] = True
+        return cls(objects, present, valid)
+
+    @property
+    def is_numeric(self):
+        return self.integral is not None
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, index):
+        """
+        Исходное значение строки (_ABSENT, если поля в записи нет)
+        """
+        if not self.present[index]:
+            return _ABSENT
+        if not self.is_numeric:
+            return self.values[index]
+        if self.valid[index]:
+            value = self.values[index]
+            return int(value) if self.integral[index] else float(value)
+        return self.other[index]
+
+    def tolist(self):
+        """
+        Исходные значения всех строк (None, если поля в записи нет)
+        """
+        if not self.is_numeric:
+            return self.values.tolist()
+        values = self.values.tolist()
+        for index in np.flatnonzero(self.integral).tolist():
+            values[index] = int(values[index])
+        for index in np.flatnonzero(~self.valid).tolist():
+            values[index] = None
+        for index, value in self.other.items():
+            values[index] = value
+        return values
+
+    def numeric(self):
+        """
+        Значения как float64 (NaN для строк без числового значения)
+        """
+        if self.is_numeric:
+            values = self.values.copy()
+            for index, value in self.other.items():
+                # Целые вне точного диапазона float64
+                if _is_number(value):
+                    values[index] = value
+            return values
+        values = np.full(len(self.values), np.nan)
+        for index in np.flatnonzero(self.present).tolist():
+            if _is_number(self.values[index]):
+                values[index] = self.values[index]
+        return values
+
+    def take(self, indices):
+        """
+        Колонка из строк с заданными номерами (срез - без копирования массивов)
+        """
+        other = self.other
+        if other:
+            positions = range(len(self.values))[indices] if isinstance(indices, slice) else indices.tolist()
+            other = {row: other[index] for row, index in enumerate(positions) if index in other}
+        integral = self.integral[indices] if self.integral is not None else None
+        return TelemetryColumn(self.values[indices], self.present[indices], self.valid[indices], integral, other)
+
+
+class TimestampColumn(TelemetryColumn):
+    """
+    Колонка меток времени в формате TELEMETRY_TIMESTAMP_FORMAT: хранятся только
+    значения datetime64[s], строка восстанавливается при чтении
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_column(cls, column):
+        """
+        Сжимает колонку меток времени
+
+        Returns:
+            TimestampColumn: Колонка или None, если не все метки в точном формате
+        """
+        if column.is_numeric:
+            return None
+        rows = np.flatnonzero(column.present)
+        labels = column.values[rows].tolist()
+        if not all(type(label) is str and _TIMESTAMP_PATTERN.fullmatch(label) for label in labels):
+            return None
+        times = np.full(len(column), _NAT)
+        try:
+            times[rows] = np.array(labels, dtype='datetime64[s]')
+        except ValueError:
+            return None
+        return cls(times, column.present, np.zeros(len(column), dtype=bool))
+
+    @property
+    def is_numeric(self):
+        return False
+
+    def get(self, index):
+        if not self.present[index]:
+            return _ABSENT
+        return str(self.values[index]).replace('T', ' ')
+
+    def tolist(self):
+        return [str(value).replace('T', ' ') if present else None
+                for value, present in zip(self.values, self.present.tolist())]
+
+    def numeric(self):
+        return np.full(len(self.values), np.nan)
+
+    def take(self, indices):
+        return TimestampColumn(self.values[indices], self.present[indices], self.valid[indices])
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _parse_times(column, size):
+    """
+    Метки времени записей в datetime64[s] (NaT, если метки нет или она не разбирается)
+    """
+    if isinstance(column, TimestampColumn):
+        return column.values
+    times = np.full(size, _NAT)
+    if column is None:
+        return times
+
+    exact, exact_rows, loose = [], [], {}
+    for index in np.flatnonzero(column.present).tolist():
+        value = column.get(index)
+        if isinstance(value, str) and _TIMESTAMP_PATTERN.fullmatch(value):
+            exact.append(value)
+            exact_rows.append(index)
+        else:
+            loose[index] = value
+
+    if exact:
+        try:
+            times[exact_rows] = np.array(exact, dtype='datetime64[s]')
+        except ValueError:
+            # Несуществующая дата (например, 2024-02-30) - разбор по одной метке
+            loose.update(zip(exact_rows, exact))
+    for index, value in loose.items():
+        try:
+            times[index] = np.datetime64(datetime.strptime(value, TELEMETRY_TIMESTAMP_FORMAT), 's')
+        except Exception:
+            pass
+    return times
+
+
+class TelemetryRow(Mapping):
+    """
+    Запись телеметрии - представление одной строки TelemetryFrame в виде словаря
+    (get, [], in, items). Новые ключи, например служебные кеши анализаторов ('_dtc'),
+    хранятся в самой записи и не меняют колонки.
+    """
+    __slots__ = ('_frame', '_index', '_extra')
+
+    def __init__(self, frame, index):
+        self._frame = frame
+        self._index = index
+        self._extra = None
+
+    def __getitem__(self, key):
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        column = self._frame.column(key)
+        value = column.get(self._index) if column is not None else _ABSENT
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        column = self._frame.column(key)
+        value = column.get(self._index) if column is not None else _ABSENT
+        return default if value is _ABSENT else value
+
+    def __contains__(self, key):
+        if self._extra is not None and key in self._extra:
+            return True
+        column = self._frame.column(key)
+        return column is not None and bool(column.present[self._index])
+
+    def __setitem__(self, key, value):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __iter__(self):
+        for field in self._frame.fields:
+            if field in self:
+                yield field
+        if self._extra is not None:
+            for key in self._extra:
+                if self._frame.column(key) is None:
+                    yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self, private=True):
+        """
+        Запись в виде словаря
+
+        Args:
+            private (bool): Включать служебные ключи, начинающиеся с '_'
+
+        Returns:
+            dict: Поля записи
+        """
+        return {key: self[key] for key in self if private or not key.startswith('_')}
+
+    def __repr__(self):
+        return f"TelemetryRow({self.to_dict()!r})"
+
+
+class TelemetryFrame:
+    """
+    Колоночное представление телеметрии одного автомобиля: по массиву на поле,
+    колонка времени datetime64 и маски валидности вместо списка словарей.
+    Порядок строк - как в ответе API (от новых к старым). Для совместимости
+    с кодом, работающим со списком записей, поддерживает len, индексацию
+    (запись - TelemetryRow), срезы и итерацию.
+    """
+    __slots__ = ('fields', '_columns', '_size', '_rows', '_time', '_order')
+
+    def __init__(self, columns, size):
+        """
+        Args:
+            columns (dict): Колонки {поле: TelemetryColumn}
+            size (int): Количество записей
+        """
+        self.fields = tuple(columns)
+        self._columns = columns
+        self._size = size
+        self._rows = {}
+        self._time = None
+        self._order = None
+
+    @classmethod
+    def from_records(cls, records, convert=None):
+        """
+        Строит кадр по записям ответа API (служебные ключи, начинающиеся с '_', не переносятся)
+
+        Args:
+            records (iterable): Записи (словари)
+            convert (callable, optional): Преобразование имени поля (например, snake_case)
+
+        Returns:
+            TelemetryFrame: Кадр телеметрии
+        """
+        records = records if isinstance(records, (list, tuple)) else list(records)
+        size = len(records)
+        names = {}
+        raw = {}
+        # Записи API идут сериями с одинаковым набором полей: серия транспонируется
+        # в колонки одной операцией (zip), а не по одному значению
+        start = 0
+        while start < size:
+            keys = tuple(records[start])
+            end = start + 1
+            while end < size and tuple(records[end]) == keys:
+                end += 1
+            transposed = zip(*(record.values() for record in records[start:end])) if keys else ()
+            for key, values in zip(keys, transposed):
+                name = names.get(key)
+                if name is None:
+                    name = names[key] = convert(key) if convert is not None else key
+                if name.startswith('_'):
+                    continue
+                column = raw.get(name)
+                if column is None:
+                    column = raw[name] = [_ABSENT] * size
+                column[start:end] = values
+            start = end
+        columns = {name: TelemetryColumn.from_values(values) for name, values in raw.items()}
+        if TIME_FIELD in columns:
+            columns[TIME_FIELD] = TimestampColumn.from_column(columns[TIME_FIELD]) or columns[TIME_FIELD]
+        return cls(columns, size)
+
+    @classmethod
+    def coerce(cls, telemetry_data):
+        """
+        Кадр телеметрии из кадра (без копирования), списка записей или None
+        """
+        if isinstance(telemetry_data, cls):
+            return telemetry_data
+        return cls.from_records(telemetry_data or [])
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._take(key)
+        index = key + self._size if key < 0 else key
+        if not 0 <= index < self._size:
+            raise IndexError("telemetry frame index out of range")
+        row = self._rows.get(index)
+        if row is None:
+            row = self._rows[index] = TelemetryRow(self, index)
+        return row
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    def __repr__(self):
+        return f"TelemetryFrame(records={self._size}, fields={list(self.fields)!r})"
+
+    def column(self, name):
+        """
+        Колонка поля или None, если поля нет ни в одной записи
+        """
+        return self._columns.get(name)
+
+    def values(self, name):
+        """
+        Исходные значения поля по строкам (None, если поля в записи нет)
+        """
+        column = self._columns.get(name)
+        return column.tolist() if column is not None else [None] * self._size
+
+    def numeric(self, name):
+        """
+        Значения поля как float64 (NaN для строк без числового значения)
+        """
+        column = self._columns.get(name)
+        return column.numeric() if column is not None else np.full(self._size, np.nan)
+
+    @property
+    def time(self):
+        """
+        Метки времени записей, datetime64[s] (NaT - метки нет или она не разбирается)
+        """
+        if self._time is None:
+            self._time = _parse_times(self._columns.get(TIME_FIELD), self._size)
+        return self._time
+
+    @property
+    def timed(self):
+        """
+        Есть ли у всех записей разбираемые метки времени
+        """
+        return not np.isnat(self.time).any()
+
+    def chronological_order(self):
+        """
+        Номера строк от старых записей к новым. При равных метках раньше идет запись,
+        стоящая дальше в ответе API; если хотя бы одна метка не разбирается,
+        используется обратный порядок строк (API возвращает записи от новых к старым).
+
+        Returns:
+            np.ndarray: Номера строк
+        """
+        if self._order is None:
+            positions = np.arange(self._size)
+            if self.timed:
+                self._order = np.lexsort((-positions, self.time.astype(np.int64)))
+            else:
+                self._order = positions[::-1]
+        return self._order
+
+    def seconds(self):
+        """
+        Метки времени записей в секундах
+        """
+        return self.time.astype(np.int64).astype(float)
+
+    def _take(self, indices):
+        frame = TelemetryFrame({name: column.take(indices) for name, column in self._columns.items()},
+                               len(range(self._size)[indices]) if isinstance(indices, slice) else len(indices))
+        if self._time is not None:
+            frame._time = self._time[indices]
+        return frame
+
+    def between(self, start=None, end=None):
+        """
+        Записи с меткой времени в интервале [start, end] (записи без метки не попадают).
+        Для упорядоченного по времени ответа API - срез без копирования колонок.
+
+        Args:
+            start (datetime или str, optional): Начало интервала
+            end (datetime или str, optional): Конец интервала
+
+        Returns:
+            TelemetryFrame: Кадр с записями интервала (в исходном порядке)
+        """
+        times = self.time
+        start = np.datetime64(start, 's') if start is not None else None
+        end = np.datetime64(end, 's') if end is not None else None
+        if self.timed and (self._size < 2 or (times[:-1] >= times[1:]).all()):
+            # Метки по убыванию: границы ищутся бинарным поиском по обращенному массиву
+            ascending = times[::-1]
+            lower = np.searchsorted(ascending, start, side='left') if start is not None else 0
+            upper = np.searchsorted(ascending, end, side='right') if end is not None else self._size
+            return self._take(slice(self._size - upper, self._size - lower))
+        mask = ~np.isnat(times)
+        if start is not None:
+            mask &= times >= start
+        if end is not None:
+            mask &= times <= end
+        return self._take(np.flatnonzero(mask))
+
+    def to_records(self, private=False):
+        """
+        Записи в виде списка словарей (для JSON)
+        """
+        return [self[index].to_dict(private) for index in range(self._size)]
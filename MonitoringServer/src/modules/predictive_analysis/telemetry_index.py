@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import bisect
+import logging
+from telemetry_frame import TelemetryFrame
+
+# Set up logging
+logger = logging.getLogger("TelemetryIndex")
+
+
+class TelemetryTimeIndex:
+    """
+    Временной индекс телеметрии одного автомобиля.
+    Метки времени разбираются один раз и хранятся в отсортированном массиве,
+    поиск записи по времени выполняется бинарным поиском (bisect).
+    """
+
+    def __init__(self, telemetry_data):
+        """
+        Строит индекс по записям телеметрии
+
+        Args:
+            telemetry_data (TelemetryFrame или list): Телеметрия
+        """
+        self.valid = True
+        self._times = []
+        self._first_index = []
+        self._odometer = []
+
+        frame = TelemetryFrame.coerce(telemetry_data)
+        if not frame.timed:
+            # Если хотя бы одна метка времени не разбирается, поиск по времени недоступен
+            logger.debug("Telemetry time index is not available: unparsable timestamp")
+            self.valid = False
+            return
+
+        # Для каждой уникальной метки времени храним первую по порядку запись с одометром
+        odometer = frame.values('odometer')
+        parsed = frame.time.tolist()
+        entries = sorted(
+            (timestamp, index) for index, timestamp in enumerate(parsed)
+            if odometer[index] is not None
+        )
+        for timestamp, index in entries:
+            if self._times and self._times[-1] == timestamp:
+                continue
+            self._times.append(timestamp)
+            self._first_index.append(index)
+            self._odometer.append(odometer[index])
+
+    def __len__(self):
+        return len(self._times)
+
+    def _nearest_position(self, when):
+        """
+        Возвращает позицию ближайшей по времени записи.
+        При равном удалении выбирается запись, стоящая раньше в исходном списке.
+        """
+        if not self.valid or not self._times:
+            return None
+
+        position = bisect.bisect_left(self._times, when)
+        if position == 0:
+            return 0
+        if position == len(self._times):
+            return position - 1
+
+        left_distance = when - self._times[position - 1]
+        right_distance = self._times[position] - when
+        if left_distance < right_distance:
+            return position - 1
+        if right_distance < left_distance:
+            return position
+        return position - 1 if self._first_index[position - 1] < self._first_index[position] else position
+
+    def nearest_odometer(self, when):
+        """
+        Показание одометра в записи, ближайшей по времени к заданному моменту
+
+        Args:
+            when (datetime): Момент времени
+
+        Returns:
+            Показание одометра или None, если индекс пуст или недоступен
+        """
+        position = self._nearest_position(when)
+        if position is None:
+            return None
+        return self._odometer[position]
+
+    def odometer_at(self, when):
+        """
+        Оценивает показание одометра в момент времени линейной интерполяцией
+        между соседними записями. За пределами диапазона возвращается крайнее значение.
+        Оценка пробега при анализе использует nearest_odometer (как исходный алгоритм).
+
+        Args:
+            when (datetime): Момент времени
+
+        Returns:
+            float: Показание одометра или None, если индекс пуст или недоступен
+        """
+        if not self.valid or not self._times:
+            return None
+
+        position = bisect.bisect_left(self._times, when)
+        if position == 0:
+            return self._odometer[0]
+        if position == len(self._times):
+            return self._odometer[-1]
+        if self._times[position] == when:
+            return self._odometer[position]
+
+        left_time, right_time = self._times[position - 1], self._times[position]
+        left_value, right_value = self._odometer[position - 1], self._odometer[position]
+        try:
+            fraction = (when - left_time).total_seconds() / (right_time - left_time).total_seconds()
+            return left_value + (right_value - left_value) * fraction
+        except Exception:
+            return self.nearest_odometer(when)
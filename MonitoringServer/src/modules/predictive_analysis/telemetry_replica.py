@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from telemetry_frame import TelemetryFrame, TelemetryRow
+
+# Set up logging
+logger = logging.getLogger("TelemetryReplica")
+
+# Записей телеметрии в одной транзакции при синхронизации
+INSERT_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS telemetry (
+    vehicle_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (vehicle_id, id)
+);
+CREATE INDEX IF NOT EXISTS telemetry_vehicle_ts ON telemetry (vehicle_id, ts DESC, id DESC);
+CREATE TABLE IF NOT EXISTS works (
+    vehicle_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    vehicle_id TEXT PRIMARY KEY,
+    cursor TEXT,
+    telemetry_synced_at REAL,
+    works_synced_at REAL
+);
+"""
+
+
+def _epoch(value):
+    """
+    Время записи API (ISO 8601, в том числе с 'Z') в секунды эпохи
+
+    Returns:
+        float: Время или None, если разобрать не удалось
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def _public(record):
+    """
+    Поля записи без служебных ключей анализаторов (начинающихся с '_')
+    """
+    if isinstance(record, TelemetryRow):
+        return record.to_dict(private=False)
+    return {key: value for key, value in record.items() if not key.startswith('_')}
+
+
+class TelemetryReplica:
+    """
+    Локальная реплика телеметрии и истории работ в SQLite (режим WAL).
+    Телеметрия индексирована по (vehicle_id, время) и пополняется инкрементально:
+    из API загружаются только записи не старше последней синхронизированной.
+    Пока API недоступен, данные отдаются из реплики.
+    """
+
+    def __init__(self, path, history_days=90):
+        """
+        Args:
+            path (str): Путь к файлу базы SQLite
+            history_days (int): Глубина хранимой истории телеметрии в днях
+        """
+        self.path = path
+        self.history_days = history_days
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            connection = self._connection()
+            connection.executescript(_SCHEMA)
+            connection.commit()
+        logger.info(f"Telemetry replica opened at {path}")
+
+    def _connection(self):
+        # Отдельное соединение на поток (и процесс: соединения SQLite нельзя использовать после fork);
+        # WAL позволяет читать параллельно с записью
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def _state(self, vehicle_id):
+        row = self._connection().execute(
+            "SELECT cursor, telemetry_synced_at, works_synced_at FROM sync_state WHERE vehicle_id = ?",
+            (str(vehicle_id),)
+        ).fetchone()
+        return row or (None, None, None)
+
+    def telemetry_age(self, vehicle_id):
+        """
+        Время с последней синхронизации телеметрии автомобиля в секундах (None - не синхронизировалась)
+        """
+        synced_at = self._state(vehicle_id)[1]
+        return None if synced_at is None else time.time() - synced_at
+
+    def works_age(self, vehicle_id):
+        """
+        Время с последней синхронизации истории работ автомобиля в секундах (None - не синхронизировалась)
+        """
+        synced_at = self._state(vehicle_id)[2]
+        return None if synced_at is None else time.time() - synced_at
+
+    def get_telemetry_data(self, vehicle_id, start_date=None, end_date=None, limit=10):
+        """
+        Телеметрия автомобиля из реплики (от новых записей к старым, как в API)
+
+        Args:
+            vehicle_id: ID автомобиля
+            start_date (str, optional): Начальная дата выборки в формате ISO 8601
+            end_date (str, optional): Конечная дата выборки в формате ISO 8601
+            limit (int, optional): Максимальное количество записей
+
+        Returns:
+            TelemetryFrame: Телеметрия
+        """
+        query = "SELECT data FROM telemetry WHERE vehicle_id = ?"
+        params = [str(vehicle_id)]
+        if start_date and _epoch(start_date) is not None:
+            query += " AND ts >= ?"
+            params.append(_epoch(start_date))
+        if end_date and _epoch(end_date) is not None:
+            query += " AND ts <= ?"
+            params.append(_epoch(end_date))
+        query += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
+        rows = self._connection().execute(query, params).fetchall()
+        # Ключи уже преобразованы при синхронизации
+        return TelemetryFrame.from_records([json.loads(data) for data, in rows])
+
+    def get_vehicle_works(self, vehicle_id):
+        """
+        История работ автомобиля из реплики
+
+        Returns:
+            list: Работы (пустой список, если история не синхронизировалась)
+        """
+        row = self._connection().execute(
+            "SELECT data FROM works WHERE vehicle_id = ?", (str(vehicle_id),)
+        ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def pull_telemetry(self, api_client, vehicle_id):
+        """
+        Инкрементально загружает новую телеметрию автомобиля из API.
+        Курсор (время последней записи) сдвигается только после полной загрузки,
+        поэтому прерванная синхронизация не оставляет пропусков.
+
+        Args:
+            api_client (ApiClient): Клиент API
+            vehicle_id: ID автомобиля
+
+        Returns:
+            bool: True, если синхронизация завершена
+        """
+        cursor = self._state(vehicle_id)[0]
+        since = cursor or (datetime.now() - timedelta(days=self.history_days)).isoformat()
+        newest, newest_ts = cursor, _epoch(cursor)
+        rows = []
+        pulled = 0
+        for record in api_client.iter_telemetry_data(vehicle_id, start_date=since, prefetch=0):
+            created_at = record.get('created_at')
+            ts = _epoch(created_at)
+            if ts is None or record.get('id') is None:
+                continue
+            if newest_ts is None or ts > newest_ts:
+                newest, newest_ts = created_at, ts
+            rows.append((str(vehicle_id), record['id'], ts, json.dumps(_public(record), ensure_ascii=False, default=str)))
+            if len(rows) >= INSERT_BATCH_SIZE:
+                pulled += self._insert(rows)
+                rows = []
+        pulled += self._insert(rows)
+
+        # Ошибка любой страницы прерывает загрузку; курсор в этом случае не сдвигается
+        if api_client.last_status not in (200, 201):
+            logger.warning(f"Telemetry sync for vehicle {vehicle_id} failed, serving replica data")
+            return False
+
+        with self._write_lock:
+            connection = self._connection()
+            connection.execute(
+                """INSERT INTO sync_state (vehicle_id, cursor, telemetry_synced_at) VALUES (?, ?, ?)
+                   ON CONFLICT(vehicle_id) DO UPDATE SET cursor = excluded.cursor,
+                   telemetry_synced_at = excluded.telemetry_synced_at""",
+                (str(vehicle_id), newest, time.time())
+            )
+            connection.commit()
+        logger.debug(f"Telemetry sync for vehicle {vehicle_id}: {pulled} records")
+        return True
+
+    def _insert(self, rows):
+        if not rows:
+            return 0
+        with self._write_lock:
+            connection = self._connection()
+            connection.executemany("INSERT OR REPLACE INTO telemetry (vehicle_id, id, ts, data) VALUES (?, ?, ?, ?)", rows)
+            connection.commit()
+        return len(rows)
+
+    def store_works(self, works_by_vehicle):
+        """
+        Сохраняет историю работ автомобилей (заменяет сохраненную ранее)
+
+        Args:
+            works_by_vehicle (dict): {ID автомобиля: список работ}
+        """
+        now = time.time()
+        with self._write_lock:
+            connection = self._connection()
+            connection.executemany(
+                "INSERT OR REPLACE INTO works (vehicle_id, data) VALUES (?, ?)",
+                [(str(vehicle_id), json.dumps(works, ensure_ascii=False, default=str))
+                 for vehicle_id, works in works_by_vehicle.items()]
+            )
+            connection.executemany(
+                """INSERT INTO sync_state (vehicle_id, works_synced_at) VALUES (?, ?)
+                   ON CONFLICT(vehicle_id) DO UPDATE SET works_synced_at = excluded.works_synced_at""",
+                [(str(vehicle_id), now) for vehicle_id in works_by_vehicle]
+            )
+            connection.commit()
+
+    def prune(self):
+        """
+        Удаляет телеметрию старше history_days
+
+        Returns:
+            int: Количество удаленных записей
+        """
+        threshold = (datetime.now() - timedelta(days=self.history_days)).timestamp()
+        with self._write_lock:
+            connection = self._connection()
+            deleted = connection.execute("DELETE FROM telemetry WHERE ts < ?", (threshold,)).rowcount
+            connection.commit()
+        return deleted
+
+    def stats(self):
+        """
+        Размер реплики
+
+        Returns:
+            dict: Количество записей телеметрии, автомобилей и путь к файлу
+        """
+        connection = self._connection()
+        return {
+            'path': self.path,
+            'telemetry_records': connection.execute("SELECT COUNT(*) FROM telemetry").fetchone()[0],
+            'vehicles': connection.execute("SELECT COUNT(*) FROM sync_state").fetchone()[0],
+        }
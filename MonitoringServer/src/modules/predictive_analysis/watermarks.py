@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import hashlib
+import logging
+import threading
+
+# Set up logging
+logger = logging.getLogger("Watermarks")
+
+
+def telemetry_marker(telemetry_data):
+    """
+    Отметка самой новой записи телеметрии (API возвращает записи от новых к старым)
+
+    Args:
+        telemetry_data (list): Список записей телеметрии
+
+    Returns:
+        tuple: (id, created_at) первой записи или None
+    """
+    if not telemetry_data:
+        return None
+    latest = telemetry_data[0]
+    return (latest.get('id'), latest.get('created_at') or latest.get('timestamp'))
+
+
+def works_fingerprint(work_history):
+    """
+    Отпечаток истории работ: меняется при добавлении, удалении или изменении работы
+
+    Args:
+        work_history (list): История работ
+
+    Returns:
+        str: Хеш истории работ
+    """
+    digest = hashlib.md5()
+    for work in work_history or []:
+        digest.update(repr((work.get('id'), work.get('date'), work.get('description'))).encode('utf-8'))
+    return f"{len(work_history or [])}:{digest.hexdigest()}"
+
+
+def result_fingerprint(analysis_result):
+    """
+    Отпечаток содержимого результата анализа (без служебных полей id и created_at)
+
+    Args:
+        analysis_result (dict): Результат анализа
+
+    Returns:
+        str: Хеш оценок, рекомендаций и проблем
+    """
+    digest = hashlib.md5()
+    for key in sorted(analysis_result):
+        if key in ('id', 'created_at'):
+            continue
+        value = analysis_result[key]
+        if key == 'issues':
+            value = [(issue.code, issue.value, issue.position) for issue in value]
+        elif isinstance(value, (list, tuple)):
+            value = list(value)
+        digest.update(repr((key, value)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class WatermarkStore:
+    """
+    Потокобезопасное хранилище отметок последнего анализа по автомобилям:
+    какие данные телеметрии и работ были учтены и какой результат получен.
+    """
+
+    def __init__(self, max_age):
+        """
+        Args:
+            max_age (int): Через сколько секунд результат пересчитывается даже без новых данных
+        """
+        self.max_age = max_age
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, vehicle_id, telemetry_data, work_history, result):
+        """
+        Сохраняет отметку по данным, на которых был выполнен анализ
+        """
+        self.put(vehicle_id, {
+            'telemetry': telemetry_marker(telemetry_data),
+            'works': works_fingerprint(work_history),
+            'analyzed_at': time.time(),
+            'result': result
+        })
+
+    def put(self, vehicle_id, entry):
+        with self._lock:
+            self._entries[str(vehicle_id)] = entry
+
+    def get(self, vehicle_id):
+        """
+        Возвращает отметку автомобиля, если она не устарела
+
+        Returns:
+            dict: Отметка или None
+        """
+        with self._lock:
+            entry = self._entries.get(str(vehicle_id))
+        if entry is None or time.time() - entry['analyzed_at'] > self.max_age:
+            return None
+        return entry
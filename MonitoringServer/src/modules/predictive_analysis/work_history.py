@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+# Set up logging
+logger = logging.getLogger("WorkHistory")
+
+WORK_DATE_FORMAT = '%Y-%m-%d'
+
+# Ключевые слова в описании работы по системам автомобиля
+SERVICE_KEYWORDS = {
+    'engine': ['engine'],
+    'oil': ['масло', 'oil'],
+    'tires': ['шин', 'колес', 'tire', 'wheel'],
+    'brakes': ['тормоз', 'колод', 'диск', 'brake', 'pad', 'disc'],
+    'suspension': ['подвес', 'аморт', 'пруж', 'стойк', 'suspend', 'shock', 'spring', 'strut'],
+    'battery': ['аккумулятор', 'батаре', 'battery', 'batt'],
+}
+
+
+class KeywordAutomaton:
+    """
+    Автомат Ахо-Корасик для поиска всех ключевых слов за один проход по строке.
+    Каждому ключевому слову соответствует метка (система автомобиля).
+    """
+
+    def __init__(self, keywords_by_label):
+        """
+        Args:
+            keywords_by_label (dict): {метка: список ключевых слов}
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [frozenset()]
+
+        for label, keywords in keywords_by_label.items():
+            for keyword in keywords:
+                state = 0
+                for char in keyword.lower():
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append(frozenset())
+                    state = next_state
+                self._output[state] = self._output[state] | {label}
+
+        # Ссылки неудач строятся обходом в ширину
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] | self._output[self._fail[next_state]]
+
+    def labels(self, text):
+        """
+        Метки всех ключевых слов, входящих в строку
+
+        Args:
+            text (str): Строка в нижнем регистре
+
+        Returns:
+            frozenset: Найденные метки
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = frozenset()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found = found | output[state]
+        return found
+
+
+_AUTOMATON = KeywordAutomaton(SERVICE_KEYWORDS)
+
+
+@lru_cache(maxsize=4096)
+def classify_description(description):
+    """
+    Системы, к которым относится описание работы (описания в автопарке часто повторяются)
+
+    Args:
+        description (str): Описание работы
+
+    Returns:
+        frozenset: Системы автомобиля
+    """
+    return _AUTOMATON.labels(description.lower())
+
+
+class ServiceRecord:
+    """
+    Работа из истории с определенными системами и разобранной датой
+    """
+    __slots__ = ('work', 'systems', '_date', '_date_error')
+
+    def __init__(self, work):
+        self.work = work
+        self.systems = classify_description(work.get('description', ''))
+        self._date = None
+        self._date_error = None
+        if self.systems:
+            try:
+                self._date = datetime.strptime(work.get('date'), WORK_DATE_FORMAT)
+            except Exception as e:
+                self._date_error = e
+
+    def parsed_date(self):
+        """
+        Дата работы
+
+        Returns:
+            datetime: Дата работы (ошибка разбора даты пробрасывается при обращении)
+        """
+        if self._date_error is not None:
+            raise self._date_error
+        return self._date
+
+
+class ServiceHistory:
+    """
+    История работ автомобиля, классифицированная по системам за один проход.
+    Хранит последнюю работу по каждой системе (в порядке истории).
+    """
+
+    def __init__(self, work_history):
+        """
+        Args:
+            work_history (list): История работ
+        """
+        self._last = {}
+        for work in work_history or []:
+            record = ServiceRecord(work)
+            for system in record.systems:
+                self._last[system] = record
+
+    def last_service(self, system):
+        """
+        Последняя работа по системе
+
+        Args:
+            system (str): Система автомобиля
+
+        Returns:
+            ServiceRecord: Работа или None
+        """
+        return self._last.get(system)
+
+    def days_since(self, system, now):
+        """
+        Число дней с последней работы по системе
+
+        Returns:
+            int: Количество дней или None, если работ не было
+        """
+        record = self._last.get(system)
+        if record is None:
+            return None
+        return (now - record.parsed_date()).days
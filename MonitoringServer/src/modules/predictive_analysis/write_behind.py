@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import random
+import logging
+import threading
+from collections import deque
+
+# Set up logging
+logger = logging.getLogger("WriteBehind")
+
+
+class WriteBehindQueue:
+    """
+    Отложенная пакетная запись (write-behind): элементы буферизуются и записываются
+    фоновым потоком пачками - когда набралось batch_size элементов или самый старый
+    элемент ждет дольше flush_interval секунд. Неудачно записанные элементы
+    повторяются с экспоненциальной задержкой, после max_retries попыток отбрасываются.
+    """
+
+    def __init__(self, write_batch, batch_size=50, flush_interval=1.0, max_queue=10000,
+                 max_retries=5, retry_delay=1.0, name="WriteBehind"):
+        """
+        Args:
+            write_batch (callable): Запись пачки; принимает список элементов и возвращает
+                список элементов, которые нужно повторить (пустой список - все записано)
+            batch_size (int): Максимальный размер пачки
+            flush_interval (float): Максимальное время ожидания элемента в буфере в секундах
+            max_queue (int): Размер буфера; при заполнении submit ждет освобождения места
+            max_retries (int): Количество повторов записи элемента
+            retry_delay (float): Базовая задержка перед повтором в секундах
+            name (str): Имя фонового потока
+        """
+        self.write_batch = write_batch
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queue = max(self.batch_size, max_queue)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.name = name
+
+        # Новые элементы: (элемент, время постановки); повторы: (элемент, время повтора, номер попытки)
+        self._buffer = deque()
+        self._retries = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self._flush_requested = False
+        self._in_flight = 0
+
+        self.submitted = 0
+        self.written = 0
+        self.retried = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self._latency_total = 0.0
+        self._latency_last = 0.0
+        self._latency_max = 0.0
+
+    def _ensure_worker(self):
+        # Вызывается под self._condition. После fork буфер принадлежит родительскому
+        # процессу (он запишет его сам), поэтому дочерний процесс начинает с пустого буфера
+        pid = os.getpid()
+        if self._pid != pid:
+            if self._pid is not None:
+                self._buffer.clear()
+                self._retries = []
+                self._in_flight = 0
+            self._pid = pid
+            self._thread = None
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _pending(self):
+        return len(self._buffer) + len(self._retries)
+
+    def submit(self, item):
+        """
+        Добавляет элемент в буфер записи
+
+        Args:
+            item: Элемент для записи
+
+        Returns:
+            bool: True, если элемент принят (False после закрытия очереди)
+        """
+        with self._condition:
+            if self._closed:
+                return False
+            self._ensure_worker()
+            while self._pending() >= self.max_queue and not self._closed:
+                self._condition.wait()
+            self._buffer.append((item, time.monotonic()))
+            self.submitted += 1
+            if len(self._buffer) == 1 or len(self._buffer) >= self.batch_size:
+                self._condition.notify_all()
+            return True
+
+    def _take_batch(self):
+        """
+        Ждет готовую пачку: batch_size элементов, истекший flush_interval, наступившее
+        время повтора или запрос сброса
+
+        Returns:
+            list: Пачка (элемент, номер попытки) или None при закрытии пустой очереди
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                due = [entry for entry in self._retries if entry[1] <= now]
+                if (due or len(self._buffer) >= self.batch_size
+                        or (self._buffer and (self._flush_requested or self._closed
+                                              or now - self._buffer[0][1] >= self.flush_interval))):
+                    batch = [(item, attempt) for item, _, attempt in due[:self.batch_size]]
+                    taken = set(id(entry) for entry in due[:self.batch_size])
+                    self._retries = [entry for entry in self._retries if id(entry) not in taken]
+                    while self._buffer and len(batch) < self.batch_size:
+                        batch.append((self._buffer.popleft()[0], 0))
+                    self._in_flight = len(batch)
+                    self._condition.notify_all()
+                    return batch
+                if self._closed and not self._pending():
+                    return None
+
+                # Ждем до ближайшего срока: истечения flush_interval или времени повтора
+                deadlines = [retry_at for _, retry_at, _ in self._retries]
+                if self._buffer:
+                    deadlines.append(self._buffer[0][1] + self.flush_interval)
+                self._condition.wait(max(0.0, min(deadlines) - now) if deadlines else None)
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            self._write(batch)
+
+    def _write(self, batch):
+        items = [item for item, _ in batch]
+        started = time.monotonic()
+        try:
+            failed = self.write_batch(items) or []
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(items)} failed: {str(e)}")
+            failed = items
+        latency = time.monotonic() - started
+
+        failed_ids = {id(item) for item in failed}
+        with self._condition:
+            self.batches += 1
+            self._latency_last = latency
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            self.written += len(items) - len(failed_ids)
+            if failed_ids:
+                self.failed_batches += 1
+            for item, attempt in batch:
+                if id(item) not in failed_ids:
+                    continue
+                if attempt >= self.max_retries:
+                    self.dropped += 1
+                    logger.error(f"{self.name}: item dropped after {attempt + 1} attempts")
+                    continue
+                # Повтор с экспоненциальной задержкой со случайным разбросом (при закрытии - сразу)
+                delay = 0 if self._closed else random.uniform(0, self.retry_delay * (2 ** attempt))
+                self._retries.append((item, time.monotonic() + delay, attempt + 1))
+                self.retried += 1
+            self._in_flight = 0
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Ждет записи всех элементов, добавленных до вызова (включая повторы)
+
+        Args:
+            timeout (float, optional): Максимальное время ожидания в секундах
+
+        Returns:
+            bool: True, если буфер полностью записан
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if self._thread is None or self._pid != os.getpid():
+                return not self._pending()
+            self._flush_requested = True
+            self._condition.notify_all()
+            try:
+                while self._pending() or self._in_flight:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                return True
+            finally:
+                self._flush_requested = False
+
+    def close(self, timeout=None):
+        """
+        Закрывает очередь: новые элементы не принимаются, буфер дописывается
+        (повторы выполняются без задержки)
+
+        Args:
+            timeout (float, optional): Максимальное время ожидания в секундах
+
+        Returns:
+            bool: True, если буфер полностью записан
+        """
+        with self._condition:
+            self._closed = True
+            # Отложенные повторы выполняются сразу
+            now = time.monotonic()
+            self._retries = [(item, min(retry_at, now), attempt) for item, retry_at, attempt in self._retries]
+            self._condition.notify_all()
+            thread = self._thread if self._pid == os.getpid() else None
+        if thread is not None:
+            thread.join(timeout)
+        with self._condition:
+            if self._pending():
+                logger.error(f"{self.name}: {self._pending()} items not written on shutdown")
+            return not self._pending() and not self._in_flight
+
+    def metrics(self):
+        """
+        Метрики очереди
+
+        Returns:
+            dict: Глубина буфера, счетчики записей, повторов и потерь, задержка записи пачек
+        """
+        with self._condition:
+            return {
+                'queue_depth': self._pending(),
+                'in_flight': self._in_flight,
+                'submitted': self.submitted,
+                'written': self.written,
+                'retried': self.retried,
+                'dropped': self.dropped,
+                'batches': self.batches,
+                'failed_batches': self.failed_batches,
+                'flush_latency_last': round(self._latency_last, 4),
+                'flush_latency_avg': round(self._latency_total / self.batches, 4) if self.batches else 0.0,
+                'flush_latency_max': round(self._latency_max, 4),
+            }
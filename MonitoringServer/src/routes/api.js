@@ -93,6 +93,11 @@ router.get('/prediction/vehicles/:vehicleId', vehicleController.getVehicleById);
 router.get('/prediction/vehicles/search/by-vin', vehicleController.searchVehicleByVin);
 router.get('/prediction/telemetry/vehicle-data', telemetryController.getVehicleTelemetryData);
 router.get('/prediction/works/vehicle/:vehicleId', workController.getVehicleWorks);
+router.post('/prediction/telemetry/vehicles-data', telemetryController.getFleetTelemetryData);
+router.post('/prediction/works/vehicles', workController.getFleetWorks);
 router.post('/prediction/analysis/vehicle/:vehicleId/results', analysisController.saveAnalysisResults);
+router.post('/prediction/analysis/results/batch', analysisController.saveAnalysisResultsBatch);
+router.post('/prediction/analysis/vehicle/:vehicleId/results/heartbeat', analysisController.touchAnalysisResults);
+router.post('/prediction/analysis/results/heartbeat/batch', analysisController.touchAnalysisResultsBatch);
 
 module.exports = router;
\ No newline at end of file
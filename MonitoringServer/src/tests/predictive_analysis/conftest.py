@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import copy
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+# Модули анализа импортируют друг друга по имени файла
+MODULE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'modules', 'predictive_analysis'))
+sys.path.insert(0, MODULE_DIR)
+
+# Тесты работают без Node.js API и без локальных хранилищ (переменные окружения
+# имеют приоритет над .env модуля)
+os.environ.update({
+    'ANALYSIS_MODE': 'serial',
+    'INCREMENTAL_ANALYSIS': 'false',
+    'ANALYSIS_STORE': 'false',
+    'ANALYSIS_WRITE_BEHIND': 'false',
+    'TELEMETRY_REPLICA': 'false',
+    'API_CLIENT_MODE': 'sync',
+})
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+SENSOR_RANGES = {
+    'engineTemp': (80, 120),
+    'rpm': (500, 7000),
+    'oilPressure': (5, 40),
+    'fuelConsumption': (5, 15),
+    'mafSensor': (1, 120),
+    'batteryVoltage': (11, 15.5),
+    'batteryCCA': (200, 700),
+    'alternatorOutput': (12, 16),
+    'tirePressure': (20, 42),
+    'brakePadThickness': (1, 9),
+    'vibration': (0, 4),
+    'speed': (0, 160),
+}
+
+WORK_DESCRIPTIONS = ['замена масла', 'oil change', 'шиномонтаж', 'замена тормозных колодок', 'engine repair',
+                     'аккумулятор', 'амортизаторы', 'мойка', 'Brake disc', 'wheel alignment', 'strut replacement']
+
+DTC_VALUES = ["[]", "['P0100', 'C0035']", '["C0001", "C0002"]', ['P0300'], None, '', "P0171,C0040"]
+
+
+def make_fleet(size, seed=1, now=None):
+    """
+    Синтетический автопарк: {ID: (автомобиль, телеметрия от новых к старым, история работ)}.
+    В записях встречаются пропущенные поля, None и разные форматы кодов ошибок.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    fleet = {}
+    for vehicle_id in range(1, size + 1):
+        records = []
+        odometer = rng.randint(1000, 100000)
+        start = now - timedelta(days=rng.randint(1, 1000))
+        for index in range(rng.choice([0, 1, 2, 5, 20, 40])):
+            record = {}
+            for field, (low, high) in SENSOR_RANGES.items():
+                chance = rng.random()
+                if chance < 0.2:
+                    continue
+                record[field] = None if chance < 0.25 else rng.choice([rng.randint(int(low), int(high)),
+                                                                        round(rng.uniform(low, high), 2)])
+            odometer += rng.randint(0, 3000)
+            record['odometer'] = odometer
+            record['timestamp'] = (start + timedelta(hours=index * rng.randint(1, 48))).strftime(TIMESTAMP_FORMAT)
+            record['dtcCodes'] = rng.choice(DTC_VALUES)
+            if rng.random() < 0.2:
+                record['brakeFluid'] = rng.choice(['low', 'OK', 'contaminated'])
+            if rng.random() < 0.2:
+                record['roadQuality'] = rng.choice(['poor', 'good', 'Плохое'])
+            records.append(record)
+        records.reverse()
+
+        works = [{'id': number + 1, 'description': rng.choice(WORK_DESCRIPTIONS),
+                  'date': (now - timedelta(days=rng.randint(0, 2000))).strftime('%Y-%m-%d')}
+                 for number in range(rng.choice([0, 1, 3, 8]))]
+        fleet[vehicle_id] = ({'id': vehicle_id, 'vin': f'VIN{vehicle_id:06d}'}, records, works)
+    return fleet
+
+
+class FakeApiClient:
+    """
+    Клиент API в памяти с теми же методами, что у ApiClient
+    """
+
+    def __init__(self, fleet):
+        self.fleet = fleet
+        self.saved = []
+        self.touched = []
+        # Код ответа последнего запроса (404 - объект не найден, None - ошибка сети)
+        self.last_status = 200
+        # Количество обращений по методам
+        self.calls = Counter()
+        # Ответы API на сохранение и подтверждение результатов
+        self.accept_saves = True
+        self.accept_touches = True
+
+    def get_all_vehicles(self):
+        self.calls['get_all_vehicles'] += 1
+        return [dict(vehicle) for vehicle, _, _ in self.fleet.values()]
+
+    def get_vehicle_by_id(self, vehicle_id):
+        self.calls['get_vehicle_by_id'] += 1
+        entry = self.fleet.get(int(vehicle_id))
+        return dict(entry[0]) if entry else None
+
+    def get_vehicle_by_vin(self, vin):
+        self.calls['get_vehicle_by_vin'] += 1
+        for vehicle, _, _ in self.fleet.values():
+            if vehicle['vin'] == vin:
+                return dict(vehicle)
+        return None
+
+    def get_telemetry_data(self, vehicle_id, start_date=None, end_date=None, limit=10):
+        self.calls['get_telemetry_data'] += 1
+        return copy.deepcopy(self.fleet[int(vehicle_id)][1][:limit])
+
+    def get_telemetry_data_bulk(self, vehicle_ids, start_date=None, end_date=None, limit=10):
+        self.calls['get_telemetry_data_bulk'] += 1
+        return {vehicle_id: copy.deepcopy(self.fleet[int(vehicle_id)][1][:limit]) for vehicle_id in vehicle_ids}
+
+    def get_vehicle_works(self, vehicle_id):
+        self.calls['get_vehicle_works'] += 1
+        return copy.deepcopy(self.fleet[int(vehicle_id)][2])
+
+    def get_vehicle_works_bulk(self, vehicle_ids):
+        self.calls['get_vehicle_works_bulk'] += 1
+        return {vehicle_id: copy.deepcopy(self.fleet[int(vehicle_id)][2]) for vehicle_id in vehicle_ids}
+
+    def save_analysis_result(self, analysis_result):
+        self.calls['save_analysis_result'] += 1
+        if not self.accept_saves:
+            return False
+        self.saved.append(analysis_result)
+        return True
+
+    def save_analysis_results_bulk(self, analysis_results):
+        return [self.save_analysis_result(result) for result in analysis_results]
+
+    def touch_analysis_result(self, vehicle_id, created_at):
+        self.calls['touch_analysis_result'] += 1
+        if not self.accept_touches:
+            return False
+        self.touched.append((vehicle_id, created_at))
+        return True
+
+    def touch_analysis_results_bulk(self, touches):
+        self.calls['touch_analysis_results_bulk'] += 1
+        if not self.accept_touches:
+            return [False] * len(touches)
+        self.touched.extend(touches)
+        return [True] * len(touches)
+
+
+@pytest.fixture
+def fake_api():
+    """
+    Подменяет клиент API общего экземпляра Database синтетическим автопарком
+    """
+    from database import Database
+
+    db = Database()
+    original = db.api_client
+    db.api_client = FakeApiClient(make_fleet(60))
+    db.invalidate_vehicle_cache()
+    try:
+        yield db.api_client
+    finally:
+        db.api_client = original
+        db.invalidate_vehicle_cache()
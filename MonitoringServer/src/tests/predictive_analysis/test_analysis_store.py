@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sqlite3
+
+import pytest
+
+from analysis_store import AnalysisStore
+from issues import Issue
+
+
+def _result(vehicle_id=1, created_at='2024-06-01T10:00:00', engine_health=80):
+    return {
+        'vehicle_id': vehicle_id,
+        'engine_health': engine_health,
+        'overall_health': 75,
+        'recommendations': ['Проверьте масло, фильтр и свечи.', 'Замените колодки.'],
+        'issues': [Issue('oil.oilPressure<20', 'oil', 'oilPressure', 15, 20)],
+        'created_at': created_at,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AnalysisStore(str(tmp_path / 'analysis.db'))
+
+
+def test_record_and_read_back(store):
+    store.record(_result())
+
+    latest = store.latest(1)
+    assert latest['engine_health'] == 80
+    # Рекомендации с запятыми хранятся в JSON и не разбиваются
+    assert latest['recommendations'] == ['Проверьте масло, фильтр и свечи.', 'Замените колодки.']
+    assert latest['issues'][0]['code'] == 'oil.oilPressure<20'
+    assert 'fingerprint' not in latest
+    assert store.latest(2) is None
+
+
+def test_history_is_newest_first_with_id_tiebreak(store):
+    store.record(_result(created_at='2024-06-01T10:00:00', engine_health=1))
+    store.record(_result(created_at='2024-06-03T10:00:00', engine_health=3))
+    store.record(_result(created_at='2024-06-02T10:00:00', engine_health=2))
+    store.record(_result(created_at='2024-06-03T10:00:00', engine_health=4))
+    store.record(_result(vehicle_id=2, created_at='2024-06-05T10:00:00'))
+
+    assert [row['engine_health'] for row in store.history(1)] == [4, 3, 2, 1]
+    assert [row['engine_health'] for row in store.history(1, limit=2)] == [4, 3]
+
+
+def test_heartbeat_moves_created_at_of_unchanged_result(store):
+    first = store.record(_result(), fingerprint='a', heartbeat=True)
+    second = store.record(_result(created_at='2024-06-02T10:00:00'), fingerprint='a', heartbeat=True)
+
+    assert second == first
+    assert [row['created_at'] for row in store.history(1)] == ['2024-06-02T10:00:00']
+
+
+def test_heartbeat_inserts_changed_result(store):
+    store.record(_result(), fingerprint='a', heartbeat=True)
+    store.record(_result(created_at='2024-06-02T10:00:00', engine_health=60), fingerprint='b', heartbeat=True)
+    # Без heartbeat совпадающий результат записывается отдельной строкой
+    store.record(_result(created_at='2024-06-03T10:00:00', engine_health=60), fingerprint='b')
+
+    assert [row['engine_health'] for row in store.history(1)] == [60, 60, 80]
+
+
+def test_legacy_file_gets_new_columns(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    connection = sqlite3.connect(path)
+    connection.execute("""CREATE TABLE vehicle_analysis (id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vehicle_id INTEGER NOT NULL, engine_health INTEGER, oil_health INTEGER, tires_health INTEGER,
+        brakes_health INTEGER, suspension_health INTEGER, battery_health INTEGER, overall_health INTEGER,
+        recommendations TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+    connection.execute("INSERT INTO vehicle_analysis (vehicle_id, recommendations, created_at) "
+                       "VALUES (1, 'Проверьте масло,Замените колодки', '2024-01-01 00:00:00')")
+    connection.commit()
+    connection.close()
+
+    store = AnalysisStore(path)
+    store.record(_result())
+
+    legacy, = [row for row in store.history(1) if row['issues'] is None]
+    # Legacy-рекомендации остаются строкой через запятую
+    assert legacy['recommendations'] == 'Проверьте масло,Замените колодки'
+
+
+def test_execute_query_uses_store(fake_api, store, monkeypatch):
+    from database import Database
+
+    db = Database()
+    monkeypatch.setattr(db, 'analysis_store', store)
+    db.save_analysis_result(_result(created_at='2024-06-01T10:00:00', engine_health=1))
+    db.save_analysis_result(_result(created_at='2024-06-02T10:00:00', engine_health=2))
+
+    rows = db.execute_query(
+        "SELECT * FROM vehicle_analysis WHERE vehicle_id = ? ORDER BY created_at DESC, id DESC LIMIT 1", (1,))
+    assert rows[0]['engine_health'] == 2
+
+    assert db.execute_query("DELETE FROM vehicle_analysis WHERE vehicle_id = ?", (1,), fetch=False) is None
+    assert db.execute_query("SELECT * FROM vehicle_analysis") == []
+    # Таблицы Node.js API в локальном хранилище нет
+    assert db.execute_query("SELECT * FROM telemetry") == []
+
+
+def test_execute_query_without_store(fake_api, monkeypatch):
+    from database import Database
+
+    db = Database()
+    monkeypatch.setattr(db, 'analysis_store', None)
+    assert db.execute_query("SELECT * FROM vehicle_analysis") == []
+    assert db.execute_query("DELETE FROM vehicle_analysis", fetch=False) is None
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+web = pytest.importorskip('aiohttp.web')
+
+import async_api_client
+from async_api_client import AsyncApiClient, AsyncBackedApiClient
+
+
+class FakeNodeApi:
+    """
+    Node.js API на локальном порту: failures[путь] - сколько первых запросов
+    завершаются ответом 503, delays[путь] - задержка ответа в секундах
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        self.failures = Counter()
+        self.delays = {}
+        self.url = None
+
+    async def handle(self, request):
+        path = request.match_info['path']
+        self.hits[path] += 1
+        if self.failures[path] > 0:
+            self.failures[path] -= 1
+            return web.Response(status=503, text='unavailable')
+        await asyncio.sleep(self.delays.get(path, 0))
+        if path.startswith('vehicles/'):
+            vehicle_id = path.split('/', 1)[1]
+            if vehicle_id == 'missing':
+                return web.json_response({'error': 'not found'}, status=404)
+            return web.json_response({'vehicle': {'id': int(vehicle_id)}})
+        return web.json_response({'status': 'success', 'method': request.method})
+
+
+@pytest.fixture(scope='module')
+def node_api():
+    """
+    Запускает FakeNodeApi в цикле событий фонового потока
+    """
+    api = FakeNodeApi()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def start():
+        app = web.Application()
+        app.router.add_route('*', '/api/{path:.*}', api.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f'http://127.0.0.1:{port}/api'
+
+    runner, api.url = asyncio.run_coroutine_threadsafe(start(), loop).result(5)
+    yield api
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+@pytest.fixture
+def api(node_api):
+    node_api.hits.clear()
+    node_api.failures.clear()
+    node_api.delays.clear()
+    return node_api
+
+
+def _client(api, **settings):
+    client = AsyncApiClient()
+    client.api_base_url = api.url
+    client.backoff_base = 0
+    for name, value in settings.items():
+        setattr(client, name, value)
+    return client
+
+
+def _run(client, coroutine):
+    async def scenario():
+        try:
+            return await coroutine
+        finally:
+            await client.close()
+    return asyncio.run(scenario())
+
+
+def test_idempotent_request_is_retried_on_5xx(api):
+    api.failures['retry'] = 2
+    client = _client(api)
+
+    assert _run(client, client.send('GET', 'retry')) == (200, {'status': 'success', 'method': 'GET'})
+    assert api.hits['retry'] == 3
+
+
+def test_retries_stop_after_max_retries(api):
+    api.failures['down'] = 10
+    client = _client(api, max_retries=2)
+
+    assert _run(client, client.send('GET', 'down')) == (503, 'unavailable')
+    assert api.hits['down'] == 3
+
+
+def test_post_is_not_retried_on_5xx(api):
+    api.failures['save'] = 1
+    client = _client(api)
+
+    assert _run(client, client.send('POST', 'save', data={'a': 1})) == (503, 'unavailable')
+    assert api.hits['save'] == 1
+
+
+def test_read_timeout_is_retried_only_for_idempotent_methods(api):
+    api.delays['slow'] = 0.5
+    client = _client(api, read_timeout=0.1, max_retries=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        _run(client, client.send('GET', 'slow'))
+    assert api.hits['slow'] == 2
+
+    client = _client(api, read_timeout=0.1, max_retries=1)
+    with pytest.raises(asyncio.TimeoutError):
+        _run(client, client.send('POST', 'slow'))
+    assert api.hits['slow'] == 3
+
+
+def test_connection_errors_are_retried_for_all_methods(api, monkeypatch):
+    retries = []
+    monkeypatch.setattr(async_api_client.logger, 'warning', retries.append)
+    client = _client(api, max_retries=2)
+    client.api_base_url = 'http://127.0.0.1:1/api'
+
+    with pytest.raises(async_api_client.aiohttp.ClientConnectionError):
+        _run(client, client.send('POST', 'save'))
+    assert len(retries) == 2
+
+
+def test_cancelled_request_raises_and_frees_the_pool(api):
+    api.delays['slow'] = 1
+    client = _client(api, pool_size=1, per_host_limit=1)
+
+    async def scenario():
+        task = asyncio.ensure_future(client.send('GET', 'slow'))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Единственное соединение пула снова доступно
+        return await asyncio.wait_for(client.send('GET', 'fast'), 2)
+
+    assert _run(client, scenario())[0] == 200
+
+
+def test_last_status_is_tracked_per_task(api):
+    client = _client(api)
+
+    async def lookup(vehicle_id):
+        vehicle = await client.get_vehicle_by_id(vehicle_id)
+        await asyncio.sleep(0.05)
+        return vehicle, client.last_status
+
+    async def scenario():
+        return await asyncio.gather(lookup(7), lookup('missing'))
+
+    assert _run(client, scenario()) == [({'id': 7}, 200), (None, 404)]
+
+
+def test_backed_client_routes_sync_calls_through_the_loop(api, monkeypatch):
+    monkeypatch.setenv('NODE_API_URL', api.url)
+    client = AsyncBackedApiClient()
+    try:
+        assert client.get_vehicle_by_id(3) == {'id': 3}
+        assert client.last_status == 200
+        assert client.get_vehicle_by_id('missing') is None
+        assert client.last_status == 404
+        assert api.hits['vehicles/3'] == 1
+    finally:
+        client.close()
+
+
+def test_backed_client_cancels_request_after_budget(api, monkeypatch):
+    api.delays['vehicles/9'] = 1
+    monkeypatch.setenv('NODE_API_URL', api.url)
+    monkeypatch.setenv('API_POOL_SIZE', '1')
+    monkeypatch.setenv('API_ASYNC_PER_HOST_LIMIT', '1')
+    client = AsyncBackedApiClient()
+    client.lookup_budget = 0.2
+    client.hedge_enabled = False
+    try:
+        started = time.monotonic()
+        assert client.get_vehicle_by_id(9) is None
+        assert time.monotonic() - started < 0.8
+        assert client.last_status is None
+
+        # Отмененный запрос вернул единственное соединение в пул
+        assert client.get_vehicle_by_id(4) == {'id': 4}
+    finally:
+        client.close()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from predictive_analyzer import PredictiveAnalyzer
+
+
+def _by_vehicle(results):
+    # Время создания результата различается между запусками
+    return {result['vehicle_id']: {key: value for key, value in result.items() if key != 'created_at'}
+            for result in results}
+
+
+def test_batch_matches_serial(fake_api):
+    analyzer = PredictiveAnalyzer()
+
+    analyzer.analysis_mode = 'serial'
+    serial = _by_vehicle(analyzer.run_analysis())
+    analyzer.analysis_mode = 'batch'
+    batch = _by_vehicle(analyzer.run_analysis())
+
+    # Автомобили без обязательных полей телеметрии не анализируются ни в одном режиме
+    assert len(serial) > len(fake_api.fleet) // 2
+    assert batch.keys() == serial.keys()
+    for vehicle_id, expected in serial.items():
+        assert batch[vehicle_id] == expected, f"vehicle {vehicle_id}"
+
+
+def test_batch_recommendations_are_shared_lists(fake_api):
+    analyzer = PredictiveAnalyzer()
+    analyzer.analysis_mode = 'batch'
+    results = analyzer.run_analysis()
+
+    lists = analyzer.rules.recommendation_table().lists
+    for result in results:
+        assert any(result['recommendations'] is shared for shared in lists)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from api_client import ApiClient
+from conftest import FakeApiClient, make_fleet
+
+
+class BulkRoutes:
+    """
+    Пакетные маршруты Node.js API поверх автопарка FakeApiClient;
+    available=False имитирует отсутствующий маршрут (404 или ошибку)
+    """
+
+    def __init__(self, fake):
+        self.fake = fake
+        self.available = True
+        self.posts = []
+
+    def __call__(self, method, endpoint, data=None, params=None, **kwargs):
+        self.posts.append((endpoint, list(data['vehicle_ids'])))
+        if not self.available:
+            return None
+        if endpoint == 'telemetry/vehicles-data':
+            return {'data': {str(vehicle_id): self.fake.fleet[int(vehicle_id)][1][:data['limit']]
+                             for vehicle_id in data['vehicle_ids'] if self.fake.fleet[int(vehicle_id)][1]}}
+        if endpoint == 'works/vehicles':
+            return {'works': {str(vehicle_id): self.fake.fleet[int(vehicle_id)][2]
+                              for vehicle_id in data['vehicle_ids']}}
+        return None
+
+
+@pytest.fixture
+def fake():
+    return FakeApiClient(make_fleet(10))
+
+
+@pytest.fixture
+def client(fake, monkeypatch):
+    """
+    ApiClient, у которого пакетные маршруты обслуживает BulkRoutes,
+    а одиночные запросы - FakeApiClient
+    """
+    client = ApiClient()
+    client.bulk_chunk_size = 4
+    client.bulk_retry_interval = 600
+    client.routes = BulkRoutes(fake)
+    monkeypatch.setattr(client, '_make_request', client.routes)
+    monkeypatch.setattr(client, 'get_telemetry_data', fake.get_telemetry_data)
+    monkeypatch.setattr(client, 'get_vehicle_works', fake.get_vehicle_works)
+    return client
+
+
+def _snake_case(records):
+    return [{''.join('_' + c.lower() if c.isupper() else c for c in key).lstrip('_'): value
+             for key, value in record.items()} for record in records]
+
+
+def test_bulk_route_fetches_chunks(client, fake):
+    vehicle_ids = list(fake.fleet)
+    telemetry = client.get_telemetry_data_bulk(vehicle_ids)
+
+    assert [ids for _, ids in client.routes.posts] == [vehicle_ids[0:4], vehicle_ids[4:8], vehicle_ids[8:10]]
+    assert fake.calls['get_telemetry_data'] == 0
+    # Ключи ответа приводятся к исходным ID, автомобили без данных получают пустой список
+    assert set(telemetry) == set(vehicle_ids)
+    for vehicle_id in vehicle_ids:
+        assert list(telemetry[vehicle_id]) == _snake_case(fake.fleet[vehicle_id][1][:10])
+
+
+def test_duplicate_ids_are_fetched_once(client, fake):
+    works = client.get_vehicle_works_bulk([1, 2, 1, 2, 3])
+
+    assert client.routes.posts == [('works/vehicles', [1, 2, 3])]
+    assert works == {vehicle_id: fake.fleet[vehicle_id][2] for vehicle_id in (1, 2, 3)}
+
+
+def test_unavailable_route_falls_back_to_single_requests(client, fake):
+    client.routes.available = False
+    vehicle_ids = list(fake.fleet)
+
+    works = client.get_vehicle_works_bulk(vehicle_ids)
+
+    assert works == {vehicle_id: fake.fleet[vehicle_id][2] for vehicle_id in vehicle_ids}
+    assert fake.calls['get_vehicle_works'] == len(vehicle_ids)
+    # После первой ошибки пакетный маршрут не используется до истечения bulk_retry_interval
+    assert len(client.routes.posts) == 1
+
+    client.get_vehicle_works_bulk(vehicle_ids)
+    assert len(client.routes.posts) == 1
+
+
+def test_unavailable_route_is_retried_after_interval(client, fake):
+    client.routes.available = False
+    client.bulk_retry_interval = 0
+    client.get_vehicle_works_bulk([1, 2])
+
+    client.routes.available = True
+    fetched = fake.calls['get_vehicle_works']
+    client.get_vehicle_works_bulk([1, 2])
+
+    assert len(client.routes.posts) == 2
+    assert fake.calls['get_vehicle_works'] == fetched
+
+
+def test_malformed_response_falls_back(client, fake, monkeypatch):
+    monkeypatch.setattr(client, '_make_request', lambda *args, **kwargs: {'data': []})
+
+    telemetry = client.get_telemetry_data_bulk([1, 2, 3])
+
+    assert telemetry == {vehicle_id: fake.fleet[vehicle_id][1][:10] for vehicle_id in (1, 2, 3)}
+    assert fake.calls['get_telemetry_data'] == 3
+
+
+def test_database_bulk_errors_return_empty(fake_api, monkeypatch):
+    from database import Database
+
+    def failing(*args, **kwargs):
+        raise ConnectionError("API unavailable")
+
+    monkeypatch.setattr(fake_api, 'get_telemetry_data_bulk', failing)
+    monkeypatch.setattr(fake_api, 'get_vehicle_works_bulk', failing)
+
+    assert Database().get_telemetry_data_bulk([1, 2]) == {}
+    assert Database().get_vehicle_works_bulk([1, 2]) == {}
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from dtc_codes import NO_CODES, DtcCodes, parse_dtc_codes, record_dtc_codes
+
+
+@pytest.mark.parametrize('value, codes', [
+    # JSON
+    ('["P0100", "C0035"]', ('P0100', 'C0035')),
+    ('[]', ()),
+    ('null', ()),
+    # Литерал Python
+    ("['P0100', 'C0035']", ('P0100', 'C0035')),
+    ("('p0300',)", ('P0300',)),
+    ('None', ()),
+    # Коды через запятую или пробел
+    ('P0100,P0101', ('P0100', 'P0101')),
+    ('P0100, C0035; B1000 U0001', ('P0100', 'C0035', 'B1000', 'U0001')),
+    ("'C12'", ('C12',)),
+    ('', ()),
+    # Уже разобранные значения
+    (['P0300', ' c0040 '], ('P0300', 'C0040')),
+    (None, ()),
+])
+def test_parse_formats(value, codes):
+    assert parse_dtc_codes(value).codes == codes
+
+
+def test_non_string_codes_are_kept():
+    assert parse_dtc_codes([300, 'P0100']).codes == ('300', 'P0100')
+    assert parse_dtc_codes('[300, "P0100"]').codes == ('300', 'P0100')
+
+
+@pytest.mark.parametrize('value', ['[1, 2', '["P0100"] + []', '("P0100"', '[__import__("os")]'])
+def test_invalid_strings_raise_value_error(value):
+    with pytest.raises(ValueError):
+        parse_dtc_codes(value)
+
+
+def test_unsupported_type_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_dtc_codes({'code': 'P0100'})
+
+
+def test_families():
+    codes = parse_dtc_codes("['P0100', 'C0035', 'C0040', 'U0001']")
+    assert codes.family('C') == ('C0035', 'C0040')
+    assert codes.family('P') == ('P0100',)
+    assert codes.family('B') == ()
+    assert list(codes) == ['P0100', 'C0035', 'C0040', 'U0001']
+    assert len(codes) == 4
+
+
+def test_parsed_codes_are_shared():
+    assert parse_dtc_codes('[]') is NO_CODES
+    assert parse_dtc_codes('P0100,C0035') is parse_dtc_codes('P0100,C0035')
+    parsed = DtcCodes(['P0100'])
+    assert parse_dtc_codes(parsed) is parsed
+
+
+def test_record_is_not_modified():
+    record = {'dtcCodes': "['P0100']"}
+    assert record_dtc_codes(record).codes == ('P0100',)
+    assert record == {'dtcCodes': "['P0100']"}
+    assert record_dtc_codes({}) is NO_CODES
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+
+import numpy as np
+import pytest
+
+from health_rules import RecommendationTable, get_rule_engine
+
+SYSTEMS = ('engine', 'oil', 'tires', 'brakes', 'suspension', 'battery')
+
+# Значения на границах полос таблицы и рядом с ними
+BOUNDARY_SCORES = (0, 49, 50, 59, 60, 64, 65, 69, 70, 74, 75, 79, 80, 84, 85, 89, 90, 100)
+
+
+def _legacy_recommendations(health_ratings):
+    # Цепочка условий PredictiveAnalyzer._generate_recommendations до перехода на таблицу
+    recommendations = []
+
+    if health_ratings['engine'] < 50:
+        recommendations.append("Требуется срочная диагностика и ремонт двигателя. Возможны серьезные неисправности.")
+    elif health_ratings['engine'] < 70:
+        recommendations.append("Рекомендуется диагностика двигателя. Обнаружены признаки износа или неисправностей.")
+    elif health_ratings['engine'] < 85:
+        recommendations.append("Рекомендуется проверка двигателя при следующем ТО. Есть признаки начального износа.")
+
+    if health_ratings['oil'] < 50:
+        recommendations.append("Требуется немедленная замена масла и масляного фильтра. Критический уровень износа масла.")
+    elif health_ratings['oil'] < 65:
+        recommendations.append("Срочно замените масло и масляный фильтр. Масло значительно изношено.")
+    elif health_ratings['oil'] < 80:
+        recommendations.append("Рекомендуется замена масла в ближайшее время. Свойства масла ухудшаются.")
+
+    if health_ratings['tires'] < 50:
+        recommendations.append("Требуется срочная замена шин. Критический износ или превышен срок службы.")
+    elif health_ratings['tires'] < 65:
+        recommendations.append("Рекомендуется проверка и, возможно, замена шин. Значительный износ.")
+    elif health_ratings['tires'] < 80:
+        recommendations.append("Проверьте давление в шинах и их износ при следующем ТО.")
+
+    if health_ratings['brakes'] < 50:
+        recommendations.append("Требуется срочное обслуживание тормозной системы. Критический износ компонентов.")
+    elif health_ratings['brakes'] < 70:
+        recommendations.append("Рекомендуется проверка тормозной системы. Признаки значительного износа колодок или дисков.")
+    elif health_ratings['brakes'] < 85:
+        recommendations.append("Проверьте состояние тормозных колодок и уровень тормозной жидкости при следующем ТО.")
+
+    if health_ratings['suspension'] < 60:
+        recommendations.append("Требуется диагностика и ремонт подвески. Повышенный износ или повреждения компонентов.")
+    elif health_ratings['suspension'] < 75:
+        recommendations.append("Рекомендуется проверка подвески. Возможны неисправности амортизаторов или других компонентов.")
+    elif health_ratings['suspension'] < 90:
+        recommendations.append("Проверьте состояние подвески при следующем ТО.")
+
+    if health_ratings['battery'] < 60:
+        recommendations.append("Требуется замена аккумулятора. Критическое снижение емкости или напряжения.")
+    elif health_ratings['battery'] < 75:
+        recommendations.append("Рекомендуется проверка и, возможно, замена аккумулятора в ближайшее время.")
+    elif health_ratings['battery'] < 85:
+        recommendations.append("Проверьте заряд и состояние аккумулятора при следующем ТО.")
+
+    overall_health = sum(health_ratings.values()) / len(health_ratings)
+
+    if overall_health < 60:
+        recommendations.append("Автомобиль требует комплексного технического обслуживания. Рекомендуется посещение сервисного центра в ближайшее время.")
+    elif overall_health < 75:
+        recommendations.append("Общее состояние автомобиля удовлетворительное. Рекомендуется плановое техническое обслуживание.")
+    elif overall_health < 90:
+        recommendations.append("Общее состояние автомобиля хорошее. Рекомендуется придерживаться регулярного графика обслуживания.")
+    else:
+        recommendations.append("Автомобиль в отличном техническом состоянии. Продолжайте регулярное обслуживание.")
+
+    recommendations.append("Для оптимального отслеживания состояния автомобиля рекомендуется регулярно подключаться к системе мониторинга.")
+
+    return recommendations
+
+
+def _recommend(engine, ratings):
+    return engine.recommend(dict(ratings, overall=sum(ratings.values()) / len(ratings)))
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return get_rule_engine()
+
+
+@pytest.mark.parametrize('system', SYSTEMS)
+def test_table_matches_if_chain_on_band_boundaries(engine, system):
+    for score in BOUNDARY_SCORES:
+        for other in (40, 72, 95):
+            ratings = dict.fromkeys(SYSTEMS, other)
+            ratings[system] = score
+            assert list(_recommend(engine, ratings)) == _legacy_recommendations(ratings), ratings
+
+
+def test_table_matches_if_chain_on_random_ratings(engine):
+    rng = random.Random(12)
+    for _ in range(2000):
+        ratings = {system: rng.choice([rng.randint(0, 100), round(rng.uniform(0, 100), 1)]) for system in SYSTEMS}
+        assert list(_recommend(engine, ratings)) == _legacy_recommendations(ratings), ratings
+
+
+def test_equal_ratings_share_one_list(engine):
+    ratings = dict.fromkeys(SYSTEMS, 66)
+    first = _recommend(engine, ratings)
+    assert isinstance(first, tuple)
+    assert _recommend(engine, dict(ratings, engine=60)) is first
+
+
+def test_batch_list_ids_match_lookup(engine):
+    table = engine.recommendation_table()
+    rng = random.Random(5)
+    rows = []
+    for _ in range(500):
+        ratings = {system: rng.randint(0, 100) for system in SYSTEMS}
+        ratings['overall'] = sum(ratings.values()) / len(SYSTEMS)
+        rows.append(ratings)
+
+    columns = {system: np.array([row[system] for row in rows]) for system in table.systems}
+    ids = table.list_ids(columns)
+
+    for row, list_id in zip(rows, ids):
+        assert table.lists[list_id] is table.lookup(row)
+
+
+def test_missing_system_is_skipped():
+    table = RecommendationTable('test', [
+        ('engine', [(50, 'engine low'), (None, 'engine ok')]),
+        ('oil', [(50, 'oil low')]),
+    ], ['always'])
+
+    assert table.lookup({'engine': 10, 'oil': 10}) == ('engine low', 'oil low', 'always')
+    assert table.lookup({'engine': 90, 'oil': 90}) == ('engine ok', 'always')
+    assert table.lookup({'oil': 10}) == ('oil low', 'always')
+    assert table.lookup({'oil': 10}) is table.lookup({'oil': 10})
+
+
+@pytest.mark.parametrize('bands', [
+    [(70, 'a'), (50, 'b')],
+    [(None, 'a'), (50, 'b')],
+])
+def test_invalid_bands_are_rejected(bands):
+    with pytest.raises(ValueError):
+        RecommendationTable('test', [('engine', bands)], [])
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import watermarks
+from watermarks import WatermarkStore, telemetry_marker, works_fingerprint
+from predictive_analyzer import PredictiveAnalyzer
+
+
+@pytest.fixture
+def analyzer(fake_api, monkeypatch):
+    """
+    Анализатор в инкрементальном режиме; analyzed - ID автомобилей, проанализированных заново
+    """
+    analyzer = PredictiveAnalyzer()
+    analyzer.analysis_mode = 'serial'
+    analyzer.incremental = True
+    analyzer.analyzed = []
+    analyze_vehicle = analyzer._analyze_vehicle
+
+    def recording(vehicle, *args):
+        analyzer.analyzed.append(vehicle.get('id'))
+        return analyze_vehicle(vehicle, *args)
+
+    monkeypatch.setattr(analyzer, '_analyze_vehicle', recording)
+    return analyzer
+
+
+def _add_telemetry(fake_api, vehicle_id):
+    records = fake_api.fleet[vehicle_id][1]
+    newer = dict(records[0]) if records else {'engineTemp': 90, 'rpm': 2000, 'oilPressure': 30}
+    newer['timestamp'] = '2099-01-01 00:00:00'
+    records.insert(0, newer)
+
+
+def test_telemetry_marker_uses_newest_record():
+    records = [{'id': 7, 'created_at': '2024-02-01'}, {'id': 6, 'created_at': '2024-01-01'}]
+    assert telemetry_marker(records) == (7, '2024-02-01')
+    assert telemetry_marker([{'timestamp': '2024-03-01 10:00:00'}]) == (None, '2024-03-01 10:00:00')
+    assert telemetry_marker([]) is None
+
+
+def test_works_fingerprint_changes_with_history():
+    works = [{'id': 1, 'date': '2024-01-01', 'description': 'Oil change'}]
+    assert works_fingerprint(works) == works_fingerprint([dict(works[0])])
+    assert works_fingerprint(works) != works_fingerprint(works + [{'id': 2, 'date': '2024-02-01'}])
+    assert works_fingerprint(works) != works_fingerprint([dict(works[0], description='Brake pads')])
+    assert works_fingerprint(None) == works_fingerprint([])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_watermark_expires_after_max_age(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(watermarks, 'time', clock)
+    store = WatermarkStore(max_age=60)
+    store.record(1, [{'id': 1}], [], {'vehicle_id': 1})
+
+    clock.now += 60
+    assert store.get(1)['result'] == {'vehicle_id': 1}
+    assert store.get('1') is not None
+    clock.now += 1
+    assert store.get(1) is None
+
+
+def test_unchanged_vehicles_reuse_previous_results(analyzer, fake_api):
+    first = {result['vehicle_id']: result for result in analyzer.run_analysis()}
+    assert sorted(analyzer.analyzed) == sorted(fake_api.fleet)
+
+    analyzer.analyzed.clear()
+    saved = len(fake_api.saved)
+    second = {result['vehicle_id']: result for result in analyzer.run_analysis()}
+
+    # Заново анализируются только автомобили, анализ которых не удался
+    assert set(analyzer.analyzed) == set(fake_api.fleet) - set(first)
+    assert second.keys() == first.keys()
+    assert all(second[vehicle_id] is first[vehicle_id] for vehicle_id in first)
+    assert len(fake_api.saved) == saved
+
+
+def test_new_telemetry_or_works_trigger_reanalysis(analyzer, fake_api):
+    first = {result['vehicle_id']: result for result in analyzer.run_analysis()}
+    telemetry_changed, works_changed = sorted(first)[:2]
+    _add_telemetry(fake_api, telemetry_changed)
+    fake_api.fleet[works_changed][2].append({'id': 99, 'description': 'Oil change', 'date': '2024-01-01'})
+
+    analyzer.analyzed.clear()
+    second = {result['vehicle_id']: result for result in analyzer.run_analysis()}
+
+    failed = set(fake_api.fleet) - set(first)
+    assert set(analyzer.analyzed) == {telemetry_changed, works_changed} | failed
+    assert second[telemetry_changed] is not first[telemetry_changed]
+    assert second[works_changed] is not first[works_changed]
+
+
+def test_expired_watermarks_reanalyze_everything(analyzer, fake_api):
+    analyzer.run_analysis()
+    analyzer.watermarks.max_age = -1
+
+    analyzer.analyzed.clear()
+    analyzer.run_analysis()
+
+    assert sorted(analyzer.analyzed) == sorted(fake_api.fleet)
+
+
+def test_probe_uses_bulk_fetches_and_reuses_data(analyzer, fake_api):
+    first = analyzer.run_analysis()
+    _add_telemetry(fake_api, first[0]['vehicle_id'])
+    failed = set(fake_api.fleet) - {result['vehicle_id'] for result in first}
+
+    fake_api.calls.clear()
+    analyzer.run_analysis()
+
+    # Автомобили с отметками проверяются одним пакетным запросом на каждый вид данных,
+    # изменившийся автомобиль анализируется по тем же данным без повторной загрузки
+    assert fake_api.calls['get_telemetry_data_bulk'] == 1
+    assert fake_api.calls['get_vehicle_works_bulk'] == 1
+    assert fake_api.calls['get_telemetry_data'] == len(failed)
+    assert fake_api.calls['get_vehicle_works'] == len(failed)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import lookup_cache
+from lookup_cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(lookup_cache, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def db(fake_api, clock, monkeypatch):
+    """
+    Database с пустым кешем автомобилей на поддельных часах
+    """
+    from database import Database
+
+    database = Database()
+    monkeypatch.setattr(database, '_vehicle_cache', TTLCache(1000, ttl=300, negative_ttl=60))
+    return database
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(10, ttl=30)
+    cache.put('a', 1)
+
+    clock.now += 29.9
+    assert cache.get('a') == 1
+    clock.now += 0.1
+    assert cache.get('a') is MISSING
+    # Устаревшая запись доступна через get_stale до вытеснения
+    assert cache.get_stale('a') == 1
+    assert cache.get_stale('b') is MISSING
+
+
+def test_negative_entries_use_negative_ttl(clock):
+    cache = TTLCache(10, ttl=300, negative_ttl=10)
+    cache.put('missing', None)
+    cache.put('present', {'id': 1})
+
+    assert cache.get('missing') is None
+    clock.now += 10
+    assert cache.get('missing') is MISSING
+    assert cache.get('present') == {'id': 1}
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(2, ttl=30)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('b') is MISSING
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_zero_ttl_disables_caching(clock):
+    cache = TTLCache(10, ttl=0, negative_ttl=0)
+    cache.put('a', 1)
+    cache.put('b', None)
+    assert cache.get('a') is MISSING
+    assert cache.get('b') is MISSING
+
+
+def test_invalidate_and_stats(clock):
+    cache = TTLCache(10, ttl=30)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.invalidate('a')
+    assert cache.get('a') is MISSING
+    assert cache.get('b') == 2
+    cache.invalidate()
+    assert cache.get('b') is MISSING
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+    assert stats['hit_rate'] == pytest.approx(1 / 3, abs=1e-4)
+
+
+def test_vehicle_lookups_are_cached(db, fake_api, clock):
+    vehicle = db.get_vehicle_by_id(3)
+    assert db.get_vehicle_by_id('3') == vehicle
+    assert fake_api.calls['get_vehicle_by_id'] == 1
+
+    # Автомобиль кешируется и по VIN (без учета регистра)
+    assert db.get_vehicle_by_vin(vehicle['vin'].lower()) == vehicle
+    assert fake_api.calls['get_vehicle_by_vin'] == 0
+
+    clock.now += 301
+    db.get_vehicle_by_id(3)
+    assert fake_api.calls['get_vehicle_by_id'] == 2
+
+
+def test_cached_vehicles_are_copies(db, fake_api):
+    db.get_vehicle_by_id(3)['vin'] = 'CHANGED'
+    assert db.get_vehicle_by_id(3)['vin'] == 'VIN000003'
+
+    vehicles = db.get_all_vehicles()
+    vehicles[0]['vin'] = 'CHANGED'
+    assert db.get_all_vehicles()[0]['vin'] == 'VIN000001'
+    assert fake_api.calls['get_all_vehicles'] == 1
+
+
+def test_fleet_list_fills_id_and_vin_entries(db, fake_api):
+    db.get_all_vehicles()
+
+    assert db.get_vehicle_by_id(5)['vin'] == 'VIN000005'
+    assert db.get_vehicle_by_vin('VIN000007')['id'] == 7
+    assert fake_api.calls['get_vehicle_by_id'] == 0
+    assert fake_api.calls['get_vehicle_by_vin'] == 0
+
+
+def test_not_found_is_cached_with_negative_ttl(db, fake_api, clock):
+    fake_api.last_status = 404
+    assert db.get_vehicle_by_vin('UNKNOWN') is None
+    assert db.get_vehicle_by_vin('UNKNOWN') is None
+    assert fake_api.calls['get_vehicle_by_vin'] == 1
+
+    clock.now += 61
+    db.get_vehicle_by_vin('UNKNOWN')
+    assert fake_api.calls['get_vehicle_by_vin'] == 2
+
+
+def test_api_errors_are_not_cached(db, fake_api):
+    fake_api.last_status = None
+    assert db.get_vehicle_by_id(999) is None
+    assert db.get_vehicle_by_id(999) is None
+    assert fake_api.calls['get_vehicle_by_id'] == 2
+
+
+def test_invalidate_vehicle_drops_id_vin_and_list(db, fake_api):
+    db.get_all_vehicles()
+    db.invalidate_vehicle_cache(vehicle_id=4)
+
+    db.get_vehicle_by_id(4)
+    db.get_vehicle_by_vin('VIN000004')
+    db.get_vehicle_by_id(5)
+    db.get_all_vehicles()
+    assert fake_api.calls['get_vehicle_by_id'] == 1
+    assert fake_api.calls['get_vehicle_by_vin'] == 0
+    assert fake_api.calls['get_all_vehicles'] == 2
+
+
+def test_stale_vehicle_is_served_while_api_is_down(db, fake_api, clock):
+    vehicles = db.get_all_vehicles()
+    clock.now += 301
+    # API недоступен: запросы не возвращают данных и кода ответа
+    fake_api.fleet.clear()
+    fake_api.last_status = None
+
+    assert db.get_vehicle_by_id(3) == vehicles[2]
+    assert db.get_vehicle_by_vin('VIN000003') == vehicles[2]
+    assert db.get_all_vehicles() == vehicles
+
+
+def test_confirmed_not_found_is_not_served_stale(db, fake_api, clock):
+    db.get_vehicle_by_id(3)
+    clock.now += 301
+    del fake_api.fleet[3]
+    fake_api.last_status = 404
+
+    assert db.get_vehicle_by_id(3) is None
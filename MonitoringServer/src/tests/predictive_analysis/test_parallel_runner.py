@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import parallel_runner
+from parallel_runner import ParallelAnalysisRunner
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    """
+    ParallelAnalysisRunner с пулом потоков вместо процессов: hung - ID автомобилей,
+    анализ которых зависает до окончания теста
+    """
+    runner = ParallelAnalysisRunner()
+    runner.workers = 2
+    runner.chunk_size = 1
+    runner.vehicle_timeout = 0.3
+    runner.hung = set()
+    release = threading.Event()
+
+    def analyze_chunk(vehicles, prefetched):
+        if any(vehicle['id'] in runner.hung for vehicle in vehicles):
+            release.wait(5)
+        return [({'vehicle_id': vehicle['id']}, None, None) for vehicle in vehicles]
+
+    def get_executor():
+        if runner._executor is None:
+            runner._executor = ThreadPoolExecutor(runner.workers)
+        return runner._executor
+
+    monkeypatch.setattr(parallel_runner, '_analyze_chunk', analyze_chunk)
+    monkeypatch.setattr(runner, '_get_executor', get_executor)
+    yield runner
+    release.set()
+
+
+def test_deadlines_count_from_submission_per_worker_lane():
+    runner = ParallelAnalysisRunner()
+    runner.workers = 2
+    runner.vehicle_timeout = 10
+    chunks = [[1, 2], [3, 4], [5, 6], [7]]
+
+    # Третья и четвертая пачки ждут освобождения процессов после первой и второй
+    assert runner._chunk_deadlines(chunks, 100.0) == [120.0, 120.0, 140.0, 130.0]
+
+
+def test_hung_chunks_share_the_wait(runner):
+    runner.hung = {1, 2}
+    vehicles = [{'id': vehicle_id} for vehicle_id in (1, 2)]
+
+    started = time.monotonic()
+    results = runner.run(vehicles)
+
+    # Ожидание первой пачки не продлевает срок второй
+    assert time.monotonic() - started < 0.5
+    assert results == []
+    assert runner.failures == [(1, 'timeout'), (2, 'timeout')]
+
+
+def test_queued_chunks_get_budget_of_their_wave(runner):
+    vehicles = [{'id': vehicle_id} for vehicle_id in range(1, 7)]
+
+    results = runner.run(vehicles)
+
+    assert [result['vehicle_id'] for result in results] == list(range(1, 7))
+    assert runner.failures == []
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import resilience
+from resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, EndpointHealth, endpoint_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, 'time', fake)
+    return fake
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    # Успех сбрасывает счетчик ошибок подряд
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_open_rejects_until_recovery_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+    _open(breaker)
+
+    assert not breaker.allow()
+    clock.now += 9.9
+    assert not breaker.allow()
+    assert breaker.rejected == 2
+    assert breaker.state == OPEN
+
+
+def test_half_open_allows_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+    _open(breaker)
+    clock.now += 10
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Пока пробный запрос выполняется, остальные отклоняются
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+    _open(breaker)
+    clock.now += 10
+    assert breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=10)
+    _open(breaker)
+    clock.now += 10
+    assert breaker.allow()
+
+    # Одной ошибки пробного запроса достаточно
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    clock.now += 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+@pytest.mark.parametrize('method, endpoint, key', [
+    ('get', 'vehicles/15', 'GET vehicles/{id}'),
+    ('GET', 'vehicles/search/by-vin', 'GET vehicles/search/by-vin'),
+    ('post', 'analysis/vehicle/7/results', 'POST analysis/vehicle/{id}/results'),
+    ('GET', '42', 'GET {id}'),
+    ('GET', 'vehicles/3f2a9c1e-7b4d-4e2a-9c1e-0123456789ab', 'GET vehicles/{id}'),
+    ('POST', 'analysis/vehicle/3F2A9C1E-7B4D-4E2A-9C1E-0123456789AB/results/heartbeat',
+     'POST analysis/vehicle/{id}/results/heartbeat'),
+    ('GET', 'works/vehicle/507f1f77bcf86cd799439011', 'GET works/vehicle/{id}'),
+    ('POST', 'analysis/results/heartbeat/batch', 'POST analysis/results/heartbeat/batch'),
+    ('GET', 'telemetry/vehicles-data', 'GET telemetry/vehicles-data'),
+    ('GET', 'vehicles/abc123', 'GET vehicles/abc123'),
+])
+def test_endpoint_key(method, endpoint, key):
+    assert endpoint_key(method, endpoint) == key
+
+
+def test_endpoint_health_keeps_one_breaker_per_key(clock):
+    health = EndpointHealth(failure_threshold=1, recovery_timeout=10, min_samples=2)
+    key = endpoint_key('GET', 'vehicles/1')
+    assert health.breaker(key) is health.breaker(endpoint_key('GET', 'vehicles/2'))
+
+    health.breaker(key).record_failure()
+    health.latency(key).record(0.1)
+    health.latency(key).record(0.3)
+
+    stats = health.stats()[key]
+    assert stats['state'] == OPEN
+    assert stats['failures'] == 1
+    assert stats['p50'] == 0.3
+    assert health.breaker(endpoint_key('GET', 'vehicles')).state == CLOSED
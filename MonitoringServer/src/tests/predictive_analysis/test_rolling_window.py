@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+
+import numpy as np
+import pytest
+
+from rolling_window import RollingWindow, TelemetryAggregates
+
+
+def test_size_eviction_updates_min_max_mean():
+    window = RollingWindow(size=3)
+    for value in [5, 1, 9, 4, 7]:
+        window.push(value)
+
+    assert len(window) == 3
+    assert window.min == 4
+    assert window.max == 9
+    assert window.mean == pytest.approx((9 + 4 + 7) / 3)
+
+    window.push(6)
+    assert window.min == 4
+    assert window.max == 7
+
+
+def test_age_eviction():
+    window = RollingWindow(max_age=10)
+    for time, value in [(0, 100), (4, 1), (8, 2), (15, 3)]:
+        window.push(value, time)
+
+    # Записи старше 10 секунд относительно последней (t=0, t=4) вытеснены
+    assert len(window) == 2
+    assert window.max == 3
+    assert window.min == 2
+
+
+def test_non_numeric_values_are_skipped():
+    window = RollingWindow(size=5)
+    for value in [None, 'high', True, float('nan'), 3, {'fl': 24}]:
+        window.push(value)
+
+    assert len(window) == 1
+    assert window.min == window.max == 3
+
+
+def test_empty_window():
+    window = RollingWindow(size=3)
+    assert window.min is None
+    assert window.max is None
+    assert window.mean is None
+    assert window.p95 is None
+    assert window.value('time_above', 10) is None
+
+
+def test_time_above_with_timestamps():
+    window = RollingWindow(size=10, thresholds=[100])
+    for time, value in [(0, 90), (10, 110), (25, 120), (30, 95), (50, 105)]:
+        window.push(value, time)
+
+    # Интервал после записи относится к ее значению: 110 (15 с) + 120 (5 с)
+    assert window.time_above(100) == 20
+
+
+def test_time_above_without_timestamps_counts_records():
+    window = RollingWindow(size=3, thresholds=[100])
+    for value in [110, 120, 90, 130]:
+        window.push(value)
+
+    assert window.time_above(100) == 2
+
+
+def test_time_above_after_eviction_matches_new_window():
+    rng = random.Random(7)
+    samples = [(index * rng.randint(1, 20), rng.uniform(80, 120)) for index in range(200)]
+    tracked = RollingWindow(size=15, thresholds=[100])
+    for time, value in samples:
+        tracked.push(value, time)
+
+    rebuilt = RollingWindow(size=15)
+    for time, value in samples[-15:]:
+        rebuilt.push(value, time)
+
+    assert tracked.time_above(100) == pytest.approx(rebuilt.time_above(100))
+    assert tracked.min == rebuilt.min
+    assert tracked.max == rebuilt.max
+
+
+def test_percentile_matches_numpy_with_and_without_sorted_state():
+    rng = random.Random(3)
+    values = [rng.uniform(0, 100) for _ in range(300)]
+    tracked = RollingWindow(size=40)
+    on_demand = RollingWindow(size=40, percentiles=False)
+    for value in values:
+        tracked.push(value)
+        on_demand.push(value)
+
+    expected = np.percentile(values[-40:], 95)
+    assert tracked.p95 == pytest.approx(expected)
+    assert on_demand.p95 == pytest.approx(expected)
+
+
+def test_unknown_aggregate():
+    window = RollingWindow(size=3)
+    window.push(1)
+    with pytest.raises(ValueError):
+        window.value('median')
+
+
+def test_aggregates_from_records_are_chronological():
+    # Записи API идут от новых к старым
+    records = [{'timestamp': f'2024-01-01 00:00:{second:02d}', 'engineTemp': value}
+               for second, value in [(30, 130), (20, 90), (10, 80), (0, 70)]]
+    windows = {'recent': {'size': 2}}
+    specs = {('engineTemp', 'recent'): {('min', None), ('max', None), ('time_above', 100)}}
+
+    aggregates = TelemetryAggregates.from_records(records, windows, specs)
+
+    assert aggregates.value('engineTemp', 'min', 'recent') == 90
+    assert aggregates.value('engineTemp', 'max', 'recent') == 130
+    assert aggregates.value('engineTemp', 'time_above', 'recent', 100) == 0
+    assert aggregates.value('rpm', 'max', 'recent') is None
+
+
+def test_aggregates_reject_unknown_window():
+    with pytest.raises(ValueError):
+        TelemetryAggregates({'recent': {'size': 5}}, {('rpm', 'daily'): {('max', None)}})
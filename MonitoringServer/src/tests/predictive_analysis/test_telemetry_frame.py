@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from record_mapping import snake_case
+from telemetry_frame import TelemetryFrame, TelemetryRow
+
+# Записи от новых к старым, как в ответе API
+RECORDS = [
+    {'timestamp': '2024-01-01 00:00:30', 'engineTemp': 95, 'rpm': 2100.5, 'dtcCodes': "['P0100']"},
+    {'timestamp': '2024-01-01 00:00:20', 'engineTemp': None, 'rpm': 1800, 'dtcCodes': '[]'},
+    {'timestamp': '2024-01-01 00:00:10', 'engineTemp': 90.0, 'tirePressure': {'fl': 24, 'fr': 31}},
+    {'timestamp': '2024-01-01 00:00:00', 'engineTemp': 2 ** 60, 'rpm': 'n/a', 'dtcCodes': ['P0300'],
+     'suspensionComplaints': ['стук']},
+]
+
+
+@pytest.fixture
+def frame():
+    return TelemetryFrame.from_records(RECORDS)
+
+
+def test_round_trip_keeps_values_and_types(frame):
+    restored = frame.to_records()
+
+    assert restored == RECORDS
+    for original, record in zip(RECORDS, restored):
+        for key, value in original.items():
+            assert type(record[key]) is type(value), key
+
+
+def test_rows_behave_like_dicts(frame):
+    row = frame[2]
+    assert isinstance(row, TelemetryRow)
+    assert row['engineTemp'] == 90.0
+    assert row.get('rpm', 'missing') == 'missing'
+    assert 'rpm' not in row
+    assert 'tirePressure' in row
+    with pytest.raises(KeyError):
+        row['rpm']
+    assert dict(row) == RECORDS[2]
+    assert frame[-1] is frame[3]
+    with pytest.raises(IndexError):
+        frame[4]
+
+
+def test_private_keys_are_not_stored():
+    frame = TelemetryFrame.from_records([{'rpm': 1, '_dtc': 'cached'}])
+    assert frame.fields == ('rpm',)
+    assert frame.to_records() == [{'rpm': 1}]
+
+
+def test_key_conversion():
+    frame = TelemetryFrame.from_records([{'engineTemp': 90, 'vehicleId': 1}], convert=snake_case)
+    assert frame.to_records() == [{'engine_temp': 90, 'vehicle_id': 1}]
+
+
+@pytest.mark.parametrize('key', [slice(1, 3), slice(None, None, -1), slice(0, 4, 2), slice(-2, None), slice(3, 1)])
+def test_slicing_matches_list(frame, key):
+    sliced = frame[key]
+    assert isinstance(sliced, TelemetryFrame)
+    assert len(sliced) == len(RECORDS[key])
+    assert sliced.to_records() == RECORDS[key]
+
+
+def test_numeric_columns(frame):
+    engine_temp = frame.numeric('engineTemp')
+    assert engine_temp[0] == 95
+    assert np.isnan(engine_temp[1])
+    assert np.isnan(frame.numeric('rpm')[3])
+    assert np.isnan(frame.numeric('missing')).all()
+    assert frame.values('rpm') == [2100.5, 1800, None, 'n/a']
+
+
+def test_chronological_order(frame):
+    assert frame.timed
+    assert frame.chronological_order().tolist() == [3, 2, 1, 0]
+    assert frame.seconds()[0] - frame.seconds()[3] == 30
+
+    # Без разбираемых меток - обратный порядок строк
+    untimed = TelemetryFrame.from_records([{'rpm': 1, 'timestamp': 'bad'}, {'rpm': 2}])
+    assert not untimed.timed
+    assert untimed.chronological_order().tolist() == [1, 0]
+
+
+def test_between_sorted_and_unsorted(frame):
+    window = frame.between('2024-01-01 00:00:10', datetime(2024, 1, 1, 0, 0, 20))
+    assert window.to_records() == RECORDS[1:3]
+
+    shuffled = TelemetryFrame.from_records([RECORDS[2], RECORDS[0], RECORDS[3], RECORDS[1]])
+    assert shuffled.between(start='2024-01-01 00:00:15').to_records() == [RECORDS[0], RECORDS[1]]
+    assert len(frame.between(end='2023-12-31 23:59:59')) == 0
+
+
+def test_coerce():
+    frame = TelemetryFrame.from_records(RECORDS)
+    assert TelemetryFrame.coerce(frame) is frame
+    assert len(TelemetryFrame.coerce(None)) == 0
+    assert TelemetryFrame.coerce(RECORDS).to_records() == RECORDS
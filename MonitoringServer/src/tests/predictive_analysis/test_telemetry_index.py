@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+import pytest
+
+from telemetry_index import TelemetryTimeIndex
+
+
+def _index(*samples):
+    return TelemetryTimeIndex([{'timestamp': timestamp, 'odometer': odometer} for timestamp, odometer in samples])
+
+
+@pytest.fixture
+def index():
+    # Записи от новых к старым, как их возвращает API
+    return _index(('2024-01-11 00:00:00', 3000), ('2024-01-06 00:00:00', 2000), ('2024-01-01 00:00:00', 1000))
+
+
+def test_nearest_odometer(index):
+    assert index.nearest_odometer(datetime(2024, 1, 2)) == 1000
+    assert index.nearest_odometer(datetime(2024, 1, 5)) == 2000
+    assert index.nearest_odometer(datetime(2030, 1, 1)) == 3000
+
+
+def test_nearest_odometer_tie_prefers_earlier_record(index):
+    # Середина между 2024-01-06 и 2024-01-11: запись 2024-01-11 стоит в списке раньше
+    assert index.nearest_odometer(datetime(2024, 1, 8, 12)) == 3000
+
+
+def test_odometer_at_interpolates_between_records(index):
+    assert index.odometer_at(datetime(2024, 1, 3, 12)) == pytest.approx(1500)
+    assert index.odometer_at(datetime(2024, 1, 10)) == pytest.approx(2800)
+    assert index.odometer_at(datetime(2024, 1, 6)) == 2000
+
+
+def test_odometer_at_clamps_outside_range(index):
+    assert index.odometer_at(datetime(2023, 12, 1)) == 1000
+    assert index.odometer_at(datetime(2024, 2, 1)) == 3000
+
+
+def test_odometer_at_falls_back_to_nearest_for_non_numeric_values():
+    index = _index(('2024-01-03 00:00:00', '3000 km'), ('2024-01-01 00:00:00', 1000))
+    assert index.odometer_at(datetime(2024, 1, 2, 1)) == '3000 km'
+
+
+def test_unusable_index_returns_none():
+    assert _index().odometer_at(datetime(2024, 1, 1)) is None
+    broken = _index(('not a date', 1000), ('2024-01-01 00:00:00', 2000))
+    assert not broken.valid
+    assert broken.odometer_at(datetime(2024, 1, 1)) is None
+    assert broken.nearest_odometer(datetime(2024, 1, 1)) is None
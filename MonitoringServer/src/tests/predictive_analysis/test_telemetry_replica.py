@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from telemetry_replica import TelemetryReplica
+
+
+class StreamingSource:
+    """
+    Клиент API с постраничной телеметрией: fail_after - после скольких записей
+    загрузка прерывается ошибкой (last_status = None)
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.requests = []
+        self.fail_after = None
+        self.last_status = None
+
+    def add(self, vehicle_id, record_id, created_at, **fields):
+        self.records.setdefault(vehicle_id, []).insert(
+            0, dict(fields, id=record_id, created_at=created_at.isoformat(), _cache='internal'))
+
+    def iter_telemetry_data(self, vehicle_id, start_date=None, end_date=None, prefetch=None):
+        self.requests.append(start_date)
+        self.last_status = 200
+        for index, record in enumerate(self.records.get(vehicle_id, [])):
+            if start_date and record['created_at'] < start_date:
+                continue
+            if self.fail_after is not None and index >= self.fail_after:
+                self.last_status = None
+                return
+            yield record
+
+
+@pytest.fixture
+def replica(tmp_path):
+    return TelemetryReplica(str(tmp_path / 'replica.db'), history_days=30)
+
+
+@pytest.fixture
+def source():
+    source = StreamingSource()
+    start = datetime.now() - timedelta(days=1)
+    for number in range(1, 6):
+        source.add(1, number, start + timedelta(minutes=number), engine_temp=80 + number)
+    return source
+
+
+def test_pull_stores_records_newest_first(replica, source):
+    assert replica.pull_telemetry(source, 1)
+
+    records = replica.get_telemetry_data(1, limit=3)
+    assert [record['id'] for record in records] == [5, 4, 3]
+    assert records[0]['engine_temp'] == 85
+    # Служебные ключи анализаторов в реплику не попадают
+    assert '_cache' not in records[0].keys()
+    assert replica.telemetry_age(1) < 5
+
+
+def test_incremental_pull_starts_at_cursor(replica, source):
+    replica.pull_telemetry(source, 1)
+    newest = source.records[1][0]['created_at']
+    source.add(1, 6, datetime.now(), engine_temp=90)
+
+    assert replica.pull_telemetry(source, 1)
+
+    assert source.requests[-1] == newest
+    assert replica.get_telemetry_data(1, limit=1)[0]['id'] == 6
+    assert replica.stats()['telemetry_records'] == 6
+
+
+def test_cursor_advances_only_after_complete_pull(replica, source):
+    replica.pull_telemetry(source, 1)
+    cursor = source.records[1][0]['created_at']
+    for number in (6, 7, 8):
+        source.add(1, number, datetime.now() + timedelta(minutes=number))
+
+    source.fail_after = 1
+    assert not replica.pull_telemetry(source, 1)
+    source.fail_after = None
+    replica.pull_telemetry(source, 1)
+
+    # Повторная загрузка начинается с прежнего курсора, пропусков нет
+    assert source.requests[-1] == cursor
+    assert [record['id'] for record in replica.get_telemetry_data(1, limit=10)] == [8, 7, 6, 5, 4, 3, 2, 1]
+
+
+def test_failed_first_pull_leaves_vehicle_unsynced(replica, source):
+    source.fail_after = 2
+
+    assert not replica.pull_telemetry(source, 1)
+    assert replica.telemetry_age(1) is None
+
+
+def test_date_filters(replica, source):
+    replica.pull_telemetry(source, 1)
+    created = [record['created_at'] for record in source.records[1]]
+
+    records = replica.get_telemetry_data(1, start_date=created[3], end_date=created[1])
+    assert [record['id'] for record in records] == [4, 3, 2]
+
+
+def test_works_are_replaced_per_vehicle(replica):
+    assert replica.get_vehicle_works(1) == []
+    assert replica.works_age(1) is None
+
+    replica.store_works({1: [{'id': 1, 'description': 'Oil change'}], 2: []})
+    replica.store_works({1: [{'id': 2, 'description': 'Brake pads'}]})
+
+    assert replica.get_vehicle_works(1) == [{'id': 2, 'description': 'Brake pads'}]
+    assert replica.works_age(2) is not None
+
+
+def test_prune_removes_old_telemetry(replica, source):
+    source.add(1, 100, datetime.now() - timedelta(days=10))
+    replica.pull_telemetry(source, 1)
+    replica.history_days = 5
+
+    assert replica.prune() == 1
+    assert [record['id'] for record in replica.get_telemetry_data(1)] == [5, 4, 3, 2, 1]
+
+
+def test_database_serves_replica_when_api_is_down(fake_api, replica, source, monkeypatch):
+    from database import Database
+
+    db = Database()
+    monkeypatch.setattr(db, 'replica', replica)
+    monkeypatch.setattr(db, 'replica_max_staleness', -1, raising=False)
+    monkeypatch.setattr(db, 'api_client', source)
+    replica.pull_telemetry(source, 1)
+
+    source.fail_after = 0
+    records = db.get_telemetry_data(1)
+
+    assert [record['id'] for record in records] == [5, 4, 3, 2, 1]
+
+
+def test_replica_sync_starts_once_and_only_on_request(fake_api, replica, monkeypatch):
+    from database import Database
+
+    db = Database()
+    started = threading.Event()
+    monkeypatch.setattr(db, '_replica_sync_loop', started.set)
+    monkeypatch.setattr(db, '_replica_sync_pid', None)
+    monkeypatch.setattr(db, 'replica', replica)
+    monkeypatch.setattr(db, 'replica_sync_interval', 60, raising=False)
+
+    assert db.start_replica_sync()
+    assert started.wait(2)
+    assert not db.start_replica_sync()
+
+    monkeypatch.setattr(db, '_replica_sync_pid', None)
+    db.replica_sync_interval = 0
+    assert not db.start_replica_sync()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from api_client import ApiClient, _prefetched
+
+
+def _history(size, same_time_every=1):
+    """
+    История телеметрии от новых записей к старым; у каждых same_time_every записей одинаковое время
+    """
+    start = datetime(2024, 6, 1)
+    return [{'id': size - index, 'engineTemp': 80 + index % 30,
+             'created_at': (start - timedelta(minutes=index // same_time_every)).isoformat()}
+            for index in range(size)]
+
+
+class PagedRoute:
+    """
+    Маршрут telemetry/vehicle-data с курсором по (created_at, id), как в telemetryController.js;
+    fail_on - номер запроса, на котором маршрут возвращает ошибку
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.requests = []
+        self.fail_on = None
+
+    def __call__(self, method, endpoint, data=None, params=None, **kwargs):
+        assert endpoint == 'telemetry/vehicle-data'
+        self.requests.append(dict(params))
+        if len(self.requests) == self.fail_on:
+            return None
+        rows = self.records
+        if 'before' in params:
+            cursor = (params['before'], params['before_id'])
+            rows = [row for row in rows if (row['created_at'], row['id']) < cursor]
+        page = rows[:params['limit']]
+        result = {'data': page}
+        if len(page) == params['limit']:
+            result['next_cursor'] = {'before': page[-1]['created_at'], 'before_id': page[-1]['id']}
+        return result
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = ApiClient()
+    client.route = PagedRoute(_history(10))
+    monkeypatch.setattr(client, '_make_request', client.route)
+    return client
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 3])
+def test_stream_yields_every_record_once(client, prefetch):
+    ids = [record['id'] for record in client.iter_telemetry_data(1, page_size=3, prefetch=prefetch)]
+
+    assert ids == list(range(10, 0, -1))
+    # 3 + 3 + 3 + 1: неполная страница завершает поток
+    assert len(client.route.requests) == 4
+    assert client.route.requests[1]['before_id'] == 8
+
+
+def test_cursor_breaks_timestamp_ties_by_id(client):
+    client.route.records = _history(12, same_time_every=4)
+
+    ids = [record['id'] for record in client.iter_telemetry_data(1, page_size=5, prefetch=0)]
+
+    assert ids == list(range(12, 0, -1))
+
+
+def test_full_last_page_ends_on_empty_page(client):
+    ids = [record['id'] for record in client.iter_telemetry_data(1, page_size=5, prefetch=0)]
+
+    assert len(ids) == 10
+    assert len(client.route.requests) == 3
+
+
+def test_filters_and_page_size_are_sent(client):
+    list(client.iter_telemetry_data(7, start_date='2024-01-01', end_date='2024-07-01', page_size=20, prefetch=0))
+
+    assert client.route.requests == [{'vehicle_id': 7, 'limit': 20,
+                                      'start_date': '2024-01-01', 'end_date': '2024-07-01'}]
+
+
+def test_failed_page_ends_stream(client):
+    client.route.fail_on = 3
+
+    ids = [record['id'] for record in client.iter_telemetry_data(1, page_size=3, prefetch=1)]
+
+    assert ids == list(range(10, 4, -1))
+
+
+def test_records_are_compact_snake_case(client):
+    record = next(iter(client.iter_telemetry_data(1, page_size=3, prefetch=0)))
+
+    assert record['engine_temp'] == 80
+    assert record['created_at'] == '2024-06-01T00:00:00'
+
+
+def test_prefetched_passes_errors_to_consumer():
+    def failing():
+        yield 1
+        raise ValueError("page failed")
+
+    stream = _prefetched(failing(), 1)
+    assert next(stream) == 1
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_prefetched_reads_ahead_at_most_depth_items():
+    produced = []
+
+    def source():
+        for item in range(100):
+            produced.append(item)
+            yield item
+
+    stream = _prefetched(source(), 2)
+    assert next(stream) == 0
+    time.sleep(0.3)
+
+    # Одно отданное потребителю значение, depth в очереди и одно ожидающее места
+    assert len(produced) <= 1 + 2 + 1
+    stream.close()
+
+
+def test_prefetch_thread_stops_when_consumer_closes():
+    finished = threading.Event()
+
+    def source():
+        try:
+            for item in range(1000):
+                yield item
+        finally:
+            finished.set()
+
+    stream = _prefetched(source(), 1)
+    assert next(stream) == 0
+    stream.close()
+
+    assert finished.wait(2)
+    for thread in threading.enumerate():
+        if thread.name == 'TelemetryPrefetch':
+            thread.join(2)
+            assert not thread.is_alive()
+
+
+def test_database_stream_stops_on_error(fake_api, monkeypatch):
+    from database import Database
+
+    def failing_stream(vehicle_id, start_date=None, end_date=None):
+        yield {'id': 1}
+        raise ConnectionError("API unavailable")
+
+    monkeypatch.setattr(fake_api, 'iter_telemetry_data', failing_stream, raising=False)
+
+    assert list(Database().iter_telemetry_data(1)) == [{'id': 1}]
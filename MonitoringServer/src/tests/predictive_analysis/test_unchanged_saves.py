@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from database import Database
+from issues import Issue
+from watermarks import result_fingerprint
+
+
+def _result(vehicle_id=1, engine_health=80, created_at='2024-06-01T10:00:00'):
+    return {
+        'vehicle_id': vehicle_id,
+        'engine_health': engine_health,
+        'oil_health': 70,
+        'recommendations': ('Проверьте масло.',),
+        'issues': [Issue('oil.oilPressure<20', 'oil', 'oilPressure', 15, 20)],
+        'created_at': created_at,
+    }
+
+
+@pytest.fixture
+def db(fake_api, monkeypatch):
+    """
+    Database с пустой историей сохраненных результатов и режимом heartbeat
+    """
+    database = Database()
+    monkeypatch.setattr(database, '_saved_results', {})
+    monkeypatch.setattr(database, 'unchanged_save_mode', 'heartbeat')
+    monkeypatch.setattr(database, 'save_max_age', 86400)
+    return database
+
+
+def test_fingerprint_ignores_id_and_created_at():
+    first = _result(created_at='2024-06-01T10:00:00')
+    second = dict(_result(created_at='2024-06-02T10:00:00'), id=17)
+    assert result_fingerprint(first) == result_fingerprint(second)
+
+    # Рекомендации списком и кортежем дают одинаковый отпечаток
+    assert result_fingerprint(dict(first, recommendations=list(first['recommendations']))) == result_fingerprint(first)
+
+
+def test_fingerprint_changes_with_content():
+    base = result_fingerprint(_result())
+    assert result_fingerprint(_result(engine_health=81)) != base
+    changed_issue = dict(_result(), issues=[Issue('oil.oilPressure<20', 'oil', 'oilPressure', 12, 20)])
+    assert result_fingerprint(changed_issue) != base
+    assert result_fingerprint(dict(_result(), recommendations=())) != base
+
+
+def test_unchanged_result_sends_heartbeat(db, fake_api):
+    assert db.save_analysis_result(_result())
+    assert db.save_analysis_result(_result(created_at='2024-06-01T11:00:00'))
+
+    assert len(fake_api.saved) == 1
+    assert fake_api.touched == [(1, '2024-06-01T11:00:00')]
+
+
+def test_changed_result_is_saved(db, fake_api):
+    db.save_analysis_result(_result())
+    db.save_analysis_result(_result(engine_health=60))
+    db.save_analysis_result(_result(vehicle_id=2))
+
+    assert len(fake_api.saved) == 3
+    assert fake_api.touched == []
+
+
+def test_failed_heartbeat_falls_back_to_full_save(db, fake_api):
+    db.save_analysis_result(_result())
+    fake_api.accept_touches = False
+
+    assert db.save_analysis_result(_result())
+    assert fake_api.calls['touch_analysis_result'] == 1
+    assert len(fake_api.saved) == 2
+
+
+def test_skip_mode_writes_nothing(db, fake_api):
+    db.unchanged_save_mode = 'skip'
+    db.save_analysis_result(_result())
+
+    assert db.save_analysis_result(_result())
+    assert len(fake_api.saved) == 1
+    assert fake_api.calls['touch_analysis_result'] == 0
+
+
+def test_save_mode_always_saves(db, fake_api):
+    db.unchanged_save_mode = 'save'
+    db.save_analysis_result(_result())
+    db.save_analysis_result(_result())
+
+    assert len(fake_api.saved) == 2
+    assert fake_api.calls['touch_analysis_result'] == 0
+
+
+def test_full_save_after_save_max_age(db, fake_api):
+    db.save_analysis_result(_result())
+    db.save_max_age = -1
+
+    db.save_analysis_result(_result())
+
+    assert len(fake_api.saved) == 2
+    assert fake_api.touched == []
+
+
+def test_fingerprint_is_remembered_only_after_successful_save(db, fake_api):
+    fake_api.accept_saves = False
+    assert not db.save_analysis_result(_result())
+
+    fake_api.accept_saves = True
+    assert db.save_analysis_result(_result())
+    assert len(fake_api.saved) == 1
+    assert fake_api.touched == []
+
+
+def test_write_behind_batch_confirms_unchanged_results_at_once(db, fake_api):
+    db.save_analysis_result(_result(vehicle_id=1))
+    db.save_analysis_result(_result(vehicle_id=2))
+    entries = [(result, result_fingerprint(result)) for result in (
+        _result(vehicle_id=1, created_at='2024-06-01T11:00:00'),
+        _result(vehicle_id=2, created_at='2024-06-01T11:00:00'),
+        _result(vehicle_id=3),
+    )]
+
+    assert db._write_results(entries) == []
+    assert fake_api.calls['touch_analysis_results_bulk'] == 1
+    assert fake_api.calls['touch_analysis_result'] == 0
+    assert fake_api.touched == [(1, '2024-06-01T11:00:00'), (2, '2024-06-01T11:00:00')]
+    assert [result['vehicle_id'] for result in fake_api.saved] == [1, 2, 3]
+
+
+def test_write_behind_saves_unconfirmed_results(db, fake_api):
+    db.save_analysis_result(_result())
+    fake_api.accept_touches = False
+
+    assert db._write_results([(_result(), result_fingerprint(_result()))]) == []
+    assert fake_api.calls['touch_analysis_results_bulk'] == 1
+    assert len(fake_api.saved) == 2
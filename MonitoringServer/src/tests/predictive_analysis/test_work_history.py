@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+import pytest
+
+from work_history import SERVICE_KEYWORDS, KeywordAutomaton, ServiceHistory, classify_description
+
+
+def _substring_systems(description):
+    # Исходная классификация: поиск каждого ключевого слова в описании
+    text = description.lower()
+    return frozenset(system for system, keywords in SERVICE_KEYWORDS.items()
+                     if any(keyword in text for keyword in keywords))
+
+
+@pytest.mark.parametrize('description, systems', [
+    ('Масло и фильтр', {'oil'}),
+    # Ключевое слово 'масло' не совпадает с другими формами слова
+    ('Замена масла', set()),
+    ('Oil change', {'oil'}),
+    ('Шиномонтаж', {'tires'}),
+    ('Wheel alignment', {'tires'}),
+    ('Замена тормозных колодок', {'brakes'}),
+    ('Brake disc replacement', {'brakes'}),
+    ('Замена амортизаторов и пружин', {'suspension'}),
+    ('Strut replacement', {'suspension'}),
+    ('Аккумулятор', {'battery'}),
+    ('Engine repair', {'engine'}),
+    ('Engine oil change, brake pads', {'engine', 'oil', 'brakes'}),
+    ('Мойка', set()),
+    ('', set()),
+])
+def test_classify_description(description, systems):
+    assert classify_description(description) == frozenset(systems)
+
+
+def test_automaton_matches_substring_search():
+    descriptions = ['Плановое ТО: масло, колодки, диски', 'Battery and disc check', 'подвеска: стойки',
+                    'replace shock absorbers', 'spring service', 'колесо', 'tire rotation', 'battery',
+                    'engineering review', 'padding', 'Замена батареи', 'ремонт кузова']
+    for description in descriptions:
+        assert classify_description(description) == _substring_systems(description), description
+
+
+def test_automaton_finds_overlapping_keywords():
+    automaton = KeywordAutomaton({'a': ['he', 'hers'], 'b': ['she'], 'c': ['his']})
+    assert automaton.labels('ushers') == {'a', 'b'}
+    assert automaton.labels('this') == {'c'}
+    assert automaton.labels('xyz') == frozenset()
+
+
+def test_service_history_keeps_last_work_per_system():
+    history = ServiceHistory([
+        {'description': 'Oil change', 'date': '2024-01-10'},
+        {'description': 'Brake pads', 'date': '2024-03-01'},
+        {'description': 'Oil filter', 'date': '2024-05-20'},
+        {'description': 'Мойка', 'date': 'not a date'},
+    ])
+    now = datetime(2024, 6, 1)
+
+    assert history.last_service('oil').work['date'] == '2024-05-20'
+    assert history.days_since('oil', now) == 12
+    assert history.days_since('brakes', now) == 92
+    assert history.days_since('battery', now) is None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+from write_behind import WriteBehindQueue
+
+
+class RecordingWriter:
+    """
+    Запись пачек с заданными ошибками: fail(item, attempt) -> True, если элемент нужно повторить
+    """
+
+    def __init__(self, fail=None, error_batches=0):
+        self.batches = []
+        self.written = []
+        self.attempts = {}
+        self.fail = fail
+        self.error_batches = error_batches
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.batches.append(list(items))
+            if self.error_batches:
+                self.error_batches -= 1
+                raise ConnectionError("API unavailable")
+            failed = []
+            for item in items:
+                attempt = self.attempts.get(item, 0)
+                self.attempts[item] = attempt + 1
+                if self.fail is not None and self.fail(item, attempt):
+                    failed.append(item)
+                else:
+                    self.written.append(item)
+            return failed
+
+
+def test_flush_writes_everything_in_batches():
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, batch_size=10, flush_interval=60)
+    for item in range(25):
+        assert queue.submit(item)
+
+    assert queue.flush(timeout=5)
+    assert sorted(writer.written) == list(range(25))
+    assert all(len(batch) <= 10 for batch in writer.batches)
+    assert queue.metrics()['queue_depth'] == 0
+    assert queue.metrics()['written'] == 25
+    queue.close()
+
+
+def test_flush_interval_writes_partial_batch():
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, batch_size=100, flush_interval=0.05)
+    queue.submit('a')
+    queue.submit('b')
+
+    deadline = time.monotonic() + 5
+    while len(writer.written) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert writer.written == ['a', 'b']
+    assert writer.batches == [['a', 'b']]
+    queue.close()
+
+
+def test_failed_items_are_retried():
+    # Каждый нечетный элемент записывается только со второй попытки
+    writer = RecordingWriter(fail=lambda item, attempt: item % 2 and attempt == 0)
+    queue = WriteBehindQueue(writer, batch_size=4, flush_interval=60, retry_delay=0.01)
+    for item in range(8):
+        queue.submit(item)
+
+    assert queue.flush(timeout=5)
+    assert sorted(writer.written) == list(range(8))
+    metrics = queue.metrics()
+    assert metrics['retried'] == 4
+    assert metrics['dropped'] == 0
+    assert metrics['failed_batches'] >= 1
+    queue.close()
+
+
+def test_batch_exception_retries_whole_batch():
+    writer = RecordingWriter(error_batches=1)
+    queue = WriteBehindQueue(writer, batch_size=10, flush_interval=60, retry_delay=0.01)
+    for item in range(3):
+        queue.submit(item)
+
+    assert queue.flush(timeout=5)
+    assert sorted(writer.written) == [0, 1, 2]
+    assert queue.metrics()['retried'] == 3
+    queue.close()
+
+
+def test_items_are_dropped_after_max_retries():
+    writer = RecordingWriter(fail=lambda item, attempt: item == 'bad')
+    queue = WriteBehindQueue(writer, batch_size=10, flush_interval=60, max_retries=2, retry_delay=0.01)
+    queue.submit('good')
+    queue.submit('bad')
+
+    assert queue.flush(timeout=5)
+    assert writer.written == ['good']
+    assert writer.attempts['bad'] == 3
+    metrics = queue.metrics()
+    assert metrics['dropped'] == 1
+    assert metrics['retried'] == 2
+    queue.close()
+
+
+def test_close_drains_pending_retries_without_delay():
+    writer = RecordingWriter(fail=lambda item, attempt: attempt == 0)
+    queue = WriteBehindQueue(writer, batch_size=10, flush_interval=0.01, retry_delay=60)
+    queue.submit('x')
+
+    deadline = time.monotonic() + 5
+    while queue.metrics()['retried'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    assert queue.close(timeout=5)
+    assert time.monotonic() - started < 5
+    assert writer.written == ['x']
+    assert not queue.submit('y')